@@ -1,4 +1,4 @@
-from pm_app.app import app
+from pm_app.app import create_app
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=8050, debug=True, use_reloader=False)
+    create_app().run(host="127.0.0.1", port=8050, debug=True, use_reloader=False)
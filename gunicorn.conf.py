@@ -0,0 +1,27 @@
+# Production serving for the PM app: python -m gunicorn -c gunicorn.conf.py wsgi:server
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get("PM_BIND", "127.0.0.1:8050")
+workers = int(os.environ.get("PM_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+# Each open PM tab holds one /_pm/events stream on a worker thread for as long as
+# it stays open. A worker takes at most PM_EVENT_STREAMS streams (half its threads
+# by default), so the other half is always free for Dash callbacks; tabs past the
+# cap poll /_pm/versions every 5 s instead. Raise PM_THREADS for more live tabs.
+threads = int(os.environ.get("PM_THREADS", 16))
+os.environ.setdefault("PM_EVENT_STREAMS", str(max(1, threads // 2)))
+timeout = 60
+keepalive = 5
+# Workers must not share the SQLite connection or journal fds of a preloaded parent.
+preload_app = False
+accesslog = "-"
+
+# Workers share their /metrics counters through this directory (see pm_app/metrics.py)
+os.environ.setdefault("PM_METRICS_DIR", os.path.join(tempfile.gettempdir(), "pm_metrics"))
+
+
+def on_starting(server):
+    shutil.rmtree(os.environ["PM_METRICS_DIR"], ignore_errors=True)
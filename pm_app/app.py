@@ -7,14 +7,29 @@ def load_decisions():
 import os
 import time
 
+from pm_app.startup import StartupTimer
+
+STARTUP = StartupTimer()
+
 import os, json
 from datetime import datetime
 
 AION_UI_VERSION = time.strftime('%Y%m%d') + '_V01'
 
+import base64
 import re
-import hashlib
+import shutil
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
 import pandas as pd
+from flask import Response, has_request_context, request
+
+try:
+    import fcntl
+except ImportError:  # Windows: single process only
+    fcntl = None
 
 from pandas.errors import EmptyDataError
 
@@ -32,12 +47,29 @@ def safe_read_csv(path, columns):
     return df[columns].fillna("")
 
 from datetime import datetime
-from dash import Dash, dcc, html, Input, Output, State, no_update
+from dash import ClientsideFunction, Dash, dcc, html, Input, Output, State, Patch, no_update
 from dash.dash_table import DataTable
 
+from pm_app.bulk_import import CHUNK_ROWS, BulkImport
+from pm_app.dates import DateNormalizer, date_columns
+from pm_app.flow import FlowRollups, percentile
+from pm_app.jobs import JobRunner
+from pm_app.journal import EditJournal
+from pm_app.metrics import instrument, untimed
+from pm_app.store import IdSequence, TableStore
+from pm_app.table import RowTable
+from pm_app.watcher import ProjectIndexWatcher
+from pm_app.workbook import WorkbookCache
+
 EXCEL_FILE = "data/Project_Aion_PM_System.xlsx"
 TICKETS_CSV = "tickets_live.csv"
 DECISIONS_CSV = "decisions_live.csv"
+PM_DB_FILE = "pm_live.sqlite"
+PM_JOURNAL_FILE = "pm_live.journal"
+JOURNAL_COMPACT_SECONDS = 30
+PM_SEARCH_FILE = "pm_live.{}.search"   # persisted search index per table
+PM_SNAPSHOT_FILE = "pm_live.{}.arrow"   # columnar snapshot of the store per table (pm_app/snapshot.py)
+PM_IMPORT_DIR = "pm_live.imports"       # uploaded import files and their rejected-row reports
 EXPORT_TICKETS_SHEET = "04_Tickets_LIVE"
 EXPORT_DECISIONS_SHEET = "06_Decisions_LIVE"
 
@@ -51,10 +83,6 @@ def now_str():
 def today_yyyymmdd():
     return datetime.now().strftime("%Y%m%d")
 
-def df_hash(df: pd.DataFrame) -> str:
-    s = df.fillna("").astype(str).to_csv(index=False)
-    return hashlib.md5(s.encode("utf-8")).hexdigest()
-
 def first_existing_column(df, candidates):
     cols_lower = {c.lower(): c for c in df.columns}
     for cand in candidates:
@@ -80,22 +108,33 @@ def safe_unique(df, col):
             out.append(v)
     return out
 
+# Header names each ticket column goes by, first match wins (the default name comes first)
+TICKET_COLUMN_CANDIDATES = {
+    "id": ["Ticket ID", "Ticket", "TicketID", "ID", "Key", "Issue Key", "Issue"],
+    "title": ["Title", "Summary", "Task", "Ticket Title"],
+    "status": ["Status"],
+    "priority": ["Priority"],
+    "owner": ["Owner", "Assignee"],
+    "epic": ["Epic", "Epic ID", "EpicID"],
+}
+
 def infer_ticket_id_column(df):
-    return first_existing_column(df, ["Ticket ID", "Ticket", "TicketID", "ID", "Key", "Issue Key", "Issue"]) or "Ticket ID"
+    return first_existing_column(df, TICKET_COLUMN_CANDIDATES["id"]) or "Ticket ID"
 
-def next_ticket_id(df, id_col):
-    if not id_col or id_col not in df.columns:
-        return "T-0001"
-    vals = [str(v).strip() for v in df[id_col].fillna("").tolist()]
+TICKET_ID_RE = re.compile(r'([A-Za-z]+)[-_ ]?(\d+)$')
 
-    nums = []
-    for v in vals:
-        m = re.search(r'([A-Za-z]+)[-_ ]?(\d+)$', v)
-        if m and m.group(1).upper().startswith("T"):
-            nums.append(int(m.group(2)))
-    if nums:
-        return f"T-{max(nums)+1:04d}"
-    return "T-0001"
+def ticket_number(value):
+    """N for a T-NNNN style ticket ID, else None."""
+    m = TICKET_ID_RE.search(str(value).strip())
+    if m and m.group(1).upper().startswith("T"):
+        return int(m.group(2))
+    return None
+
+def max_ticket_number(values) -> int:
+    return max((n for n in map(ticket_number, values) if n is not None), default=0)
+
+def format_ticket_id(n) -> str:
+    return f"T-{n:04d}"
 
 def dropdown_map(df, col, defaults=None):
     if not col or col not in df.columns:
@@ -107,64 +146,130 @@ def dropdown_map(df, col, defaults=None):
                 values.insert(0, d)
     return {col: {"options": [{"label": v, "value": v} for v in values]}}
 
+@contextmanager
+def file_lock(path):
+    """Exclusive flock on path, held against other worker processes (threads too: one fd per hold)."""
+    if fcntl is None:  # Windows: single process only
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
 def safe_export_df_to_excel(sheet_name, df: pd.DataFrame) -> None:
-    with pd.ExcelWriter(EXCEL_FILE, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    # Write a copy and swap it in, so readers never see a half-written workbook. Exports
+    # from other workers wait on the lock file; each write has its own scratch copy.
+    folder, name = os.path.split(EXCEL_FILE)
+    with file_lock(EXCEL_FILE + ".lock"):
+        fd, tmp = tempfile.mkstemp(dir=folder or ".", prefix="." + name + ".", suffix=".xlsx")
+        os.close(fd)
+        try:
+            shutil.copy2(EXCEL_FILE, tmp)
+            with pd.ExcelWriter(tmp, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+            os.replace(tmp, EXCEL_FILE)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+# ---------- Background jobs ----------
+# Job state lives in the store's SQLite file, so every worker's panel sees every job
+JOBS = JobRunner(max_workers=2, db_path=PM_DB_FILE)
+
+def submit_export(table, sheet_name, what):
+    """Queue an Excel export of table; clicks while one is queued share that job."""
+    def run(job):
+        job.progress("Snapshotting rows")
+        df = table.to_df()
+        job.progress(f"Writing {len(df)} rows to '{sheet_name}'")
+        safe_export_df_to_excel(sheet_name, df)
+        job.progress(f"Exported {len(df)} rows to '{sheet_name}'")
+        return len(df)
+    return JOBS.submit(f"Export {what}", run, coalesce_key=("export", sheet_name), resource=EXCEL_FILE)
 
 # --- Date formatting: Start / Due / Created / Updated -> YYYYMMDD (no time) ---
-DATE_KEYS = ["start", "due", "created", "updated"]
-
-def is_date_col(colname: str) -> bool:
-    s = (colname or "").strip().lower()
-    # match exact or common variants like "Start Date", "Due_Date", "Created At", etc.
-    return any(k == s or s.startswith(k) or s.endswith(k) or f"{k} " in s or f" {k}" in s or f"{k}_" in s or f"_{k}" in s for k in DATE_KEYS)
+# Column classification and parsed values are cached in pm_app/dates.py.
+DATES = DateNormalizer()
 
 def normalize_dates(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    for col in df.columns:
-        if not is_date_col(col):
-            continue
-        raw = df[col].fillna("").astype(str).str.strip()
-
-        # Remove trailing time if present
-        raw = raw.str.replace(r"\s+00:00:00$", "", regex=True)
-
-        # Try parse -> format YYYYMMDD
-        dt = pd.to_datetime(raw, errors="coerce", dayfirst=False)
-        formatted = dt.dt.strftime("%Y%m%d")
-
-        # Where parsing worked, use formatted; else keep cleaned raw (and strip separators if it's already date-ish)
-        cleaned_raw = raw.str.replace("-", "", regex=False).str.replace("/", "", regex=False)
-        df[col] = formatted.where(dt.notna(), cleaned_raw).replace("NaT", "")
-
-        # Final tidy: blanks stay blank
-        df[col] = df[col].fillna("").astype(str).str.strip()
-    return df
+    return DATES.normalize_df(df)
 
 # ---------- Loaders ----------
+# All workbook reads go through one parsed-sheet cache (re-read only when the file changes)
+WORKBOOK = WorkbookCache(EXCEL_FILE)
+CHARTER_SHEET = ("01_Project_Charter", None)
+ROADMAP_SHEET = ("02_Roadmap", 3)
+TICKETS_SEED_SHEET = ("04_Tickets", 3)
+
 def load_charter():
-    xls = pd.ExcelFile(EXCEL_FILE)
-    df = pd.read_excel(xls, "01_Project_Charter", header=None)
+    df = WORKBOOK.sheet(*CHARTER_SHEET)
     c = df.iloc[:, :2].copy()
     c.columns = ["Field", "Value"]
     c = c.dropna(how="all")
     c["Field"] = c["Field"].fillna("").astype(str).str.strip()
     c["Value"] = c["Value"].fillna("").astype(str).str.strip()
     c = c[(c["Field"] != "") | (c["Value"] != "")]
-    return c
+    return clean_charter(c)
+
+def clean_charter(charter_tbl):
+    """Drop Charter rows we don't want displayed."""
+    try:
+        # Drop rows where Field is literally "Field" or "Notes"
+        if "Field" in charter_tbl.columns:
+            _f = charter_tbl["Field"].astype(str).str.strip()
+            charter_tbl = charter_tbl[~_f.str.lower().isin(["field","notes"])]
+
+        # Drop any row containing the helper text (match on any column; robust to where it appears)
+        _needle = "Fill these in once"
+        _hit = charter_tbl.apply(lambda c: c.astype(str).str.contains(_needle, na=False))
+        charter_tbl = charter_tbl[~_hit.any(axis=1)]
+    except Exception:
+        pass
+    return charter_tbl
 
 def load_roadmap():
-    xls = pd.ExcelFile(EXCEL_FILE)
-    return pd.read_excel(xls, "02_Roadmap", header=3).fillna("")
+    return WORKBOOK.sheet(*ROADMAP_SHEET).fillna("")
 
 def load_tickets_seed_from_excel():
-    xls = pd.ExcelFile(EXCEL_FILE)
-    return pd.read_excel(xls, "04_Tickets", header=3).fillna("")
+    df = WORKBOOK.sheet(*TICKETS_SEED_SHEET).fillna("")
+    df.columns = [str(c) for c in df.columns]
+    return df
 
-def load_tickets():
+# ---------- SQLite store ----------
+# Startup and reloads read the columnar snapshot plus the rows saved since it was written
+TICKETS_DB = TableStore(PM_DB_FILE, "tickets", snapshot_path=PM_SNAPSHOT_FILE.format("tickets"))
+DECISIONS_DB = TableStore(PM_DB_FILE, "decisions", snapshot_path=PM_SNAPSHOT_FILE.format("decisions"))
+# Shared by all workers; seeded once from the existing ticket IDs
+TICKET_IDS = IdSequence(PM_DB_FILE, "ticket_id")
+
+def infer_decision_id_column(df):
+    return first_existing_column(df, ["Decision_ID", "Decision ID", "DecisionID", "ID"]) or "Decision_ID"
+
+def import_tickets_from_sources(force=False):
+    """One-shot import of tickets_live.csv (or the 04_Tickets seed) into the store."""
+    if TICKETS_DB.exists() and not force:
+        return 0
     if os.path.exists(TICKETS_CSV):
-        return pd.read_csv(TICKETS_CSV).fillna("")
-    return load_tickets_seed_from_excel()
+        df = pd.read_csv(TICKETS_CSV).fillna("")
+    else:
+        df = load_tickets_seed_from_excel()
+    n = TICKETS_DB.replace_df(df, infer_ticket_id_column(df))
+    TICKET_IDS.reset()
+    return n
+
+def import_decisions_from_sources(force=False):
+    """One-shot import of decisions_live.csv into the store."""
+    if DECISIONS_DB.exists() and not force:
+        return 0
+    df = load_decisions_seed_from_excel()
+    return DECISIONS_DB.replace_df(df, infer_decision_id_column(df))
+
+def load_tickets():
+    import_tickets_from_sources()
+    return TICKETS_DB.load_df()
 
 def load_decisions_seed_from_excel():
     """Load decisions table from CSV; tolerate missing/empty files."""
@@ -179,59 +284,324 @@ def load_decisions_seed_from_excel():
     return df.fillna("")
 
 def load_decisions():
-    """Load decisions table from CSV; tolerate missing/empty files."""
-    import pandas as pd
-    from pandas.errors import EmptyDataError
+    """Load decisions table from the store (imported once from CSV)."""
+    import_decisions_from_sources()
+    return DECISIONS_DB.load_df()
+
+def save_table(table, db) -> int:
+    """Write only the table's dirty rows to the store; returns rows written/deleted."""
+    upserts, deletes, snapshot = table.take_dirty()
+    n = db.save_rows(upserts, deletes, table.key_col, table.columns)
+    table.mark_saved(snapshot)
+    return n
+
+def apply_table_edits(table, rows, prev_rows, dates=None):
+    """Apply one session's DataTable edit (data vs data_previous, matched by row 'id').
+
+    Only the rows and cells this session changed are written, merged against
+    the current rows (see RowTable.merge_edit). With dates, merged rows whose
+    date cells changed are re-normalized, parsed as they would be in the full column.
+    Returns (changed, {row id: [conflicting columns]}).
+    """
+    rows = rows or []
+    prev = {r.get("id"): r for r in (prev_rows or [])}
+    live = {r.get("id") for r in rows}
+    conflicts = {}
+    with table.lock:
+        removed = []
+        for k, p in prev.items():
+            if k in live or table.get(k) is None:
+                continue
+            if p.get("_rev") not in (None, table.rev(k)):
+                conflicts[k] = ["changed before your delete"]
+            else:
+                removed.append(k)
+        changed = table.delete(removed) > 0 if removed else False
+        edited, dated = [], []
+        date_cols = date_columns(tuple(table.columns)) if dates is not None else ()
+        for r in rows:
+            k = r.get("id")
+            base = prev.get(k)
+            if base is None or base == r:
+                continue
+            merged, clash = table.merge_edit(k, base, r, base_rev=base.get("_rev"))
+            if clash:
+                conflicts[k] = clash
+            if merged is None:
+                continue
+            merged["id"] = k
+            if any(r.get(c, "") != base.get(c, "") for c in date_cols):
+                dated.append(merged)
+            else:
+                edited.append(merged)
+        if dated:
+            anchors = dates.table_anchors(table, {r["id"]: r for r in dated})
+            edited += dates.normalize_df(pd.DataFrame(dated).fillna(""), anchors).to_dict("records")
+        for r in edited:
+            changed = table.update(r["id"], r) or changed
+    return changed, conflicts
+
+def conflict_message(conflicts) -> str:
+    items = [f"{k} ({', '.join(cols)})" for k, cols in list(conflicts.items())[:8]]
+    more = f" and {len(conflicts) - 8} more" if len(conflicts) > 8 else ""
+    return f"Not applied, changed by someone else meanwhile: {'; '.join(items)}{more}. Showing their values."
+
+# ---------- Edit journal ----------
+# Edits are journaled as they happen; the store is the snapshot the journal is
+# folded into. Startup replays whatever was not folded in yet. All worker
+# processes share the store and the journal, and tail each other's edits.
+# Notified on project index changes and on edits arriving from other workers
+EVENTS = threading.Condition()
+
+JOURNAL = EditJournal(PM_JOURNAL_FILE, compact_interval=JOURNAL_COMPACT_SECONDS, changed=EVENTS)
+
+# ---------- Warm-up ----------
+# Importing this module does no data work, so the server binds right away. The
+# charter, tickets and decisions are loaded (and the journal replayed) by a
+# background warm-up started from create_app() or by the first request; data
+# requests and /_dash-layout wait for it.
+READY = threading.Event()
+_WARMUP = {"thread": None, "error": None}
+_WARMUP_LOCK = threading.Lock()
+
+def load_data():
+    global charter_tbl, TICKETS, DECISIONS, STATUS_INDEX, PRIORITY_INDEX, ID_INDEX, FLOW
+    global id_col, status_col, priority_col, owner_col, epic_col, title_col
+    with STARTUP.phase("data: charter"):
+        charter_tbl = load_charter()
+
+    with JOURNAL.held():  # no other worker imports or compacts between the store load and the replay
+        with STARTUP.phase("data: tickets"):
+            tickets_df = load_tickets()
+            id_col = infer_ticket_id_column(tickets_df)
+            column = lambda role: first_existing_column(tickets_df, TICKET_COLUMN_CANDIDATES[role]) or \
+                TICKET_COLUMN_CANDIDATES[role][0]
+            status_col, priority_col = column("status"), column("priority")
+            owner_col, epic_col, title_col = column("owner"), column("epic"), column("title")
+
+            tickets_df = ensure_columns(tickets_df, [id_col, title_col, status_col, priority_col, owner_col, epic_col]).fillna("")
+            tickets_df[status_col] = tickets_df[status_col].replace("", "To Do")
+            tickets_df = normalize_dates(tickets_df)
+
+            TICKETS = RowTable("tickets")
+            TICKETS.load_df(tickets_df, id_col)
+            # Status / priority buckets for the kanban columns and KPI cards, kept current on every edit
+            STATUS_INDEX = TICKETS.add_index(status_col)
+            PRIORITY_INDEX = TICKETS.add_index(priority_col)
+            # ID cells by value: a typed ID can differ from its row key (see ticket_id_taken)
+            ID_INDEX = TICKETS.add_index(id_col, normalize=lambda v: str(v).strip())
+            TICKETS.add_search([id_col, title_col, owner_col, epic_col], weights={id_col: 3.0, title_col: 2.0},
+                               path=PM_SEARCH_FILE.format("tickets"))
+            # Flow rollups follow the store's ticket history; brought up to date on every fold
+            FLOW = FlowRollups(PM_DB_FILE, TICKETS_DB, status_col=status_col,
+                               created_col=first_existing_column(tickets_df, ["Created", "Created At", "Created Date"]) or "Created",
+                               updated_col=first_existing_column(tickets_df, ["Updated", "Updated At", "Last Updated"]) or "Updated",
+                               due_col=first_existing_column(tickets_df, ["Due", "Due Date"]) or "Due")
+
+        with STARTUP.phase("data: decisions"):
+            decisions_df = load_decisions()
+            decisions_df = ensure_columns(decisions_df, ["Date", "Decision", "Rationale", "Owner", "Link"]).fillna("")
+
+            DECISIONS = RowTable("decisions")
+            decision_id_col = infer_decision_id_column(decisions_df)
+            DECISIONS.load_df(decisions_df, decision_id_col)
+            DECISIONS.add_search([decision_id_col, "Decision", "Rationale", "Owner"],
+                                 weights={decision_id_col: 3.0, "Decision": 2.0},
+                                 path=PM_SEARCH_FILE.format("decisions"))
+
+        with STARTUP.phase("data: journal replay"):
+            JOURNAL.replay({"tickets": TICKETS, "decisions": DECISIONS})
+    print(f"[journal] replayed {JOURNAL.stats['replayed']} edits in {JOURNAL.stats['replay_ms']:.1f} ms")
+    TICKETS.journal = JOURNAL
+    DECISIONS.journal = JOURNAL
+
+def warm_up():
     try:
-        df = pd.read_csv(DECISIONS_CSV)
-    except FileNotFoundError:
-        return pd.DataFrame(columns=["Decision_ID","Date","Decision","Owner","Status","Notes"]).fillna("")
-    except EmptyDataError:
-        return pd.DataFrame(columns=["Decision_ID","Date","Decision","Owner","Status","Notes"]).fillna("")
-    return df.fillna("")
-
-# ---------- Initial data ----------
-charter_tbl = load_charter()
-# --- Clean Charter rows we don't want displayed ---
-try:
-    # Drop rows where Field is literally "Field" or "Notes"
-    if "Field" in charter_tbl.columns:
-        _f = charter_tbl["Field"].astype(str).str.strip()
-        charter_tbl = charter_tbl[~_f.str.lower().isin(["field","notes"])]
-
-    # Drop any row containing the helper text (match on any column; robust to where it appears)
-    _needle = "Fill these in once"
-    _hit = charter_tbl.apply(lambda c: c.astype(str).str.contains(_needle, na=False))
-    charter_tbl = charter_tbl[~_hit.any(axis=1)]
-except Exception:
-    pass
-
-roadmap_df = load_roadmap()
-
-tickets_df = load_tickets()
-id_col = infer_ticket_id_column(tickets_df)
-status_col = first_existing_column(tickets_df, ["Status"]) or "Status"
-priority_col = first_existing_column(tickets_df, ["Priority"]) or "Priority"
-owner_col = first_existing_column(tickets_df, ["Owner", "Assignee"]) or "Owner"
-epic_col = first_existing_column(tickets_df, ["Epic", "Epic ID", "EpicID"]) or "Epic"
-title_col = first_existing_column(tickets_df, ["Title", "Summary", "Task", "Ticket Title"]) or "Title"
-
-tickets_df = ensure_columns(tickets_df, [id_col, title_col, status_col, priority_col, owner_col, epic_col]).fillna("")
-tickets_df[status_col] = tickets_df[status_col].replace("", "To Do")
-tickets_df = normalize_dates(tickets_df)
-
-decisions_df = load_decisions()
-decisions_df = ensure_columns(decisions_df, ["Date", "Decision", "Rationale", "Owner", "Link"]).fillna("")
-
-dropdowns = {}
-d = dropdown_map(tickets_df, status_col, defaults=DEFAULT_STATUSES)
-if d: dropdowns.update(d)
-d = dropdown_map(tickets_df, priority_col, defaults=DEFAULT_PRIORITIES)
-if d: dropdowns.update(d)
-d = dropdown_map(tickets_df, owner_col)
-if d: dropdowns.update(d)
-d = dropdown_map(tickets_df, epic_col)
-if d: dropdowns.update(d)
+        # The project index refreshes on its own thread, alongside the data load
+        PROJECT_INDEX.start()
+        with STARTUP.phase("data load"):
+            load_data()
+        JOURNAL.start(fold_journal, needs_compaction=tables_dirty, after=persist_search_indexes)
+    except Exception as e:
+        _WARMUP["error"] = e
+        print(f"[startup] warm-up failed: {e}")
+        raise
+    finally:
+        STARTUP.mark("data ready")
+        READY.set()
+
+def start_warm_up():
+    with _WARMUP_LOCK:
+        if _WARMUP["thread"] is None:
+            _WARMUP["thread"] = threading.Thread(target=warm_up, name="pm-warm-up", daemon=True)
+            _WARMUP["thread"].start()
+
+def wait_ready():
+    start_warm_up()
+    if not READY.is_set():
+        with untimed("warm-up"):    # not the request's own latency (see pm_app/metrics.py)
+            READY.wait()
+    if _WARMUP["error"] is not None:
+        raise RuntimeError(f"PM data failed to load: {_WARMUP['error']}")
+
+def update_flow():
+    try:
+        FLOW.update()
+    except Exception as e:  # the rollups catch up on the next fold; never hold up the journal
+        print(f"[flow] rollup update failed: {e}")
+
+def fold_journal() -> int:
+    n = save_table(TICKETS, TICKETS_DB) + save_table(DECISIONS, DECISIONS_DB)
+    update_flow()
+    return n
+
+def persist_search_indexes():
+    """Write the search indexes that changed since their last save, after a compaction
+    (outside the journal lock; each table is held only while its index is copied).
+    They follow the store, so startup only re-indexes journaled rows."""
+    for table in (TICKETS, DECISIONS):
+        table.indexes[None].save(PM_SEARCH_FILE.format(table.name), lock=table.lock)
+
+def search_info(table, query, t0):
+    if not (query or "").strip():
+        return ""
+    with table.lock:
+        n = len(table.query(search=query))
+    return f"{n} matches · {(time.perf_counter() - t0) * 1000:.1f} ms"
+
+def ticket_ids_in_use() -> set:
+    """Row keys plus the values in the ID cells (an ID typed into a row can differ from its key)."""
+    with TICKETS.lock:
+        return set(TICKETS.rows) | set(ID_INDEX.buckets)
+
+def ticket_id_taken(value) -> bool:
+    with TICKETS.lock:
+        return value in TICKETS.rows or ID_INDEX.count(value) > 0
+
+def reserve_ticket_ids(n=1):
+    """n fresh ticket IDs from the shared sequence, e.g. for a bulk import."""
+    with TICKETS.lock:
+        first = TICKET_IDS.reserve(n, seed=lambda: max_ticket_number(ticket_ids_in_use()))
+        return [format_ticket_id(i) for i in range(first, first + n)]
+
+def next_ticket_id():
+    with TICKETS.lock:
+        new_id = reserve_ticket_ids(1)[0]
+        if ticket_id_taken(new_id):
+            # someone typed an ID past the sequence; skip over the IDs in use
+            TICKET_IDS.advance(max_ticket_number(ticket_ids_in_use()))
+            new_id = reserve_ticket_ids(1)[0]
+        return new_id
+
+def tables_dirty() -> bool:
+    return TICKETS.is_dirty() or DECISIONS.is_dirty()
+
+def compact_journal() -> int:
+    """Fold pending edits into the store now and start a fresh journal."""
+    return JOURNAL.compact(fold_journal, after=persist_search_indexes)
+
+def reload_from_journal(table, load):
+    """Reload table from the store (load() -> (df, key_col)) plus its unfolded journal edits."""
+    with table.lock, JOURNAL.held(exclusive=False):  # no compaction between the two reads
+        df, key_col = load()
+        table.load_df(df, key_col)
+        for rec in JOURNAL.read_records():
+            if rec.get("tbl") == table.name:
+                table.apply_record(rec.get("op"), rec.get("key"), rec.get("row"), rec.get("rev"))
+
+def journal_status():
+    st = JOURNAL.stats
+    parts = [f"Journal: {st['records']} edits pending",
+             f"startup replay {st['replayed']} edits in {st['replay_ms']:.1f} ms"]
+    if st["compactions"]:
+        parts.append(f"last compaction {st['last_compact_at']} ({st['last_compact_rows']} rows, {st['last_compact_ms']:.1f} ms)")
+    return " · ".join(parts)
+
+def ticket_dropdowns():
+    df = TICKETS.to_df()
+    dropdowns = {}
+    d = dropdown_map(df, status_col, defaults=DEFAULT_STATUSES)
+    if d: dropdowns.update(d)
+    d = dropdown_map(df, priority_col, defaults=DEFAULT_PRIORITIES)
+    if d: dropdowns.update(d)
+    d = dropdown_map(df, owner_col)
+    if d: dropdowns.update(d)
+    d = dropdown_map(df, epic_col)
+    if d: dropdowns.update(d)
+    return dropdowns
+
+# ---------- Bulk import: CSV / XLSX files streamed into TICKETS (pm_app/bulk_import.py) ----------
+def ticket_roles():
+    return {"id": id_col, "title": title_col, "status": status_col, "priority": priority_col,
+            "owner": owner_col, "epic": epic_col}
+
+def ticket_import_mapping(header, roles, columns):
+    """{file column: table column}: the ticket column candidates first, then columns of the same name."""
+    df = pd.DataFrame(columns=header)
+    mapping = {}
+    for role, col in roles.items():
+        src = first_existing_column(df, [col] + TICKET_COLUMN_CANDIDATES[role])
+        if src and src not in mapping:
+            mapping[src] = col
+    by_name = {c.lower(): c for c in columns}
+    for h in header:
+        col = by_name.get(h.strip().lower())
+        if h not in mapping and col and col not in mapping.values():
+            mapping[h] = col
+    return mapping
+
+def ticket_importer(columns, roles, statuses, priorities, known_ids, reserve_ids, commit, report_path,
+                    chunk_rows=CHUNK_ROWS) -> BulkImport:
+    """A BulkImport into a tickets table (used by the Tickets tab and scripts/import_tickets_bulk.py).
+    Blank status / priority default as in New Ticket, and Created / Updated to today."""
+    defaults = {roles["status"]: "To Do", roles["priority"]: "Medium"}
+    defaults.update({c: today_yyyymmdd() for c in columns if c.strip().lower() in ("created", "updated")})
+    return BulkImport(columns, lambda header: ticket_import_mapping(header, roles, columns), roles,
+                      DEFAULT_STATUSES + list(statuses), DEFAULT_PRIORITIES + list(priorities),
+                      known_ids=known_ids, reserve_ids=reserve_ids, commit=commit, dates=DATES,
+                      report_path=report_path, chunk_rows=chunk_rows, defaults=defaults)
+
+def import_tickets_file(path, report_path, sheet=None, progress=None) -> dict:
+    """Stream a CSV / XLSX file into TICKETS; every chunk is written to the store as one transaction.
+
+    A chunk's rows are journaled (so the other workers tail them in) and saved
+    straight away, not through a compaction, so edits elsewhere wait for one
+    chunk at most. The flow rollups and search indexes catch up once, at the end.
+    """
+    def commit(rows):
+        with TICKETS.lock, JOURNAL.held():
+            added = TICKETS.extend(rows)
+            TICKETS_DB.save_rows({k: dict(TICKETS.rows[k]) for k in added}, [], TICKETS.key_col, TICKETS.columns)
+            TICKETS.mark_saved(TICKETS.digest.snapshot(added))
+        added = set(added)
+        return [r[id_col] for r in rows if r[id_col] not in added]
+
+    with TICKETS.lock:
+        imp = ticket_importer(TICKETS.columns, ticket_roles(), [v for v, _ in STATUS_INDEX.counts()],
+                              [v for v, _ in PRIORITY_INDEX.counts()], known_ids=ticket_ids_in_use(),
+                              reserve_ids=reserve_ticket_ids, commit=commit, report_path=report_path)
+        # IDs typed past the sequence must not be handed out to the file's blank-ID rows
+        TICKET_IDS.advance(max_ticket_number(imp.known_ids))
+    try:
+        return imp.run(path, sheet=sheet, progress=progress)
+    finally:
+        # explicit IDs from the file may run past the sequence
+        TICKET_IDS.advance(max_ticket_number(imp.known_ids))
+        update_flow()
+        persist_search_indexes()
+        JOURNAL.announce()      # open sessions re-render, as for another worker's edits
+
+def submit_ticket_import(path, name):
+    """Queue an import of the file at path (the upload, already on disk); the report goes next to it."""
+    report = os.path.splitext(path)[0] + ".rejected.csv"
+    def run(job):
+        job.progress(f"Reading {name}")
+        stats = import_tickets_file(path, report, progress=job.progress)
+        job.progress(f"Imported {stats['imported']} of {stats['rows']} rows from {name}"
+                     + (f", {stats['rejected']} rejected" if stats["rejected"] else "")
+                     + f" in {stats['seconds']}s")
+        return stats
+    return JOBS.submit(f"Import tickets from {name}", run, resource="tickets import")
 
 # ---------- UI helpers ----------
 BASE_STYLE = {"padding":"16px","fontFamily":"Arial"}
@@ -244,10 +614,11 @@ DT_STYLE_CELL = {
     "fontSize":"14px",
 }
 
-def kpi_cards(df):
-    total = len(df)
-    status_counts = df[status_col].value_counts() if status_col in df.columns else pd.Series(dtype=int)
-    prio_counts = df[priority_col].value_counts() if priority_col in df.columns else pd.Series(dtype=int)
+def kpi_cards(table):
+    with table.lock:
+        total = len(table)
+        status_counts = STATUS_INDEX.counts() if status_col in table.columns else []
+        prio_counts = PRIORITY_INDEX.counts() if priority_col in table.columns else []
 
     def card(title, value):
         return html.Div(
@@ -258,16 +629,182 @@ def kpi_cards(df):
         )
 
     cards = [card("Total tickets", total)]
-    for k, v in status_counts.head(3).items():
-        cards.append(card(f"Status: {k}", int(v)))
-    for k, v in prio_counts.head(2).items():
-        cards.append(card(f"Priority: {k}", int(v)))
+    for k, v in status_counts[:3]:
+        cards.append(card(f"Status: {k}", v))
+    for k, v in prio_counts[:2]:
+        cards.append(card(f"Priority: {k}", v))
     return html.Div(style={'position':'relative', "display":"flex","gap":"10px","flexWrap":"wrap","margin":"10px 0"}, children=cards)
 
-def kanban_subset(df, status_name):
-    show_cols = [c for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in df.columns]
-    df2 = df[df[status_col] == status_name] if status_col in df.columns else df.iloc[0:0]
-    return df2[show_cols].to_dict("records")
+KANBAN_TABLES = [("kanban_todo", "To Do"), ("kanban_ip", "In Progress"), ("kanban_blk", "Blocked"), ("kanban_done", "Done")]
+
+def kanban_card(table, key):
+    show_cols = [c for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in table.columns]
+    r = table.rows[key]
+    return dict({c: r.get(c, "") for c in show_cols}, id=key)
+
+def kanban_subset(table, status_name):
+    if status_col not in table.columns:
+        return []
+    with table.lock:
+        return [kanban_card(table, k) for k in STATUS_INDEX.keys(status_name)]
+
+# --- Kanban deltas: Patch the four kanban tables instead of re-sending them ---
+def kanban_snapshot(table, keys):
+    """{key: (status, index within that status column, card)} for the given keys."""
+    out = {}
+    for k in keys:
+        pos = STATUS_INDEX.position(k)
+        if pos is not None:
+            out[k] = (pos[0], pos[1], kanban_card(table, k))
+    return out
+
+def kanban_before(synced_version, keys):
+    """Call under TICKETS.lock before a mutation; None if the browser copy is stale."""
+    if synced_version != TICKETS.token:
+        return None
+    return kanban_snapshot(TICKETS, keys)
+
+def kanban_after(before, keys):
+    """Call under TICKETS.lock after a mutation; returns the 4 kanban data outputs
+    (Patch objects, or full lists if the browser was out of sync) + kanban_version."""
+    if before is None:
+        return [kanban_subset(TICKETS, name) for _, name in KANBAN_TABLES] + [TICKETS.token]
+    after = kanban_snapshot(TICKETS, set(keys) | set(before))
+    outs = []
+    for _, name in KANBAN_TABLES:
+        p, touched = Patch(), False
+        gone = [i for k, (st, i, _) in before.items() if st == name and after.get(k, (None,))[0] != name]
+        for i in sorted(gone, reverse=True):
+            del p[i]
+            touched = True
+        came = [(i, card) for k, (st, i, card) in after.items() if st == name and before.get(k, (None,))[0] != name]
+        for i, card in sorted(came, key=lambda x: x[0]):
+            p.insert(i, card)
+            touched = True
+        for k, (st, i, card) in after.items():
+            if st == name and before.get(k, (None,))[0] == name and before[k][2] != card:
+                p[i] = card
+                touched = True
+        outs.append(p if touched else no_update)
+    return outs + [TICKETS.token]
+
+# ---------- History: the board as it stood after any earlier save ----------
+# Rebuilt from the store's history (TableStore.rows_at), so it covers edits once the
+# journal has folded them in (at most JOURNAL_COMPACT_SECONDS behind)
+HISTORY_CARDS = 200     # cards listed per status column; the counts are always complete
+
+def fmt_ts(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+def parse_history_time(text):
+    """Unix time from "YYYY-MM-DD HH:MM[:SS]", or the end of the day for "YYYY-MM-DD"; None if unparsable."""
+    text = (text or "").strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").timestamp() + 86399
+    except ValueError:
+        return None
+
+def history_marks(timeline, n=6):
+    if not timeline:
+        return {}
+    step = max(1, (len(timeline) - 1) // (n - 1)) if n > 1 else len(timeline)
+    idx = sorted(set(range(0, len(timeline), step)) | {len(timeline) - 1})
+    return {i: time.strftime("%m-%d %H:%M", time.localtime(timeline[i][1])) for i in idx}
+
+def history_board(rows):
+    """One column per status (the defaults first): count plus the first HISTORY_CARDS cards."""
+    show_cols = [c for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in TICKETS.columns]
+    by_status = {s: [] for s in DEFAULT_STATUSES}
+    for k, r in rows.items():
+        by_status.setdefault(r.get(status_col, "") or "To Do", []).append(k)
+    columns = []
+    for status, keys in by_status.items():
+        cards = [dict({c: rows[k].get(c, "") for c in show_cols}, id=k) for k in keys[:HISTORY_CARDS]]
+        columns.append(html.Div(
+            style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"},
+            children=[
+                html.Div(f"{status} ({len(keys)})", style={"fontWeight":800,"fontFamily":"Arial"}),
+                DataTable(data=cards, columns=[{"name": c, "id": c} for c in show_cols],
+                          page_size=10, style_cell=DT_STYLE_CELL),
+            ]))
+    return columns
+
+def history_changes(before, changes):
+    """Rows for the "changed in this save" table."""
+    out = []
+    for k, row in changes.items():
+        old = (before or {}).get(k)
+        if row is None:
+            what = "deleted"
+        elif old is None:
+            what = "added"
+        elif (old.get(status_col, "") or "To Do") != (row.get(status_col, "") or "To Do"):
+            what = f"{old.get(status_col, '') or 'To Do'} → {row.get(status_col, '') or 'To Do'}"
+        else:
+            what = "edited " + ", ".join(c for c in row if row.get(c, "") != old.get(c, ""))
+        title = (row or old or {}).get(title_col, "")
+        out.append({"Ticket": k, "Title": title, "Change": what})
+    return out
+
+# ---------- Flow: cumulative flow and burn-down from the stored rollups ----------
+FLOW_WINDOWS = [("Last 30 days", 30), ("Last 90 days", 90), ("Last year", 365), ("All", 0)]
+
+def iso_day(day):
+    return f"{day[:4]}-{day[4:6]}-{day[6:]}"
+
+def flow_figures(window_days):
+    """(cumulative-flow figure, burn-down figure, cycle-time figure, summary) from FLOW's tables."""
+    today = time.strftime("%Y%m%d")
+    due = FLOW.due_counts()
+    days, counts = FLOW.daily_counts(last_day=max([today] + [d for d, _ in due[-1:]]))
+    if not days:
+        empty = {"data": [], "layout": {"title": {"text": "No rollups yet"}}}
+        return empty, empty, empty, "No saved ticket history to roll up yet."
+    past = sum(1 for d in days if d <= today)
+    cut = max(0, past - window_days) if window_days else 0
+    layout = lambda title: {"title": {"text": title}, "margin": {"t": 40, "r": 10}, "hovermode": "x unified"}
+
+    order = [FLOW.done] + [st for st in reversed(DEFAULT_STATUSES) if st != FLOW.done] + \
+            sorted(st for st in counts if st not in DEFAULT_STATUSES)
+    x = [iso_day(d) for d in days[cut:past]]
+    cfd = {"data": [{"type": "scatter", "mode": "lines", "stackgroup": "flow", "name": st,
+                     "x": x, "y": counts[st][cut:past]} for st in order if st in counts],
+           "layout": layout("Cumulative flow")}
+
+    # burn-down: open tickets per day vs. the plan (tickets not due yet), out to the last due day
+    open_now = [sum(series[i] for st, series in counts.items() if st != FLOW.done) for i in range(cut, past)]
+    due_total, due_by_day = sum(n for _, n in due), dict(due)
+    run, planned = sum(n for d, n in due if d < days[0]), []
+    for d in days:
+        run += due_by_day.get(d, 0)
+        planned.append(due_total - run)
+    burn = {"data": [{"type": "scatter", "mode": "lines", "name": "Open tickets", "x": x, "y": open_now},
+                     {"type": "scatter", "mode": "lines", "name": "Planned (not due yet)", "line": {"dash": "dash"},
+                      "x": [iso_day(d) for d in days[cut:]], "y": planned[cut:]}],
+            "layout": layout("Burn-down")}
+
+    cycle = FLOW.cycle_times()
+    hist = {"data": [{"type": "bar", "name": "Tickets", "x": [d for d, _ in cycle], "y": [n for _, n in cycle]}],
+            "layout": dict(layout("Cycle time (days)"), bargap=0.05, hovermode="closest")}
+
+    done = FLOW.throughput()
+    since = lambda n: time.strftime("%Y%m%d", time.localtime(time.time() - n * 86400))
+    last = lambda n: sum(v for d, v in done.items() if d > since(n))
+    wip = [f"{st} {counts[st][past - 1]}" for st in order
+           if st in counts and st not in (FLOW.backlog, FLOW.done) and counts[st][past - 1]]
+    p50, p85 = percentile(cycle, 0.5), percentile(cycle, 0.85)
+    summary = " · ".join([
+        "WIP: " + (", ".join(wip) or "0"),
+        f"Throughput: {last(7)} in the last 7 days, {last(30)} in the last 30",
+        f"Cycle time p50 {'-' if p50 is None else p50} d, p85 {'-' if p85 is None else p85} d",
+        f"Rollups updated in {FLOW.stats['update_ms']:.0f} ms",
+    ])
+    return cfd, burn, hist, summary
 
 # ---------- App ----------
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
@@ -298,13 +835,9 @@ def load_overview():
         return DEFAULT_OVERVIEW.copy()
 
 
-def load_project_index():
-    path = os.path.join(DATA_DIR, "project_index.json")
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f) or {}
-    except Exception:
-        return {}
+# docs/ and data/ listing, rebuilt by a watcher when files come and go
+PROJECT_INDEX = ProjectIndexWatcher(os.path.dirname(DATA_DIR), os.path.join(DATA_DIR, "project_index.json"),
+                                    changed=EVENTS)
 
 def save_overview(d: dict):
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -381,6 +914,7 @@ def render_overview_tab():
             ),
             html.Hr(),
             html.H4("Project Index (repo)"),
+            dcc.Store(id="project_index_version", data=PROJECT_INDEX.version),
             DataTable(
                 id="tbl-project-index",
                 data=[],
@@ -453,6 +987,76 @@ DataTable(
 app = Dash(__name__, prevent_initial_callbacks="initial_duplicate")
 app.title = "Project Aion - PM System"
 
+# Callback latency / payload / row histograms and /metrics (instrumented before any callback is registered)
+METRICS = instrument(app, "pm")
+METRICS.gauge("pm_table_rows", "Rows in the in-memory PM tables.", ("table",),
+              lambda: {(t.name,): len(t) for t in (TICKETS, DECISIONS)} if READY.is_set() else {})
+METRICS.gauge("pm_journal_pending_records", "Journal records not yet folded into the store.", (),
+              lambda: {(): JOURNAL.stats["records"]})
+
+# The first request starts the warm-up if create_app() did not. Page shell and
+# bundle requests are served straight away; callbacks and the event stream wait
+# for the data, then first apply edits other workers have journaled (one stat if none).
+@app.server.before_request
+def _start_background():
+    start_warm_up()
+    if request.path.startswith(("/_dash-update-component", "/_pm/events", "/_pm/versions")):
+        wait_ready()
+        JOURNAL.poll()
+
+# Server-sent events: the browser (assets/pm_events.js) holds one stream open and
+# is told when the project index changes or another worker's edits arrived here.
+# An open stream holds one server thread (gunicorn gthread workers) for as long as
+# the tab stays open, so a worker serves at most PM_EVENT_STREAMS of them and keeps
+# the rest of its threads for callbacks. Past the cap the stream answers 204, which
+# tells EventSource not to reconnect, and the tab polls /_pm/versions instead.
+PM_EVENT_STREAMS = int(os.environ.get("PM_EVENT_STREAMS", 8))
+_EVENT_STREAM_SLOTS = threading.BoundedSemaphore(PM_EVENT_STREAMS)
+
+@app.server.route("/_pm/events")
+def _pm_events():
+    if not _EVENT_STREAM_SLOTS.acquire(blocking=False):
+        return Response(status=204)
+    seen = {"project-index": -1, "tables": JOURNAL.version}
+    current = lambda: {"project-index": PROJECT_INDEX.version, "tables": JOURNAL.version}
+
+    def stream():
+        while True:
+            with EVENTS:
+                EVENTS.wait_for(lambda: current() != seen, timeout=25)
+            now = current()
+            changed = [k for k in now if now[k] != seen[k]]
+            for k in changed:
+                seen[k] = now[k]
+                data = json.dumps(dict(table_digests(), version=now[k])) if k == "tables" else now[k]
+                yield f"event: {k}\ndata: {data}\n\n"
+            if not changed:
+                yield ": keepalive\n\n"
+
+    resp = Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+    resp.call_on_close(_EVENT_STREAM_SLOTS.release)
+    return resp
+
+def table_digests():
+    """{table: [content digest, saved digest]} for the browser's dirty flags."""
+    return {t.name: [t.content_token(), t.saved_token()] for t in (TICKETS, DECISIONS)}
+
+# The polling fallback: versions that are the same whichever worker answers (the
+# journal file's identity and size move with every worker's edits)
+@app.server.route("/_pm/versions")
+def _pm_versions():
+    try:
+        st = os.stat(JOURNAL.path)
+        tables = zlib.crc32(f"{st.st_ino}.{st.st_size}".encode())
+    except OSError:
+        tables = 0
+    index = zlib.crc32(json.dumps(PROJECT_INDEX.rows()).encode("utf-8"))
+    return {"project-index": index, "tables": dict(table_digests(), version=tables)}
+
+@app.server.route("/_pm/startup")
+def _pm_startup():
+    return dict(STARTUP.as_dict(), ready=READY.is_set())
+
 # Force Arial at page level too
 app.index_string = """
 <!DOCTYPE html>
@@ -478,434 +1082,687 @@ app.index_string = """
 """
 
 
-app.layout = html.Div(
-    style=BASE_STYLE,
-    children=[
-                html.Div(
-            style={
-                "border": "1px solid #ddd",
-                "borderRadius": "16px",
-                "padding": "32px 18px",
-                "minHeight": "120px",
-                "marginBottom": "12px",
-                "backgroundColor": "white",
-                "boxShadow": "0 1px 2px rgba(0,0,0,0.06)",
-                "pointerEvents": "none",
-            },
-            children=[
-                html.Div(
-                    style={"display":"flex","alignItems":"center","justifyContent":"space-between","gap":"14px"},
-                    children=[
-                        html.Div(
-                            style={"display":"flex","flexDirection":"column","alignItems":"center","gap":"6px","marginLeft":"11px"},
-                            children=[
-                                html.Img(
-                                    src=app.get_asset_url("logos/aion_logo.png"),
-                                    style={
-                                        "height":"72px",
-                                        "width":"72px",
-                                        "opacity": 0.98,
-                                        "display":"block",
-                                    },
-                                ),
-                                html.Div(
-                                    AION_UI_VERSION,
-                                    style={
-                                        "fontSize":"12px",
-                                        "fontWeight":800,
-                                        "letterSpacing":"0.06em",
-                                        "color":"#6b7280",
-                                        "lineHeight":"1","textAlign":"center","width":"72px",
-                                    },
-                                ),
-                            ],
-                        ),
-                        html.H2(
-                            "Project Aion — PM System",
-                            style={"fontFamily":"Arial","textAlign":"right","margin":"0"},
-                        ),
-                    ],
-                )
-            ],
-        ),
-
-        html.Hr(),
-
-
-        dcc.Store(id="tickets_store", data=tickets_df.to_dict("records")),
-        dcc.Store(id="decisions_store", data=decisions_df.to_dict("records")),
-        dcc.Store(id="tickets_saved_hash", data=df_hash(tickets_df)),
-        dcc.Store(id="decisions_saved_hash", data=df_hash(decisions_df)),
-        dcc.Interval(id="autosave", interval=60_000, n_intervals=0),
-
-        dcc.Tabs([
-            dcc.Tab(label="Overview", children=render_overview_tab()),
-
-            dcc.Tab(label="Tickets", children=[
-                html.Div(id="tickets_kpis"),
-
-                html.Div(style={"display":"flex","gap":"8px","margin":"8px 0","flexWrap":"wrap"}, children=[
-                    html.Button("Save Tickets", id="btn_save_tickets"),
-                    html.Button("Reload Tickets", id="btn_reload_tickets"),
-                    html.Button("Export Tickets to Excel", id="btn_export_tickets"),
-                    html.Div(id="tickets_dirty", style={"padding":"6px 10px","border":"1px solid #ddd","borderRadius":"10px", "fontFamily":"Arial"}),
-                ]),
-                html.Div(id="tickets_msg", style={"margin":"8px 0","fontFamily":"Arial"}),
-
-                html.Div(
-                    style={"border":"1px solid #ddd","borderRadius":"12px","padding":"10px","marginBottom":"10px"},
-                    children=[
-                        html.Div("New Ticket", style={"fontWeight":800,"marginBottom":"8px","fontFamily":"Arial"}),
-                        html.Div(style={"display":"flex","gap":"10px","flexWrap":"wrap"}, children=[
-                            dcc.Input(id="new_title", placeholder="Title", style={"width":"360px", "padding":"8px", "fontFamily":"Arial"}),
-                            dcc.Dropdown(id="new_status", options=[{"label": s, "value": s} for s in DEFAULT_STATUSES],
-                                         value="To Do", style={"minWidth":"200px", "fontFamily":"Arial"}),
-                            dcc.Dropdown(id="new_priority", options=[{"label": p, "value": p} for p in DEFAULT_PRIORITIES],
-                                         value="Medium", style={"minWidth":"200px", "fontFamily":"Arial"}),
-                            dcc.Input(id="new_owner", placeholder="Owner", style={"width":"200px","padding":"8px","fontFamily":"Arial"}),
-                            dcc.Input(id="new_epic", placeholder="Epic", style={"width":"200px","padding":"8px","fontFamily":"Arial"}),
-                            html.Button("Add Ticket", id="btn_add_ticket"),
+# Built per page load, so every worker serves the current shared state. Dash also
+# calls this to validate the layout (when assigned and on the first request of
+# any kind); those calls get an empty page instead of waiting for the warm-up.
+def serve_layout():
+    if not (has_request_context() and request.path.endswith("/_dash-layout")):
+        return html.Div()
+    wait_ready()
+    with STARTUP.phase("layout build"):
+        layout = build_layout()
+    if STARTUP.mark("first /_dash-layout"):
+        print(f"[startup] {STARTUP.report()}")
+    return layout
+
+def build_layout():
+    roadmap_df = load_roadmap()
+    return html.Div(
+        style=BASE_STYLE,
+        children=[
+                    html.Div(
+                style={
+                    "border": "1px solid #ddd",
+                    "borderRadius": "16px",
+                    "padding": "32px 18px",
+                    "minHeight": "120px",
+                    "marginBottom": "12px",
+                    "backgroundColor": "white",
+                    "boxShadow": "0 1px 2px rgba(0,0,0,0.06)",
+                    "pointerEvents": "none",
+                },
+                children=[
+                    html.Div(
+                        style={"display":"flex","alignItems":"center","justifyContent":"space-between","gap":"14px"},
+                        children=[
+                            html.Div(
+                                style={"display":"flex","flexDirection":"column","alignItems":"center","gap":"6px","marginLeft":"11px"},
+                                children=[
+                                    html.Img(
+                                        src=app.get_asset_url("logos/aion_logo.png"),
+                                        style={
+                                            "height":"72px",
+                                            "width":"72px",
+                                            "opacity": 0.98,
+                                            "display":"block",
+                                        },
+                                    ),
+                                    html.Div(
+                                        AION_UI_VERSION,
+                                        style={
+                                            "fontSize":"12px",
+                                            "fontWeight":800,
+                                            "letterSpacing":"0.06em",
+                                            "color":"#6b7280",
+                                            "lineHeight":"1","textAlign":"center","width":"72px",
+                                        },
+                                    ),
+                                ],
+                            ),
+                            html.H2(
+                                "Project Aion — PM System",
+                                style={"fontFamily":"Arial","textAlign":"right","margin":"0"},
+                            ),
+                        ],
+                    )
+                ],
+            ),
+
+            html.Hr(),
+
+            html.Div(id="jobs_panel", style={"fontFamily":"Arial","fontSize":"12px","marginBottom":"8px"}),
+            dcc.Interval(id="jobs_poll", interval=1000, n_intervals=0, disabled=True),
+
+            dcc.Store(id="tickets_store", data=TICKETS.state_token),
+            dcc.Store(id="tickets_loaded", data=TICKETS.token),
+            dcc.Store(id="ticket_detail_fields", data=[id_col, title_col, status_col, priority_col, owner_col, epic_col]),
+            dcc.Store(id="kanban_version", data=None),
+            dcc.Store(id="decisions_store", data=DECISIONS.state_token),
+            dcc.Store(id="tickets_saved_hash", data=TICKETS.saved_token()),
+            dcc.Store(id="decisions_saved_hash", data=DECISIONS.saved_token()),
+            dcc.Interval(id="autosave", interval=60_000, n_intervals=0),
+            dcc.Store(id="workbook_versions", data={"charter": WORKBOOK.version(*CHARTER_SHEET),
+                                                    "roadmap": WORKBOOK.version(*ROADMAP_SHEET)}),
+
+            dcc.Tabs(id="pm_tabs", children=[
+                dcc.Tab(label="Overview", children=render_overview_tab()),
+
+                dcc.Tab(label="Tickets", children=[
+                    html.Div(id="tickets_kpis"),
+
+                    html.Div(style={"display":"flex","gap":"8px","margin":"8px 0","flexWrap":"wrap"}, children=[
+                        html.Button("Save Tickets", id="btn_save_tickets"),
+                        html.Button("Reload Tickets", id="btn_reload_tickets"),
+                        html.Button("Export Tickets to Excel", id="btn_export_tickets"),
+                        html.Div(id="tickets_dirty", style={"padding":"6px 10px","border":"1px solid #ddd","borderRadius":"10px", "fontFamily":"Arial"}),
+                    ]),
+                    html.Div(id="tickets_msg", style={"margin":"8px 0","fontFamily":"Arial"}),
+                    html.Div(id="journal_status", style={"margin":"4px 0 8px","fontFamily":"Arial","fontSize":"12px","color":"#6b7280"}),
+
+                    html.Div(
+                        style={"border":"1px solid #ddd","borderRadius":"12px","padding":"10px","marginBottom":"10px"},
+                        children=[
+                            html.Div("New Ticket", style={"fontWeight":800,"marginBottom":"8px","fontFamily":"Arial"}),
+                            html.Div(style={"display":"flex","gap":"10px","flexWrap":"wrap"}, children=[
+                                dcc.Input(id="new_title", placeholder="Title", style={"width":"360px", "padding":"8px", "fontFamily":"Arial"}),
+                                dcc.Dropdown(id="new_status", options=[{"label": s, "value": s} for s in DEFAULT_STATUSES],
+                                             value="To Do", style={"minWidth":"200px", "fontFamily":"Arial"}),
+                                dcc.Dropdown(id="new_priority", options=[{"label": p, "value": p} for p in DEFAULT_PRIORITIES],
+                                             value="Medium", style={"minWidth":"200px", "fontFamily":"Arial"}),
+                                dcc.Input(id="new_owner", placeholder="Owner", style={"width":"200px","padding":"8px","fontFamily":"Arial"}),
+                                dcc.Input(id="new_epic", placeholder="Epic", style={"width":"200px","padding":"8px","fontFamily":"Arial"}),
+                                html.Button("Add Ticket", id="btn_add_ticket"),
+                            ]),
+                            html.Div(id="new_ticket_msg", style={"marginTop":"8px","fontFamily":"Arial"}),
+                        ]
+                    ),
+
+                    html.Div(
+                        style={"border":"1px solid #ddd","borderRadius":"12px","padding":"10px","marginBottom":"10px"},
+                        children=[
+                            html.Div("Bulk Import", style={"fontWeight":800,"marginBottom":"8px","fontFamily":"Arial"}),
+                            dcc.Upload(id="tickets_upload", accept=".csv,.xlsx,.xlsm", multiple=False,
+                                       children=html.Div("Drop a CSV or XLSX file of tickets here, or click to choose one"),
+                                       style={"border":"1px dashed #9ca3af","borderRadius":"10px","padding":"14px",
+                                              "textAlign":"center","fontFamily":"Arial","cursor":"pointer"}),
+                            html.Div(style={"display":"flex","gap":"10px","alignItems":"center","marginTop":"8px"}, children=[
+                                html.Div(id="import_msg", style={"fontFamily":"Arial"}),
+                                html.Button("Download rejected rows", id="btn_import_report", style={"display":"none"}),
+                            ]),
+                            dcc.Store(id="import_job", data=None),
+                            dcc.Download(id="import_report_download"),
+                        ]
+                    ),
+
+                    html.Div(style={"display":"flex","gap":"10px","alignItems":"center","margin":"0 0 8px"}, children=[
+                        dcc.Input(id="tickets_search", type="search", debounce=0.3,
+                                  placeholder="Search tickets (ID, title, owner, epic)",
+                                  style={"width":"420px","padding":"8px","fontFamily":"Arial"}),
+                        html.Span(id="tickets_search_info", style={"fontFamily":"Arial","fontSize":"12px","color":"#6b7280"}),
+                    ]),
+
+                    html.Div(style={"display":"flex","gap":"12px"}, children=[
+                        html.Div(style={"flex":3}, children=[
+                            DataTable(
+                                id="tickets_tbl",
+                                data=[],
+                                columns=[{"name": c, "id": c, "editable": True} for c in TICKETS.columns],
+                                editable=True,
+                                row_deletable=True,
+                                dropdown=ticket_dropdowns(),
+                                page_action="custom",
+                                page_current=0,
+                                page_size=18,
+                                filter_action="custom",
+                                filter_query="",
+                                sort_action="custom",
+                                sort_by=[],
+                                style_table={"overflowX":"auto"},
+                                style_cell=DT_STYLE_CELL,
+                            )
+                        ]),
+                        html.Div(style={"flex":1,"border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
+                            html.Div("Ticket detail", style={"fontWeight":800,"marginBottom":"8px","fontFamily":"Arial"}),
+                            html.Pre(id="ticket_detail", style={"whiteSpace":"pre-wrap","margin":0, "fontFamily":"Arial"}),
                         ]),
-                        html.Div(id="new_ticket_msg", style={"marginTop":"8px","fontFamily":"Arial"}),
-                    ]
-                ),
-
-                html.Div(style={"display":"flex","gap":"12px"}, children=[
-                    html.Div(style={"flex":3}, children=[
-                        DataTable(
-                            id="tickets_tbl",
-                            data=[],
-                            columns=[{"name": c, "id": c, "editable": True} for c in tickets_df.columns],
-                            editable=True,
-                            row_deletable=True,
-                            dropdown=dropdowns,
-                            page_size=18,
-                            filter_action="native",
-                            sort_action="native",
-                            style_table={"overflowX":"auto"},
-                            style_cell=DT_STYLE_CELL,
-                        )
                     ]),
-                    html.Div(style={"flex":1,"border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
-                        html.Div("Ticket detail", style={"fontWeight":800,"marginBottom":"8px","fontFamily":"Arial"}),
-                        html.Pre(id="ticket_detail", style={"whiteSpace":"pre-wrap","margin":0, "fontFamily":"Arial"}),
+                ]),
+
+                dcc.Tab(label="Kanban", children=[
+                    html.Div(style={"display":"flex","gap":"10px","margin":"10px 0","flexWrap":"wrap"}, children=[
+                        dcc.Dropdown(id="move_target_status",
+                                     options=[{"label": s, "value": s} for s in DEFAULT_STATUSES],
+                                     value="In Progress", style={"minWidth":"220px", "fontFamily":"Arial"}),
+                        html.Button("Move selected → target", id="btn_move_selected"),
+                        html.Div(id="kanban_msg", style={"marginLeft":"10px","fontFamily":"Arial"}),
+                    ]),
+                    html.Div(style={"display":"flex","gap":"12px","flexWrap":"wrap"}, children=[
+                        html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
+                            html.Div("To Do", style={"fontWeight":800,"fontFamily":"Arial"}),
+                            DataTable(id="kanban_todo", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in TICKETS.columns],
+                                      row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                        ]),
+                        html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
+                            html.Div("In Progress", style={"fontWeight":800,"fontFamily":"Arial"}),
+                            DataTable(id="kanban_ip", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in TICKETS.columns],
+                                      row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                        ]),
+                        html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
+                            html.Div("Blocked", style={"fontWeight":800,"fontFamily":"Arial"}),
+                            DataTable(id="kanban_blk", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in TICKETS.columns],
+                                      row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                        ]),
+                        html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
+                            html.Div("Done", style={"fontWeight":800,"fontFamily":"Arial"}),
+                            DataTable(id="kanban_done", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in TICKETS.columns],
+                                      row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                        ]),
                     ]),
                 ]),
-            ]),
 
-            dcc.Tab(label="Kanban", children=[
-                html.Div(style={"display":"flex","gap":"10px","margin":"10px 0","flexWrap":"wrap"}, children=[
-                    dcc.Dropdown(id="move_target_status",
-                                 options=[{"label": s, "value": s} for s in DEFAULT_STATUSES],
-                                 value="In Progress", style={"minWidth":"220px", "fontFamily":"Arial"}),
-                    html.Button("Move selected → target", id="btn_move_selected"),
-                    html.Div(id="kanban_msg", style={"marginLeft":"10px","fontFamily":"Arial"}),
+                dcc.Tab(label="History", value="history", children=[
+                    dcc.Store(id="history_timeline", data=[]),
+                    html.Div(style={"display":"flex","gap":"10px","alignItems":"center","margin":"10px 0","flexWrap":"wrap"}, children=[
+                        html.Button("Refresh timeline", id="btn_history_refresh"),
+                        dcc.Input(id="history_jump", type="text", debounce=True,
+                                  placeholder="Jump to YYYY-MM-DD [HH:MM]",
+                                  style={"width":"240px","padding":"8px","fontFamily":"Arial"}),
+                        html.Span(id="history_info", style={"fontFamily":"Arial","fontSize":"12px","color":"#6b7280"}),
+                    ]),
+                    dcc.Slider(id="history_slider", min=0, max=0, step=1, value=0, marks={}),
+                    html.Div(id="history_board", style={"display":"flex","gap":"12px","flexWrap":"wrap","marginTop":"10px"}),
+                    html.Div("Changed in this save", style={"fontWeight":800,"fontFamily":"Arial","margin":"12px 0 6px"}),
+                    DataTable(id="history_changes", data=[],
+                              columns=[{"name": c, "id": c} for c in ["Ticket", "Title", "Change"]],
+                              page_size=10, style_cell=DT_STYLE_CELL),
                 ]),
-                html.Div(style={"display":"flex","gap":"12px","flexWrap":"wrap"}, children=[
-                    html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
-                        html.Div("To Do", style={"fontWeight":800,"fontFamily":"Arial"}),
-                        DataTable(id="kanban_todo", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in tickets_df.columns],
-                                  row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+
+                dcc.Tab(label="Flow", value="flow", children=[
+                    html.Div(style={"display":"flex","gap":"10px","alignItems":"center","margin":"10px 0","flexWrap":"wrap"}, children=[
+                        html.Button("Refresh", id="btn_flow_refresh"),
+                        dcc.Dropdown(id="flow_window", options=[{"label": l, "value": n} for l, n in FLOW_WINDOWS],
+                                     value=90, clearable=False, style={"minWidth":"180px","fontFamily":"Arial"}),
+                        html.Span(id="flow_info", style={"fontFamily":"Arial","fontSize":"12px","color":"#6b7280"}),
                     ]),
-                    html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
-                        html.Div("In Progress", style={"fontWeight":800,"fontFamily":"Arial"}),
-                        DataTable(id="kanban_ip", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in tickets_df.columns],
-                                  row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                    dcc.Graph(id="flow_cfd"),
+                    html.Div(style={"display":"flex","gap":"12px","flexWrap":"wrap"}, children=[
+                        dcc.Graph(id="flow_burndown", style={"flex":1,"minWidth":"420px"}),
+                        dcc.Graph(id="flow_cycle", style={"flex":1,"minWidth":"420px"}),
                     ]),
-                    html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
-                        html.Div("Blocked", style={"fontWeight":800,"fontFamily":"Arial"}),
-                        DataTable(id="kanban_blk", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in tickets_df.columns],
-                                  row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                ]),
+
+                dcc.Tab(label="Decisions", children=[
+                    html.Div(style={"display":"flex","gap":"8px","margin":"8px 0","flexWrap":"wrap"}, children=[
+                        html.Button("Add Decision Row", id="btn_add_decision"),
+                        html.Button("Save Decisions", id="btn_save_decisions"),
+                        html.Button("Reload Decisions", id="btn_reload_decisions"),
+                        html.Button("Export Decisions to Excel", id="btn_export_decisions"),
+                        html.Div(id="decisions_dirty", style={"padding":"6px 10px","border":"1px solid #ddd","borderRadius":"10px", "fontFamily":"Arial"}),
                     ]),
-                    html.Div(style={"flex":1,"minWidth":"260px","border":"1px solid #ddd","borderRadius":"12px","padding":"10px"}, children=[
-                        html.Div("Done", style={"fontWeight":800,"fontFamily":"Arial"}),
-                        DataTable(id="kanban_done", data=[], columns=[{"name": c, "id": c} for c in [id_col, title_col, owner_col, priority_col, epic_col] if c in tickets_df.columns],
-                                  row_selectable="multi", page_size=10, style_cell=DT_STYLE_CELL)
+                    html.Div(id="decisions_msg", style={"margin":"8px 0","fontFamily":"Arial"}),
+                    html.Div(style={"display":"flex","gap":"10px","alignItems":"center","margin":"0 0 8px"}, children=[
+                        dcc.Input(id="decisions_search", type="search", debounce=0.3,
+                                  placeholder="Search decisions",
+                                  style={"width":"420px","padding":"8px","fontFamily":"Arial"}),
+                        html.Span(id="decisions_search_info", style={"fontFamily":"Arial","fontSize":"12px","color":"#6b7280"}),
                     ]),
+                    DataTable(
+                        id="decisions_tbl",
+                        data=[],
+                        columns=[{"name": c, "id": c, "editable": True} for c in DECISIONS.columns],
+                        editable=True,
+                        row_deletable=True,
+                        page_action="custom",
+                        page_current=0,
+                        page_size=12,
+                        filter_action="custom",
+                        filter_query="",
+                        sort_action="custom",
+                        sort_by=[],
+                        style_table={"overflowX":"auto"},
+                        style_cell=DT_STYLE_CELL,
+                    ),
                 ]),
-            ]),
 
-            dcc.Tab(label="Decisions", children=[
-                html.Div(style={"display":"flex","gap":"8px","margin":"8px 0","flexWrap":"wrap"}, children=[
-                    html.Button("Add Decision Row", id="btn_add_decision"),
-                    html.Button("Save Decisions", id="btn_save_decisions"),
-                    html.Button("Reload Decisions", id="btn_reload_decisions"),
-                    html.Button("Export Decisions to Excel", id="btn_export_decisions"),
-                    html.Div(id="decisions_dirty", style={"padding":"6px 10px","border":"1px solid #ddd","borderRadius":"10px", "fontFamily":"Arial"}),
+                dcc.Tab(label="Roadmap", children=[
+                    DataTable(
+                        id="roadmap_tbl",
+                        data=roadmap_df.to_dict("records"),
+                        columns=[{"name": c, "id": c} for c in roadmap_df.columns],
+                        page_size=18,
+                        filter_action="native",
+                        sort_action="native",
+                        style_table={"overflowX":"auto"},
+                        style_cell=DT_STYLE_CELL,
+                    )
                 ]),
-                html.Div(id="decisions_msg", style={"margin":"8px 0","fontFamily":"Arial"}),
-                DataTable(
-                    id="decisions_tbl",
-                    data=[],
-                    columns=[{"name": c, "id": c, "editable": True} for c in decisions_df.columns],
-                    editable=True,
-                    row_deletable=True,
-                    page_size=12,
-                    filter_action="native",
-                    sort_action="native",
-                    style_table={"overflowX":"auto"},
-                    style_cell=DT_STYLE_CELL,
-                ),
             ]),
+        ],
+    )
 
-            dcc.Tab(label="Roadmap", children=[
-                DataTable(
-                    data=roadmap_df.to_dict("records"),
-                    columns=[{"name": c, "id": c} for c in roadmap_df.columns],
-                    page_size=18,
-                    filter_action="native",
-                    sort_action="native",
-                    style_table={"overflowX":"auto"},
-                    style_cell=DT_STYLE_CELL,
-                )
-            ]),
-        ]),
-    ],
-)
+app.layout = serve_layout
 
-# ---------- Single writer to tickets_tbl.data ----------
+# ---------- Tickets table: server-side pages cut from TICKETS ----------
+# With a search, only the ranked matches are paged (best first unless sorted)
 @app.callback(
     Output("tickets_tbl", "data"),
+    Output("tickets_tbl", "page_count"),
+    Output("tickets_search_info", "children"),
+    Input("tickets_tbl", "page_current"),
+    Input("tickets_tbl", "page_size"),
+    Input("tickets_tbl", "sort_by"),
+    Input("tickets_tbl", "filter_query"),
+    Input("tickets_search", "value"),
+    Input("tickets_store", "data"),
+)
+def render_tickets_page(page_current, page_size, sort_by, filter_query, search, _version):
+    t0 = time.perf_counter()
+    data, page_count = TICKETS.page(page_current, page_size, sort_by, filter_query, search or "")
+    return data, page_count, search_info(TICKETS, search, t0)
+
+@app.callback(
     Output("tickets_kpis", "children"),
     Input("tickets_store", "data"),
 )
-def render_tickets(rows):
-    df = pd.DataFrame(rows or []).fillna("")
-    df = normalize_dates(df)
-    return df.to_dict("records"), kpi_cards(df)
+def render_tickets(_version):
+    return kpi_cards(TICKETS)
 
-# Table edits update the store
+KANBAN_OUTPUTS = [Output(tid, "data", allow_duplicate=True) for tid, _ in KANBAN_TABLES] + \
+                 [Output("kanban_version", "data", allow_duplicate=True)]
+
+# Table edits merge this session's changed cells into TICKETS and patch the kanban;
+# cells someone else changed meanwhile are reported and re-rendered with their values
 @app.callback(
     Output("tickets_store", "data"),
+    Output("tickets_msg", "children", allow_duplicate=True),
+    *KANBAN_OUTPUTS,
     Input("tickets_tbl", "data_timestamp"),
     State("tickets_tbl", "data"),
+    State("tickets_tbl", "data_previous"),
+    State("kanban_version", "data"),
     prevent_initial_call=True
 )
-def tickets_edited(_, rows):
-    df = pd.DataFrame(rows or []).fillna("")
-    df = normalize_dates(df)
-    return df.to_dict("records")
-
-# Ticket detail
-@app.callback(
+def tickets_edited(_, rows, prev_rows, kanban_version):
+    keys = {r.get("id") for r in (rows or []) + (prev_rows or [])}
+    with TICKETS.lock:
+        before = kanban_before(kanban_version, keys)
+        changed, conflicts = apply_table_edits(TICKETS, rows, prev_rows, dates=DATES)
+        msg = conflict_message(conflicts) if conflicts else no_update
+        if not changed:
+            # re-render the page so the session drops its conflicting values
+            return [TICKETS.state_token if conflicts else no_update, msg] + [no_update] * 5
+        return [TICKETS.state_token, msg] + kanban_after(before, keys)
+
+# Ticket detail, formatted in the browser from the row already on the page
+app.clientside_callback(
+    ClientsideFunction(namespace="pm", function_name="ticketDetail"),
     Output("ticket_detail", "children"),
     Input("tickets_tbl", "active_cell"),
     State("tickets_tbl", "data"),
+    State("ticket_detail_fields", "data"),
 )
-def show_ticket_detail(active_cell, rows):
-    if not active_cell or not rows:
-        return "Click any cell to view the full ticket row here."
-    r = active_cell.get("row")
-    if r is None or r >= len(rows):
-        return "Click any cell to view the full ticket row here."
-    row = rows[r]
-    keys = [id_col, title_col, status_col, priority_col, owner_col, epic_col]
-    ordered = {k: row.get(k, "") for k in keys if k in row}
-    for k in row.keys():
-        if k not in ordered:
-            ordered[k] = row.get(k, "")
-    return "\n".join([f"{k}: {v}" for k, v in ordered.items()])
-
-# New Ticket -> store (and set Created/Updated if those columns exist)
+
+# New Ticket -> TICKETS (and set Created/Updated if those columns exist)
 @app.callback(
     Output("tickets_store", "data", allow_duplicate=True),
     Output("new_ticket_msg", "children"),
+    *KANBAN_OUTPUTS,
     Input("btn_add_ticket", "n_clicks"),
     State("new_title", "value"),
     State("new_status", "value"),
     State("new_priority", "value"),
     State("new_owner", "value"),
     State("new_epic", "value"),
-    State("tickets_store", "data"),
+    State("kanban_version", "data"),
     prevent_initial_call=True
 )
-def add_ticket(_, title, status, priority, owner, epic, rows):
+def add_ticket(_, title, status, priority, owner, epic, kanban_version):
     title = (title or "").strip()
     if not title:
-        return no_update, "Title is required."
-
-    rows = rows or []
-    df = pd.DataFrame(rows).fillna("")
-    df = normalize_dates(df)
-    new_id = next_ticket_id(df, id_col)
-
-    blank = {c: "" for c in df.columns} if len(df.columns) else {}
-    for c in [id_col, title_col, status_col, priority_col, owner_col, epic_col]:
-        blank.setdefault(c, "")
-
-    # If user has Created/Updated columns, set them in YYYYMMDD
-    for c in df.columns:
-        if c.strip().lower() == "created":
-            blank[c] = today_yyyymmdd()
-        if c.strip().lower() == "updated":
-            blank[c] = today_yyyymmdd()
-
-    blank[id_col] = new_id
-    blank[title_col] = title
-    blank[status_col] = status or "To Do"
-    blank[priority_col] = priority or "Medium"
-    blank[owner_col] = (owner or "").strip()
-    blank[epic_col] = (epic or "").strip()
-
-    rows.append(blank)
-    return normalize_dates(pd.DataFrame(rows)).to_dict("records"), f"Added {new_id}"
+        return [no_update, "Title is required."] + [no_update] * 5
+
+    with TICKETS.lock:
+        before = kanban_before(kanban_version, [])
+        columns = list(TICKETS.columns)
+        new_id = next_ticket_id()
+
+        blank = {c: "" for c in columns}
+        for c in [id_col, title_col, status_col, priority_col, owner_col, epic_col]:
+            blank.setdefault(c, "")
+
+        # If user has Created/Updated columns, set them in YYYYMMDD
+        for c in columns:
+            if c.strip().lower() == "created":
+                blank[c] = today_yyyymmdd()
+            if c.strip().lower() == "updated":
+                blank[c] = today_yyyymmdd()
+
+        blank[id_col] = new_id
+        blank[title_col] = title
+        blank[status_col] = status or "To Do"
+        blank[priority_col] = priority or "Medium"
+        blank[owner_col] = (owner or "").strip()
+        blank[epic_col] = (epic or "").strip()
+
+        key = TICKETS.append(blank)
+        kanban = kanban_after(before, [key])
+    return [TICKETS.state_token, f"Added {new_id}"] + kanban
 
 # Save / reload / export
 @app.callback(
     Output("tickets_saved_hash", "data"),
+    Output("decisions_saved_hash", "data", allow_duplicate=True),
     Output("tickets_msg", "children"),
+    Output("journal_status", "children", allow_duplicate=True),
     Input("btn_save_tickets", "n_clicks"),
-    State("tickets_store", "data"),
     prevent_initial_call=True
 )
-def save_tickets(_, rows):
-    df = normalize_dates(pd.DataFrame(rows or [])).fillna("")
-    df.to_csv(TICKETS_CSV, index=False)
-    return df_hash(df), f"Saved tickets to {TICKETS_CSV} at {now_str()}"
+def save_tickets(_):
+    n = compact_journal()
+    return TICKETS.saved_token(), DECISIONS.saved_token(), \
+        f"Saved to {PM_DB_FILE} ({n} rows changed) at {now_str()}", journal_status()
 
 @app.callback(
     Output("tickets_store", "data", allow_duplicate=True),
+    Output("tickets_loaded", "data"),
     Output("tickets_saved_hash", "data", allow_duplicate=True),
     Output("tickets_msg", "children", allow_duplicate=True),
     Input("btn_reload_tickets", "n_clicks"),
     prevent_initial_call=True
 )
 def reload_tickets(_):
-    df = load_tickets()
-    df = ensure_columns(df, [id_col, title_col, status_col, priority_col, owner_col, epic_col]).fillna("")
-    df[status_col] = df[status_col].replace("", "To Do")
-    df = normalize_dates(df)
-    return df.to_dict("records"), df_hash(df), f"Reloaded tickets at {now_str()}"
+    def load():
+        df = load_tickets()
+        df = ensure_columns(df, [id_col, title_col, status_col, priority_col, owner_col, epic_col]).fillna("")
+        df[status_col] = df[status_col].replace("", "To Do")
+        return normalize_dates(df), id_col
+    reload_from_journal(TICKETS, load)
+    return TICKETS.state_token, TICKETS.token, TICKETS.saved_token(), f"Reloaded tickets at {now_str()}"
 
 @app.callback(
     Output("tickets_msg", "children", allow_duplicate=True),
+    Output("jobs_poll", "disabled", allow_duplicate=True),
     Input("btn_export_tickets", "n_clicks"),
-    State("tickets_store", "data"),
     prevent_initial_call=True
 )
-def export_tickets(_, rows):
-    df = normalize_dates(pd.DataFrame(rows or [])).fillna("")
-    safe_export_df_to_excel(EXPORT_TICKETS_SHEET, df)
-    return f"Exported tickets → Excel sheet '{EXPORT_TICKETS_SHEET}' at {now_str()}"
+def export_tickets(_):
+    job = submit_export(TICKETS, EXPORT_TICKETS_SHEET, "tickets")
+    return f"Export to '{EXPORT_TICKETS_SHEET}' queued as job {job.id} at {now_str()}", False
+
+# Bulk import: the upload is spooled to disk and streamed in by a background job
+@app.callback(
+    Output("import_job", "data"),
+    Output("import_msg", "children"),
+    Output("jobs_poll", "disabled", allow_duplicate=True),
+    Input("tickets_upload", "contents"),
+    State("tickets_upload", "filename"),
+    prevent_initial_call=True
+)
+def upload_tickets(contents, filename):
+    if not contents:
+        return no_update, no_update, no_update
+    name = os.path.basename(filename or "tickets.csv")
+    if not name.lower().endswith((".csv", ".xlsx", ".xlsm")):
+        return no_update, f"Can't import '{name}': choose a .csv or .xlsx file.", no_update
+    os.makedirs(PM_IMPORT_DIR, exist_ok=True)
+    path = os.path.join(PM_IMPORT_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{name}")
+    with open(path, "wb") as f:
+        f.write(base64.b64decode(contents.split(",", 1)[1]))
+    job = submit_ticket_import(path, name)
+    return job.id, f"Import of '{name}' queued as job {job.id} at {now_str()}", False
+
+@app.callback(
+    Output("import_msg", "children", allow_duplicate=True),
+    Output("btn_import_report", "style"),
+    Input("jobs_poll", "n_intervals"),
+    State("import_job", "data"),
+    prevent_initial_call=True
+)
+def render_import(_, job_id):
+    # the job may run in another worker: read its state from the shared job table
+    job = JOBS.lookup(job_id) if job_id else None
+    if job is None or job["status"] in ("queued", "running"):
+        return no_update, no_update
+    if job["status"] == "failed" or not job["result"]:
+        return f"Import failed: {job['message']}", {"display":"none"}
+    st = job["result"]
+    msg = f"Imported {st['imported']} of {st['rows']} rows in {st['chunks']} chunks ({st['seconds']}s)"
+    if st["rejected"]:
+        msg += f"; {st['rejected']} rejected"
+    if st["ignored_columns"]:
+        msg += f"; ignored columns: {', '.join(st['ignored_columns'])}"
+    return msg, {} if st["report"] else {"display":"none"}
 
-# Dirty indicator
 @app.callback(
+    Output("import_report_download", "data"),
+    Input("btn_import_report", "n_clicks"),
+    State("import_job", "data"),
+    prevent_initial_call=True
+)
+def download_import_report(_, job_id):
+    job = JOBS.lookup(job_id) if job_id else None
+    if job is None or not job["result"] or not job["result"]["report"]:
+        return no_update
+    return dcc.send_file(job["result"]["report"])
+
+# Background job panel: polled once a second while any job is queued or running
+@app.callback(
+    Output("jobs_panel", "children"),
+    Output("jobs_poll", "disabled"),
+    Input("jobs_poll", "n_intervals"),
+    prevent_initial_call=True
+)
+def render_jobs(_):
+    colors = {"queued": "#6b7280", "running": "#2563eb", "done": "#16a34a", "failed": "#dc2626"}
+    items = []
+    for j in JOBS.recent():
+        extra = f" (+{j['coalesced']} coalesced)" if j["coalesced"] else ""
+        items.append(html.Div([
+            html.Span(f"[{j['id']}] {j['label']}{extra}: "),
+            html.Span(j["status"], style={"fontWeight":800,"color":colors.get(j["status"], "#111")}),
+            html.Span(f" — {j['message']} ({j['seconds']}s)" if j["message"] else f" ({j['seconds']}s)"),
+        ]))
+    return items, not JOBS.any_active()
+
+# Dirty indicator, in the browser (assets/pm_clientside.js): edits hand back a state
+# token carrying the table's content digest, saves / autosave the digest of the saved
+# rows, and the browser compares the two
+app.clientside_callback(
+    ClientsideFunction(namespace="pm", function_name="dirtyFlag"),
     Output("tickets_dirty", "children"),
     Input("tickets_store", "data"),
-    State("tickets_saved_hash", "data"),
+    Input("tickets_saved_hash", "data"),
 )
-def tickets_dirty(rows, saved_hash):
-    df = normalize_dates(pd.DataFrame(rows or [])).fillna("")
-    return "Unsaved changes" if df_hash(df) != (saved_hash or "") else "Saved"
 
-# Kanban render from store
+# Full kanban render from TICKETS (page load and reload; edits send Patches)
 @app.callback(
     Output("kanban_todo", "data"),
     Output("kanban_ip", "data"),
     Output("kanban_blk", "data"),
     Output("kanban_done", "data"),
-    Input("tickets_store", "data"),
+    Output("kanban_version", "data"),
+    Input("tickets_loaded", "data"),
 )
-def render_kanban(rows):
-    df = normalize_dates(pd.DataFrame(rows or [])).fillna("")
-    return (kanban_subset(df, "To Do"),
-            kanban_subset(df, "In Progress"),
-            kanban_subset(df, "Blocked"),
-            kanban_subset(df, "Done"))
-
-# Move selected on Kanban -> store
+def render_kanban(_loaded):
+    with TICKETS.lock:
+        return kanban_after(None, [])
+
+# Move selected on Kanban -> TICKETS (the browser sends only the selected row ids)
 @app.callback(
     Output("tickets_store", "data", allow_duplicate=True),
     Output("kanban_msg", "children"),
+    *KANBAN_OUTPUTS,
+    *[Output(tid, "selected_rows") for tid, _ in KANBAN_TABLES],
+    *[Output(tid, "selected_row_ids") for tid, _ in KANBAN_TABLES],
     Input("btn_move_selected", "n_clicks"),
     State("move_target_status", "value"),
-    State("kanban_todo", "selected_rows"),
-    State("kanban_ip", "selected_rows"),
-    State("kanban_blk", "selected_rows"),
-    State("kanban_done", "selected_rows"),
-    State("kanban_todo", "data"),
-    State("kanban_ip", "data"),
-    State("kanban_blk", "data"),
-    State("kanban_done", "data"),
-    State("tickets_store", "data"),
+    *[State(tid, "selected_row_ids") for tid, _ in KANBAN_TABLES],
+    State("kanban_version", "data"),
     prevent_initial_call=True
 )
-def move_selected(_, target, sel_todo, sel_ip, sel_blk, sel_done, data_todo, data_ip, data_blk, data_done, all_rows):
+def move_selected(_, target, sel_todo, sel_ip, sel_blk, sel_done, kanban_version):
     target = target or "In Progress"
-    selected_ids = []
-
-    def pick(sel, data):
-        if not sel or not data:
-            return
-        for i in sel:
-            if 0 <= i < len(data):
-                selected_ids.append(str(data[i].get(id_col, "")).strip())
-
-    pick(sel_todo, data_todo)
-    pick(sel_ip, data_ip)
-    pick(sel_blk, data_blk)
-    pick(sel_done, data_done)
-
-    selected_ids = [x for x in selected_ids if x]
-    if not selected_ids:
-        return no_update, "No tickets selected."
-
-    updated, moved = [], 0
-    for r in (all_rows or []):
-        rid = str(r.get(id_col, "")).strip()
-        if rid in selected_ids:
-            r[status_col] = target
-            # bump Updated if column exists
-            for c in r.keys():
-                if c.strip().lower() == "updated":
-                    r[c] = today_yyyymmdd()
-            moved += 1
-        updated.append(r)
-
-    df = normalize_dates(pd.DataFrame(updated)).fillna("")
-    return df.to_dict("records"), f"Moved {moved} tickets → {target}"
+    # one lock hold from the membership check to the write: the journal tailer
+    # may delete rows in between otherwise
+    with TICKETS.lock:
+        selected_ids = [k for sel in (sel_todo, sel_ip, sel_blk, sel_done) for k in (sel or []) if k in TICKETS.rows]
+        if not selected_ids:
+            return [no_update, "No tickets selected."] + [no_update] * 13
+
+        values = {status_col: target}
+        # bump Updated if column exists
+        for c in TICKETS.columns:
+            if c.strip().lower() == "updated":
+                values[c] = today_yyyymmdd()
+        before = kanban_before(kanban_version, selected_ids)
+        moved = TICKETS.set_values(selected_ids, values)
+        kanban = kanban_after(before, selected_ids)
+        token = TICKETS.state_token
+    return [token, f"Moved {moved} tickets → {target}"] + kanban + [[]] * 8
+
+# History tab: the timeline of saves (loaded when the tab opens) and the board at the slider's save
+@app.callback(
+    Output("history_timeline", "data"),
+    Output("history_slider", "max"),
+    Output("history_slider", "marks"),
+    Output("history_slider", "value"),
+    Input("pm_tabs", "value"),
+    Input("btn_history_refresh", "n_clicks"),
+)
+def history_timeline(tab, _):
+    if tab != "history":
+        return [no_update] * 4
+    timeline = [list(t) for t in TICKETS_DB.history()]
+    return timeline, max(0, len(timeline) - 1), history_marks(timeline), max(0, len(timeline) - 1)
+
+@app.callback(
+    Output("history_slider", "value", allow_duplicate=True),
+    Output("history_info", "children", allow_duplicate=True),
+    Input("history_jump", "value"),
+    State("history_timeline", "data"),
+    prevent_initial_call=True
+)
+def history_jump(text, timeline):
+    ts = parse_history_time(text)
+    if ts is None:
+        return no_update, "Jump to: use YYYY-MM-DD or YYYY-MM-DD HH:MM"
+    gen = TICKETS_DB.generation_at(ts)
+    gens = [t[0] for t in timeline or []]
+    if gen is None or gen not in gens:
+        return no_update, f"No saved history at or before {text.strip()}"
+    return gens.index(gen), no_update
+
+@app.callback(
+    Output("history_board", "children"),
+    Output("history_changes", "data"),
+    Output("history_info", "children"),
+    Input("history_slider", "value"),
+    State("history_timeline", "data"),
+)
+def render_history(i, timeline):
+    if not timeline:
+        return [], [], "No saved history yet."
+    t0 = time.perf_counter()
+    i = min(max(0, i or 0), len(timeline) - 1)
+    gen, ts, n = timeline[i]
+    before = TICKETS_DB.rows_at(timeline[i - 1][0]) if i > 0 else None
+    rows = TICKETS_DB.rows_at(gen)
+    if rows is None:
+        return [], [], f"History before {fmt_ts(ts)} is not kept."
+    changes = history_changes(before, TICKETS_DB.changes_at(gen))
+    info = (f"Save {i + 1} of {len(timeline)} at {fmt_ts(ts)} · {len(rows)} tickets · {n} rows changed · "
+            f"rebuilt in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return history_board(rows), changes, info
+
+# Flow tab: charts from the stored rollups (brought up to date first, which is cheap when current)
+@app.callback(
+    Output("flow_cfd", "figure"),
+    Output("flow_burndown", "figure"),
+    Output("flow_cycle", "figure"),
+    Output("flow_info", "children"),
+    Input("pm_tabs", "value"),
+    Input("btn_flow_refresh", "n_clicks"),
+    Input("flow_window", "value"),
+)
+def render_flow(tab, _, window):
+    if tab != "flow":
+        return [no_update] * 4
+    FLOW.update()
+    return flow_figures(window or 0)
 
 # Decisions render
+# Server-side pages like the tickets table, so edits only send one page back
 @app.callback(
     Output("decisions_tbl", "data"),
+    Output("decisions_tbl", "page_count"),
+    Output("decisions_search_info", "children"),
+    Input("decisions_tbl", "page_current"),
+    Input("decisions_tbl", "page_size"),
+    Input("decisions_tbl", "sort_by"),
+    Input("decisions_tbl", "filter_query"),
+    Input("decisions_search", "value"),
     Input("decisions_store", "data"),
 )
-def render_decisions(rows):
-    df = pd.DataFrame(rows or []).fillna("")
-    return df.to_dict("records")
+def render_decisions(page_current, page_size, sort_by, filter_query, search, _version):
+    t0 = time.perf_counter()
+    data, page_count = DECISIONS.page(page_current, page_size, sort_by, filter_query, search or "")
+    return data, page_count, search_info(DECISIONS, search, t0)
 
 @app.callback(
     Output("decisions_store", "data"),
+    Output("decisions_msg", "children", allow_duplicate=True),
     Input("decisions_tbl", "data_timestamp"),
     State("decisions_tbl", "data"),
+    State("decisions_tbl", "data_previous"),
     prevent_initial_call=True
 )
-def decisions_edited(_, rows):
-    return (rows or [])
+def decisions_edited(_, rows, prev_rows):
+    changed, conflicts = apply_table_edits(DECISIONS, rows, prev_rows)
+    return (DECISIONS.state_token if changed or conflicts else no_update,
+            conflict_message(conflicts) if conflicts else no_update)
 
 @app.callback(
     Output("decisions_store", "data", allow_duplicate=True),
     Output("decisions_msg", "children", allow_duplicate=True),
     Input("btn_add_decision", "n_clicks"),
-    State("decisions_store", "data"),
     prevent_initial_call=True
 )
-def add_decision(_, rows):
-    rows = rows or []
-    rows.append({"Date": now_str(), "Decision": "", "Rationale": "", "Owner": "", "Link": ""})
-    return rows, "Added decision row."
+def add_decision(_):
+    DECISIONS.append({"Date": now_str(), "Decision": "", "Rationale": "", "Owner": "", "Link": ""})
+    return DECISIONS.state_token, "Added decision row."
 
 @app.callback(
     Output("decisions_saved_hash", "data"),
+    Output("tickets_saved_hash", "data", allow_duplicate=True),
     Output("decisions_msg", "children"),
+    Output("journal_status", "children", allow_duplicate=True),
     Input("btn_save_decisions", "n_clicks"),
-    State("decisions_store", "data"),
     prevent_initial_call=True
 )
-def save_decisions(_, rows):
-    df = pd.DataFrame(rows or []).fillna("")
-    df.to_csv(DECISIONS_CSV, index=False)
-    return df_hash(df), f"Saved decisions to {DECISIONS_CSV} at {now_str()}"
+def save_decisions(_):
+    n = compact_journal()
+    return DECISIONS.saved_token(), TICKETS.saved_token(), \
+        f"Saved to {PM_DB_FILE} ({n} rows changed) at {now_str()}", journal_status()
 
 @app.callback(
     Output("decisions_store", "data", allow_duplicate=True),
@@ -915,78 +1772,70 @@ def save_decisions(_, rows):
     prevent_initial_call=True
 )
 def reload_decisions(_):
-    df = load_decisions()
-    df = ensure_columns(df, ["Date", "Decision", "Rationale", "Owner", "Link"]).fillna("")
-    return df.to_dict("records"), df_hash(df), f"Reloaded decisions at {now_str()}"
+    def load():
+        df = load_decisions()
+        df = ensure_columns(df, ["Date", "Decision", "Rationale", "Owner", "Link"]).fillna("")
+        return df, infer_decision_id_column(df)
+    reload_from_journal(DECISIONS, load)
+    return DECISIONS.state_token, DECISIONS.saved_token(), f"Reloaded decisions at {now_str()}"
 
 @app.callback(
     Output("decisions_msg", "children", allow_duplicate=True),
+    Output("jobs_poll", "disabled", allow_duplicate=True),
     Input("btn_export_decisions", "n_clicks"),
-    State("decisions_store", "data"),
     prevent_initial_call=True
 )
-def export_decisions(_, rows):
-    df = pd.DataFrame(rows or []).fillna("")
-    safe_export_df_to_excel(EXPORT_DECISIONS_SHEET, df)
-    return f"Exported decisions → Excel sheet '{EXPORT_DECISIONS_SHEET}' at {now_str()}"
+def export_decisions(_):
+    job = submit_export(DECISIONS, EXPORT_DECISIONS_SHEET, "decisions")
+    return f"Export to '{EXPORT_DECISIONS_SHEET}' queued as job {job.id} at {now_str()}", False
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="pm", function_name="dirtyFlag"),
     Output("decisions_dirty", "children"),
     Input("decisions_store", "data"),
-    State("decisions_saved_hash", "data"),
+    Input("decisions_saved_hash", "data"),
 )
-def decisions_dirty(rows, saved_hash):
-    df = pd.DataFrame(rows or []).fillna("")
-    return "Unsaved changes" if df_hash(df) != (saved_hash or "") else "Saved"
 
-# Autosave if dirty (tickets dates normalized before save)
+# Autosave: the journal already holds every edit; the compactor folds it into the
+# store in the background. This tick nudges the compactor and reports what it did.
 @app.callback(
     Output("tickets_saved_hash", "data", allow_duplicate=True),
     Output("decisions_saved_hash", "data", allow_duplicate=True),
     Output("tickets_msg", "children", allow_duplicate=True),
     Output("decisions_msg", "children", allow_duplicate=True),
+    Output("journal_status", "children"),
     Input("autosave", "n_intervals"),
-    State("tickets_store", "data"),
-    State("decisions_store", "data"),
     State("tickets_saved_hash", "data"),
     State("decisions_saved_hash", "data"),
 )
-def autosave(_, t_rows, d_rows, t_saved, d_saved):
-    t_df = normalize_dates(pd.DataFrame(t_rows or [])).fillna("")
-    d_df = pd.DataFrame(d_rows or []).fillna("")
-
-    t_now = df_hash(t_df) if len(t_df.columns) else (t_saved or "")
-    d_now = df_hash(d_df) if len(d_df.columns) else (d_saved or "")
-
-    t_msg = no_update
-    d_msg = no_update
-    new_t = no_update
-    new_d = no_update
-
-    if len(t_df.columns) and t_now != (t_saved or ""):
-        t_df.to_csv(TICKETS_CSV, index=False)
-        new_t = t_now
-        t_msg = f"Autosaved tickets at {now_str()}"
-
-    if len(d_df.columns) and d_now != (d_saved or ""):
-        d_df.to_csv(DECISIONS_CSV, index=False)
-        new_d = d_now
-        d_msg = f"Autosaved decisions at {now_str()}"
-
-    return new_t, new_d, t_msg, d_msg
+def autosave(_, t_saved, d_saved):
+    t0 = time.perf_counter()
+    if JOURNAL.stats["records"] or tables_dirty():
+        JOURNAL.request_compaction()
+    outs = [no_update] * 4
+    st = JOURNAL.stats
+    done = f"at {st['last_compact_at']} ({st['last_compact_rows']} rows, {st['last_compact_ms']:.1f} ms)"
+    if TICKETS.saved_token() != t_saved:
+        outs[0] = TICKETS.saved_token()
+        if not TICKETS.is_dirty():
+            outs[2] = f"Autosaved tickets {done}"
+    if DECISIONS.saved_token() != d_saved:
+        outs[1] = DECISIONS.saved_token()
+        if not DECISIONS.is_dirty():
+            outs[3] = f"Autosaved decisions {done}"
+    return outs + [f"{journal_status()} · autosave check {(time.perf_counter() - t0) * 1000:.2f} ms"]
 
 if __name__ == "__main__":
     app.run(debug=True, port=8050)
 
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="pm", function_name="syncOverviewStore"),
     Output("store-overview", "data"),
     Input("tbl-overview", "data"),
     prevent_initial_call=True,
 )
-def _sync_overview_store(table_rows):
-    return table_rows
 
 
 @app.callback(
@@ -1004,12 +1853,41 @@ def _save_overview(n_clicks, rows):
 
 @app.callback(
     Output("tbl-project-index", "data"),
+    Input("project_index_version", "data"),
+)
+def _load_project_index_table(_version):
+    return PROJECT_INDEX.rows()
+
+
+# Hot-reload Charter / Roadmap when their sheets change in the workbook
+@app.callback(
+    Output("tbl-charter", "data"),
+    Output("roadmap_tbl", "data"),
+    Output("roadmap_tbl", "columns"),
+    Output("workbook_versions", "data"),
     Input("autosave", "n_intervals"),
+    State("workbook_versions", "data"),
+    prevent_initial_call=True,
 )
-def _load_project_index_table(_n):
-    idx = load_project_index()
-    rows = []
-    for section in ("docs", "data"):
-        for path in (idx.get(section) or []):
-            rows.append({"Section": section, "Path": path})
-    return rows
+def _refresh_workbook_tabs(_n, seen):
+    seen = seen or {}
+    try:
+        now = {"charter": WORKBOOK.version(*CHARTER_SHEET), "roadmap": WORKBOOK.version(*ROADMAP_SHEET)}
+    except Exception:
+        return no_update, no_update, no_update, no_update
+    if now == seen:
+        return no_update, no_update, no_update, no_update
+    charter = load_charter().to_dict("records") if now["charter"] != seen.get("charter") else no_update
+    roadmap_data, roadmap_cols = no_update, no_update
+    if now["roadmap"] != seen.get("roadmap"):
+        r = load_roadmap()
+        roadmap_data, roadmap_cols = r.to_dict("records"), [{"name": c, "id": c} for c in r.columns]
+    return charter, roadmap_data, roadmap_cols, now
+
+
+def create_app():
+    """The PM app, with the data warm-up already running (the server can bind at once)."""
+    start_warm_up()
+    return app
+
+STARTUP.record("import", STARTUP.elapsed_ms())
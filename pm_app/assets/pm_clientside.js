@@ -0,0 +1,54 @@
+/* Clientside callbacks for the PM app: pure presentation, no round trip.
+   Registered in pm_app/app.py with ClientsideFunction(namespace="pm", ...).
+   - dirtyFlag: tickets/decisions "Unsaved changes" / "Saved" label. Every table
+     state token (an edit's reply, or "remote.N.<digest>" from pm_events.js) ends
+     in the table's content digest, and the saved-hash store holds the digest of
+     the rows as last saved; the rows are unsaved while the two differ. Whichever
+     of the two stores moved, the flag is decided here from both.
+   - ticketDetail: the active row of the tickets page as "Field: value" lines.
+   - syncOverviewStore: copy the overview table rows into their store. */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+  pm: {
+    dirtyFlag: function (token, saved) {
+      var digest = token ? String(token).split(".").pop() : "";
+      if (!digest || !saved) {
+        return window.dash_clientside.no_update;
+      }
+      return digest === saved ? "Saved" : "Unsaved changes";
+    },
+
+    ticketDetail: function (activeCell, rows, fields) {
+      var empty = "Click any cell to view the full ticket row here.";
+      if (!activeCell || !rows) {
+        return empty;
+      }
+      var row = null;
+      for (var i = 0; i < rows.length; i++) {
+        if (rows[i].id === activeCell.row_id) {
+          row = rows[i];
+          break;
+        }
+      }
+      if (!row) {
+        row = rows[activeCell.row];
+      }
+      if (!row) {
+        return empty;
+      }
+      var keys = (fields || []).filter(function (k) { return k in row; });
+      Object.keys(row).forEach(function (k) {
+        if (keys.indexOf(k) < 0 && k !== "id" && k !== "_rev") {
+          keys.push(k);
+        }
+      });
+      return keys.map(function (k) {
+        var v = row[k];
+        return k + ": " + (v === null || v === undefined ? "" : v);
+      }).join("\n");
+    },
+
+    syncOverviewStore: function (rows) {
+      return rows;
+    }
+  }
+});
@@ -0,0 +1,69 @@
+/* Server push for the PM app: one EventSource per tab. Assets load before
+   Dash renders the layout (which waits for the server's data warm-up), so the
+   stream is only opened once the layout is on the page and the stores the
+   events set exist.
+   - "project-index": new index version -> project_index_version store.
+   - "tables": another worker's edits were applied on the server -> re-render
+     the tickets page, KPIs, kanban and decisions. The event carries each
+     table's content and saved digests ({version, tickets: [content, saved],
+     decisions: [...]}) for the dirty flags (pm_clientside.js).
+   A worker serves a limited number of streams (PM_EVENT_STREAMS); past that
+   it answers 204, the EventSource closes, and the tab polls /_pm/versions
+   every POLL_MS instead. */
+(function () {
+  var POLL_MS = 5000;
+  var tries = 0;
+
+  function set(id, value) {
+    if (window.dash_clientside && window.dash_clientside.set_props) {
+      window.dash_clientside.set_props(id, { data: value });
+    }
+  }
+
+  function tablesChanged(t) {
+    var token = "remote." + t.version;
+    set("tickets_store", token + "." + t.tickets[0]);
+    set("tickets_saved_hash", t.tickets[1]);
+    set("tickets_loaded", token);
+    set("decisions_store", token + "." + t.decisions[0]);
+    set("decisions_saved_hash", t.decisions[1]);
+  }
+
+  function poll(seen) {
+    fetch("/_pm/versions", { cache: "no-store" })
+      .then(function (r) { return r.ok ? r.json() : null; })
+      .then(function (v) {
+        if (!v) { return; }
+        if (!seen || v["project-index"] !== seen["project-index"]) { set("project_index_version", v["project-index"]); }
+        if (seen && v.tables.version !== seen.tables.version) { tablesChanged(v.tables); }
+        seen = v;
+      })
+      .catch(function () {})
+      .then(function () { setTimeout(function () { poll(seen); }, POLL_MS); });
+  }
+
+  function connect() {
+    if (!document.getElementById("tbl-project-index")) {
+      setTimeout(connect, Math.min(2000, 250 * ++tries));   // a slow warm-up can take a while
+      return;
+    }
+    var source = new EventSource("/_pm/events");
+    source.addEventListener("project-index", function (e) {
+      var v = parseInt(e.data, 10);
+      if (!isNaN(v)) { set("project_index_version", v); }
+    });
+    source.addEventListener("tables", function (e) {
+      tablesChanged(JSON.parse(e.data));
+    });
+    source.addEventListener("error", function () {
+      // network errors reconnect on their own; a 204 (streams full) closes for good
+      if (source.readyState === EventSource.CLOSED) { poll(null); }
+    });
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", connect);
+  } else {
+    connect();
+  }
+})();
@@ -0,0 +1,73 @@
+"""
+Per-column bucket index for a RowTable (e.g. tickets by Status / Priority).
+
+Each distinct value keeps its rows as a rank-sorted list of (rank, key), so a
+bucket is already in table order, its size is a count, and a row's position
+inside its bucket is one bisect. RowTable updates the index on every mutation.
+With normalize, rows are bucketed by normalize(cell) (e.g. stripped IDs).
+"""
+from bisect import bisect_left, insort
+
+
+class BucketIndex:
+    def __init__(self, col, normalize=None):
+        self.col = col
+        self.normalize = normalize
+        self.buckets = {}   # value -> [(rank, key), ...] sorted by rank
+        self.value = {}     # key -> (value, rank)
+
+    def _value(self, row):
+        v = row.get(self.col, "")
+        return v if self.normalize is None else self.normalize(v)
+
+    def reset(self, entries):
+        """entries: iterable of (key, rank, row) in rank order."""
+        self.buckets = {}
+        self.value = {}
+        for key, rank, row in entries:
+            v = self._value(row)
+            self.buckets.setdefault(v, []).append((rank, key))
+            self.value[key] = (v, rank)
+
+    def add(self, key, rank, row):
+        v = self._value(row)
+        insort(self.buckets.setdefault(v, []), (rank, key))
+        self.value[key] = (v, rank)
+
+    def remove(self, key):
+        cur = self.value.pop(key, None)
+        if cur is None:
+            return
+        v, rank = cur
+        bucket = self.buckets[v]
+        del bucket[bisect_left(bucket, (rank, key))]
+        if not bucket:
+            del self.buckets[v]
+
+    def refresh(self, key, rank, row):
+        """Move key to the bucket of its current value (no-op if unchanged)."""
+        cur = self.value.get(key)
+        if cur is not None and cur == (self._value(row), rank):
+            return
+        self.remove(key)
+        self.add(key, rank, row)
+
+    # ---------- reads ----------
+    def keys(self, value):
+        return [k for _, k in self.buckets.get(value, ())]
+
+    def position(self, key):
+        """(value, index of key within its bucket), or None for an unknown key."""
+        cur = self.value.get(key)
+        if cur is None:
+            return None
+        v, rank = cur
+        return v, bisect_left(self.buckets[v], (rank, key))
+
+    def count(self, value) -> int:
+        return len(self.buckets.get(value, ()))
+
+    def counts(self):
+        """[(value, count)] largest first; ties in order of first appearance (like value_counts)."""
+        return sorted(((v, len(b)) for v, b in self.buckets.items()),
+                      key=lambda vc: (-vc[1], self.buckets[vc[0]][0][0]))
@@ -0,0 +1,226 @@
+"""
+Streaming bulk import of tickets from a CSV or XLSX file.
+
+The file is read CHUNK_ROWS rows at a time (csv.reader, or openpyxl's
+read-only sheet iterator), so memory stays bounded by the chunk
+and the set of ticket IDs, whatever the file size. For every chunk:
+- headers are mapped onto the table's columns by the caller's map_header (the
+  app's: the first_existing_column candidates, then by name); other columns
+  are ignored and reported;
+- each row is validated: a title is required, status and priority must be
+  known values (blank -> the defaults), an explicit ID must be new, and date
+  cells must parse. Dates are normalized like the table's (DateNormalizer),
+  with one anchor per column for the whole file;
+- rows without an ID get IDs reserved in one call for the chunk;
+- the accepted rows go to commit() in one call, which writes them as one
+  transaction (the app: one table append plus a journal fold; the CLI: one
+  store save). Rows commit() reports as taken are rejected too.
+
+Rejected rows are streamed to a CSV report (the row's line in the CSV file, or
+its row in the sheet, where the record starts; reason; the row as it was in the
+file). Blank lines are skipped and a quoted cell may span lines, so the CSV is
+read with csv.reader, which counts the source lines.
+"""
+import csv
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from pm_app.dates import clean_raw, date_columns, find_anchor
+
+CHUNK_ROWS = 5000
+EXCEL_SUFFIXES = (".xlsx", ".xlsm")
+
+
+def _text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v).strip()
+
+
+def _header(cells):
+    header = [c or f"Column {i + 1}" for i, c in enumerate(cells)]
+    return [c if c not in header[:i] else f"{c}.{i}" for i, c in enumerate(header)]
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS, sheet=None):
+    """Yield ([source line / sheet row of each row], DataFrame of text cells) per chunk."""
+    if str(path).lower().endswith(EXCEL_SUFFIXES):
+        yield from _excel_chunks(path, chunk_rows, sheet)
+    else:
+        yield from _csv_chunks(path, chunk_rows)
+
+
+def _chunks(records, chunk_rows):
+    """Chunk (line, cells) records; the first one with a value is the header, blank ones are skipped."""
+    header, lines, buf = None, [], []
+    for line, cells in records:
+        if header is None:
+            if any(cells):
+                header = _header(cells)
+            continue
+        if not any(cells):
+            continue
+        lines.append(line)
+        buf.append((cells + [""] * len(header))[:len(header)])
+        if len(buf) >= chunk_rows:
+            yield lines, pd.DataFrame(buf, columns=header, dtype=object)
+            lines, buf = [], []
+    if buf:
+        yield lines, pd.DataFrame(buf, columns=header, dtype=object)
+
+
+def _csv_chunks(path, chunk_rows):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+
+        def records():
+            end = 0     # reader.line_num: lines read so far, so a record starts on the line after the last one
+            for cells in reader:
+                yield end + 1, [c.strip() for c in cells]
+                end = reader.line_num
+
+        yield from _chunks(records(), chunk_rows)
+
+
+def _excel_chunks(path, chunk_rows, sheet):
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        yield from _chunks(((n, [_text(v) for v in values]) for n, values in enumerate(rows, start=1)),
+                           chunk_rows)
+    finally:
+        wb.close()
+
+
+def is_day(v) -> bool:
+    try:
+        return len(v) == 8 and 1900 <= datetime.strptime(v, "%Y%m%d").year <= 2200
+    except ValueError:
+        return False
+
+
+class BulkImport:
+    """One import run.
+
+    map_header(header) -> {source column: table column}; roles: the table's
+    "id", "title", "status" and "priority" columns; known_ids: the ticket IDs
+    in use (grows with the rows imported); reserve_ids(n) -> n fresh IDs;
+    commit(rows) writes the rows and returns the IDs it found taken.
+    """
+
+    def __init__(self, columns, map_header, roles, statuses, priorities, known_ids, reserve_ids, commit,
+                 dates, report_path, chunk_rows=CHUNK_ROWS, defaults=None):
+        self.columns = list(columns)
+        self.map_header = map_header
+        self.roles = roles
+        self.statuses = set(statuses)
+        self.priorities = set(priorities)
+        self.known_ids = known_ids
+        self.reserve_ids = reserve_ids
+        self.commit = commit
+        self.dates = dates
+        self.report_path = str(report_path)
+        self.chunk_rows = chunk_rows
+        self.defaults = defaults or {}      # column -> value for blank cells (e.g. status -> "To Do")
+        self.anchors = {}
+        self.mapping = None
+        self.stats = {"rows": 0, "imported": 0, "rejected": 0, "chunks": 0, "ignored_columns": [],
+                      "report": "", "seconds": 0.0}
+        self._report = None
+
+    # ---------- run ----------
+    def run(self, path, sheet=None, progress=None) -> dict:
+        t0 = time.perf_counter()
+        try:
+            for lines, chunk in read_chunks(path, self.chunk_rows, sheet):
+                self._chunk(lines, chunk)
+                if progress:
+                    progress(f"{self.stats['rows']} rows read, {self.stats['imported']} imported, "
+                             f"{self.stats['rejected']} rejected")
+        finally:
+            if self._report is not None:
+                self._report[0].close()
+            self.stats["seconds"] = round(time.perf_counter() - t0, 2)
+        return self.stats
+
+    def _chunk(self, lines, chunk):
+        header = [str(c) for c in chunk.columns]
+        chunk.columns = header
+        if self.mapping is None:
+            self.mapping = self.map_header(header)
+            self.stats["ignored_columns"] = [c for c in header if c not in self.mapping]
+        src = list(self.mapping)
+        targets = [self.mapping[c] for c in src]
+        cells = {t: [_text(v) for v in chunk[s].tolist()] for s, t in zip(src, targets)}
+        n = len(chunk)
+        reasons = [[] for _ in range(n)]
+
+        for col in date_columns(tuple(targets)):
+            raws = [clean_raw(v) for v in cells[col]]
+            if self.anchors.get(col) is None:
+                self.anchors[col] = find_anchor(raws)
+            out = self.dates.normalize_values(raws, self.anchors[col])
+            for i, (raw, v) in enumerate(zip(raws, out)):
+                if raw and not is_day(v):
+                    reasons[i].append(f"bad date in {col}: '{raw}'")
+            cells[col] = [v if is_day(v) else "" for v in out]
+
+        id_col, title_col = self.roles["id"], self.roles["title"]
+        status_col, priority_col = self.roles["status"], self.roles["priority"]
+        rows, ids = [], set()
+        for i in range(n):
+            row = {c: "" for c in self.columns}
+            row.update({t: cells[t][i] for t in targets})
+            for c, v in self.defaults.items():
+                if not row.get(c):
+                    row[c] = v
+            if not row.get(title_col):
+                reasons[i].append("missing title")
+            if row.get(status_col) not in self.statuses:
+                reasons[i].append(f"unknown status '{row.get(status_col)}'")
+            if row.get(priority_col) not in self.priorities:
+                reasons[i].append(f"unknown priority '{row.get(priority_col)}'")
+            key = row.get(id_col, "")
+            if key and (key in self.known_ids or key in ids):
+                reasons[i].append(f"duplicate ID {key}")
+            if not reasons[i]:
+                ids.add(key)
+                rows.append((i, row))
+
+        fresh = iter(self.reserve_ids(sum(1 for _, r in rows if not r.get(id_col))) if rows else [])
+        for _, row in rows:
+            if not row.get(id_col):
+                row[id_col] = next(fresh)
+        taken = set(self.commit([r for _, r in rows])) if rows else set()
+        for i, row in rows:
+            if row[id_col] in taken:
+                reasons[i].append(f"duplicate ID {row[id_col]} (added meanwhile)")
+            else:
+                self.known_ids.add(row[id_col])
+
+        rejected = [i for i in range(n) if reasons[i]]
+        if rejected:
+            self._reject(lines, chunk, rejected, reasons)
+        self.stats["chunks"] += 1
+        self.stats["rows"] += n
+        self.stats["rejected"] += len(rejected)
+        self.stats["imported"] += n - len(rejected)
+
+    def _reject(self, lines, chunk, rejected, reasons):
+        if self._report is None:
+            os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+            f = open(self.report_path, "w", newline="", encoding="utf-8")
+            w = csv.writer(f)
+            w.writerow(["Row", "Reason"] + list(chunk.columns))
+            self._report = (f, w)
+            self.stats["report"] = self.report_path
+        values = chunk.to_numpy(dtype=object)
+        self._report[1].writerows([lines[i], "; ".join(reasons[i])] + [_text(v) for v in values[i]]
+                                  for i in rejected)
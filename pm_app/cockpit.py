@@ -2,6 +2,8 @@ from pathlib import Path
 import time
 from dash import Dash, html, dcc, dash_table
 
+from pm_app.metrics import instrument
+
 
 
 def column_header_row():
@@ -276,6 +278,7 @@ AION_ROOT = Path(__file__).resolve().parent.parent
 AION_ASSETS = str(AION_ROOT / 'assets')
 app = Dash(__name__, assets_folder=AION_ASSETS)
 app.title = 'Project Aion — Glass Cockpit'
+instrument(app, 'cockpit')  # /metrics
 
 # __AION_DEFAULTS__ (safe placeholders until live feed is wired)
 country_code = globals().get('country_code', 'HK')
@@ -0,0 +1,113 @@
+"""
+Cached date normalization: Start / Due / Created / Updated -> YYYYMMDD (no time).
+
+Output is identical to running the original whole-frame normalize_dates:
+- which columns are dates is worked out once per column set;
+- each distinct raw value is parsed once and memoized.
+
+pd.to_datetime infers one format from the first parseable-looking value in a
+column (the "anchor") and applies it to the rest. So memo entries are keyed by
+(anchor, raw), and new values are always parsed with the anchor in front.
+"""
+import re
+import threading
+from functools import lru_cache
+
+import pandas as pd
+
+DATE_KEYS = ["start", "due", "created", "updated"]
+
+# Values pandas skips when picking the element to infer a format from.
+_NOT_ANCHORS = {"", "NaT", "nat", "NAT", "nan", "NaN", "NAN", "now", "today"}
+
+_TRAILING_MIDNIGHT = re.compile(r"\s+00:00:00$")
+
+_AUTO = object()
+
+
+@lru_cache(maxsize=None)
+def is_date_col(colname: str) -> bool:
+    s = (colname or "").strip().lower()
+    # match exact or common variants like "Start Date", "Due_Date", "Created At", etc.
+    return any(k == s or s.startswith(k) or s.endswith(k) or f"{k} " in s or f" {k}" in s or f"{k}_" in s or f"_{k}" in s for k in DATE_KEYS)
+
+
+@lru_cache(maxsize=256)
+def date_columns(columns: tuple) -> tuple:
+    return tuple(c for c in columns if isinstance(c, str) and is_date_col(c))
+
+
+def clean_raw(v) -> str:
+    """The string normalize_dates actually parses for a cell."""
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        v = ""
+    return _TRAILING_MIDNIGHT.sub("", str(v).strip())
+
+
+def find_anchor(raws):
+    for r in raws:
+        if r not in _NOT_ANCHORS:
+            return r
+    return None
+
+
+class DateNormalizer:
+    def __init__(self, max_memo=500_000):
+        self.max_memo = max_memo
+        self.memo = {}      # (anchor, raw) -> normalized string
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _parse(self, anchor, raws):
+        values = ([anchor] if anchor is not None else []) + list(raws)
+        raw = pd.Series(values, dtype=object).astype(str)
+        dt = pd.to_datetime(raw, errors="coerce", dayfirst=False)
+        formatted = dt.dt.strftime("%Y%m%d")
+        cleaned_raw = raw.str.replace("-", "", regex=False).str.replace("/", "", regex=False)
+        out = formatted.where(dt.notna(), cleaned_raw).replace("NaT", "").fillna("").astype(str).str.strip()
+        out = out.tolist()
+        return out[1:] if anchor is not None else out
+
+    def normalize_values(self, raws, anchor=_AUTO):
+        """Normalize cleaned raw strings of one column; anchor defaults to the first eligible raw."""
+        if anchor is _AUTO:
+            anchor = find_anchor(raws)
+        with self._lock:
+            missing = [r for r in dict.fromkeys(raws) if (anchor, r) not in self.memo]
+            self.misses += len(missing)
+            self.hits += len(raws) - len(missing)
+            if missing:
+                if len(self.memo) + len(missing) > self.max_memo:
+                    self.memo.clear()
+                for r, out in zip(missing, self._parse(anchor, missing)):
+                    self.memo[(anchor, r)] = out
+            return [self.memo[(anchor, r)] for r in raws]
+
+    def normalize_df(self, df: pd.DataFrame, anchors=None) -> pd.DataFrame:
+        """Same result as the original normalize_dates(df).
+
+        anchors: optional {col: anchor} when df is a slice of a larger table, so
+        values are parsed the way they would be in the full column.
+        """
+        df = df.copy()
+        for col in date_columns(tuple(df.columns)):
+            raws = [clean_raw(v) for v in df[col].tolist()]
+            anchor = anchors[col] if anchors and col in anchors else _AUTO
+            df[col] = self.normalize_values(raws, anchor)
+        return df
+
+    def table_anchors(self, table, overrides=None):
+        """Per-date-column anchors of a RowTable, with {key: row} overrides applied."""
+        overrides = overrides or {}
+        anchors = {}
+        with table.lock:
+            for col in date_columns(tuple(table.columns)):
+                anchor = None
+                for k in table.order:
+                    r = clean_raw(overrides.get(k, table.rows[k]).get(col, ""))
+                    if r not in _NOT_ANCHORS:
+                        anchor = r
+                        break
+                anchors[col] = anchor
+        return anchors
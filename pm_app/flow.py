@@ -0,0 +1,366 @@
+"""
+Flow rollups for the PM tickets: daily per-status counts, cycle times and due dates.
+
+FlowRollups follows the store's history (TableStore.changes_since) from a saved
+cursor and folds each write's status transitions into a few small tables in
+the same SQLite file:
+- pm_flow_daily: per day and status, how many tickets entered and left it.
+  The tickets in a status on a day is the running sum up to that day, so the
+  cumulative-flow chart and WIP come straight from this table;
+- pm_flow_cycle: a histogram of cycle times in days (first day out of the
+  backlog to the day it reached done), undone when a ticket is reopened;
+- pm_flow_due: how many tickets are due on each day (the burn-down plan);
+- pm_flow_tickets: each ticket's current status, since when, when it started
+  and finished, and its Updated / Due dates, so the next write is a diff.
+
+A transition is dated by the ticket's Updated column when the same write
+changed it to a plausible day, otherwise by the day of the write. A ticket
+first seen past the backlog (e.g. imported) is in the backlog from its
+Created day until its Updated day, and its cycle time counts from Created. update() is one write
+transaction that re-reads the cursor, so several workers can call it. The
+charts only read the rollup tables, never the history.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+import warnings
+from datetime import date, timedelta
+from functools import lru_cache
+
+import pandas as pd
+
+from pm_app.dates import clean_raw
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pm_flow_cursor (
+    tbl    TEXT PRIMARY KEY,
+    gen    INTEGER NOT NULL,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pm_flow_tickets (
+    tbl     TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    since   TEXT NOT NULL,
+    started TEXT NOT NULL,
+    done    TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    due     TEXT NOT NULL,
+    PRIMARY KEY (tbl, key)
+);
+CREATE TABLE IF NOT EXISTS pm_flow_daily (
+    tbl     TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    entered INTEGER NOT NULL,
+    left    INTEGER NOT NULL,
+    PRIMARY KEY (tbl, day, status)
+);
+CREATE TABLE IF NOT EXISTS pm_flow_cycle (
+    tbl  TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    n    INTEGER NOT NULL,
+    PRIMARY KEY (tbl, days)
+);
+CREATE TABLE IF NOT EXISTS pm_flow_due (
+    tbl TEXT NOT NULL,
+    day TEXT NOT NULL,
+    n   INTEGER NOT NULL,
+    PRIMARY KEY (tbl, day)
+);
+"""
+
+ROLLUP_TABLES = ("pm_flow_tickets", "pm_flow_daily", "pm_flow_cycle", "pm_flow_due")
+KEY_CHUNK = 500
+
+_DAY = re.compile(r"^\d{8}$")
+
+
+def as_day(v) -> str:
+    """v as a YYYYMMDD day ("" if it is not a date). Store rows may still hold the
+    formats they were imported in; each distinct value is parsed once."""
+    return _parse_day(clean_raw(v))
+
+
+@lru_cache(maxsize=65536)
+def _parse_day(raw: str) -> str:
+    if _DAY.match(raw):
+        return raw
+    if not raw:
+        return ""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ts = pd.to_datetime(raw, errors="coerce", dayfirst=False)
+    return "" if pd.isna(ts) else ts.strftime("%Y%m%d")
+
+
+def to_date(day: str) -> date:
+    return date(int(day[:4]), int(day[4:6]), int(day[6:]))
+
+
+def day_span(first: str, last: str):
+    """Every YYYYMMDD day from first to last, inclusive."""
+    d, end = to_date(first), to_date(last)
+    out = []
+    while d <= end:
+        out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+
+class FlowRollups:
+    def __init__(self, db_path, store, status_col="Status", created_col="Created", updated_col="Updated",
+                 due_col="Due", backlog="To Do", done="Done"):
+        self.db_path = str(db_path)
+        self.store = store
+        self.name = store.name
+        self.status_col = status_col
+        self.created_col = created_col
+        self.updated_col = updated_col
+        self.due_col = due_col
+        self.backlog = backlog
+        self.done = done
+        self.config = json.dumps([status_col, created_col, updated_col, due_col, backlog, done])
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"writes": 0, "rows": 0, "update_ms": 0.0}
+
+    def conn(self):
+        if self._conn is None:
+            c = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.executescript(SCHEMA)
+            self._conn = c
+        return self._conn
+
+    # ---------- update ----------
+    def update(self) -> int:
+        """Fold the store writes since the cursor into the rollups; returns writes folded."""
+        t0 = time.perf_counter()
+        with self._lock:
+            c = self.conn()
+            # read the history before taking the write lock (the store's own writes need it)
+            seen = self._cursor(c)
+            writes = self.store.changes_since(seen)
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._cursor(c)
+                if cursor == 0:     # first run, or the columns changed: roll up from the start
+                    for t in ROLLUP_TABLES:
+                        c.execute(f"DELETE FROM {t} WHERE tbl = ?", (self.name,))
+                if cursor != seen:  # another worker folded some meanwhile
+                    writes = self.store.changes_since(cursor) if cursor < seen else \
+                        [w for w in writes if w[0] > cursor]
+                if writes:
+                    fold = _Fold(self, c)
+                    for _, ts, rows, full in writes:
+                        fold.write(time.strftime("%Y%m%d", time.localtime(ts)), rows, full)
+                    fold.save()
+                    cursor = writes[-1][0]
+                    self.stats["rows"] += fold.rows
+                c.execute("INSERT OR REPLACE INTO pm_flow_cursor (tbl, gen, config) VALUES (?, ?, ?)",
+                          (self.name, cursor, self.config))
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+        self.stats["writes"] += len(writes)
+        self.stats["update_ms"] = (time.perf_counter() - t0) * 1000
+        return len(writes)
+
+    def _cursor(self, c) -> int:
+        """The last generation folded in, or 0 if none (or folded with other columns)."""
+        row = c.execute("SELECT gen, config FROM pm_flow_cursor WHERE tbl = ?", (self.name,)).fetchone()
+        return row[0] if row is not None and row[1] == self.config else 0
+
+    # ---------- reads ----------
+    def daily_counts(self, last_day=None):
+        """(days, {status: [tickets in it at the end of each day]}) from the first recorded day
+        through last_day (default: today)."""
+        with self._lock:
+            rows = self.conn().execute("SELECT day, status, entered - left FROM pm_flow_daily "
+                                       "WHERE tbl = ? ORDER BY day", (self.name,)).fetchall()
+        if not rows:
+            return [], {}
+        last_day = max(last_day or time.strftime("%Y%m%d"), rows[-1][0])
+        days = day_span(rows[0][0], last_day)
+        net = {}
+        for day, status, delta in rows:
+            net.setdefault(status, {})[day] = delta
+        counts = {}
+        for status, by_day in net.items():
+            run, series = 0, []
+            for day in days:
+                run += by_day.get(day, 0)
+                series.append(run)
+            counts[status] = series
+        return days, counts
+
+    def throughput(self):
+        """{day: tickets that reached done that day}."""
+        with self._lock:
+            return dict(self.conn().execute("SELECT day, entered FROM pm_flow_daily WHERE tbl = ? AND status = ? "
+                                            "AND entered > 0 ORDER BY day", (self.name, self.done)))
+
+    def cycle_times(self):
+        """[(days, tickets)] of the cycle-time histogram, shortest first."""
+        with self._lock:
+            return self.conn().execute("SELECT days, n FROM pm_flow_cycle WHERE tbl = ? AND n > 0 ORDER BY days",
+                                       (self.name,)).fetchall()
+
+    def due_counts(self):
+        """[(day, tickets due that day)], earliest first."""
+        with self._lock:
+            return self.conn().execute("SELECT day, n FROM pm_flow_due WHERE tbl = ? AND n > 0 ORDER BY day",
+                                       (self.name,)).fetchall()
+
+
+def percentile(histogram, q):
+    """The q-th percentile (0..1) of a [(value, count)] histogram sorted by value, or None."""
+    total = sum(n for _, n in histogram)
+    if not total:
+        return None
+    seen = 0
+    for v, n in histogram:
+        seen += n
+        if seen >= q * total:
+            return v
+    return histogram[-1][0]
+
+
+class _Fold:
+    """One update(): ticket states read on demand, rollup deltas summed in memory,
+    written back in the caller's transaction by save()."""
+
+    def __init__(self, flow, c):
+        self.flow = flow
+        self.c = c
+        self.state = {}         # key -> [status, since, started, done, updated, due], or None if gone
+        self.loaded_all = False
+        self.daily = {}         # (day, status) -> [entered, left]
+        self.cycle = {}         # days -> n
+        self.due = {}           # day -> n
+        self.rows = 0
+
+    def _load(self, keys=None):
+        name = self.flow.name
+        q = "SELECT key, status, since, started, done, updated, due FROM pm_flow_tickets WHERE tbl = ?"
+        if keys is None:
+            if not self.loaded_all:
+                for k, *st in self.c.execute(q, (name,)):
+                    self.state.setdefault(k, list(st))
+                self.loaded_all = True
+            return
+        keys = [k for k in keys if k not in self.state]
+        if self.loaded_all:
+            for k in keys:
+                self.state[k] = None
+            return
+        for i in range(0, len(keys), KEY_CHUNK):
+            chunk = keys[i:i + KEY_CHUNK]
+            found = {k: list(st) for k, *st in self.c.execute(
+                q + f" AND key IN ({','.join('?' * len(chunk))})", (name, *chunk))}
+            for k in chunk:
+                self.state[k] = found.get(k)
+
+    def write(self, save_day, rows, full):
+        if full:
+            self._load()
+            for k in [k for k, st in self.state.items() if st is not None and k not in rows]:
+                self._remove(k, save_day)
+        else:
+            self._load(rows)
+        for k, row in rows.items():
+            if row is None:
+                self._remove(k, save_day)
+            else:
+                self._put(k, row, save_day)
+        self.rows += len(rows)
+
+    def _move(self, day, old, new):
+        if old is not None:
+            self.daily.setdefault((day, old), [0, 0])[1] += 1
+        if new is not None:
+            self.daily.setdefault((day, new), [0, 0])[0] += 1
+
+    def _count(self, hist, k, n):
+        if k != "" and k is not None:
+            hist[k] = hist.get(k, 0) + n
+
+    def _cycle_days(self, st):
+        return (to_date(st[3]) - to_date(st[2])).days if st[2] and st[3] else None
+
+    def _put(self, key, row, save_day):
+        f = self.flow
+        status = str(row.get(f.status_col, "") or "").strip() or f.backlog
+        updated, due = as_day(row.get(f.updated_col)), as_day(row.get(f.due_col))
+        st = self.state.get(key)
+        if st is None:
+            # First seen: in the backlog from its Created day, in its status from its
+            # Updated day; its cycle time (if done) counts from Created
+            created = as_day(row.get(f.created_col))
+            created = created if created and created <= save_day else save_day
+            day = updated if status != f.backlog and created <= updated <= save_day else created
+            st = [status, day, "", "", updated, due]
+            if day > created:
+                self._move(created, None, f.backlog)
+                self._move(day, f.backlog, status)
+            else:
+                self._move(day, None, status)
+            if status != f.backlog:
+                st[2] = created
+            if status == f.done:
+                st[3] = day
+                self._count(self.cycle, self._cycle_days(st), 1)
+            self._count(self.due, due, 1)
+            self.state[key] = st
+            return
+        if status != st[0]:
+            day = updated if updated and updated != st[4] and updated <= save_day else save_day
+            day = max(day, st[1])
+            self._move(day, st[0], status)
+            if st[0] == f.done:
+                self._count(self.cycle, self._cycle_days(st), -1)
+                st[3] = ""
+            if status != f.backlog and not st[2]:
+                st[2] = day
+            if status == f.done:
+                st[3] = day
+                self._count(self.cycle, self._cycle_days(st), 1)
+            st[0], st[1] = status, day
+        if due != st[5]:
+            self._count(self.due, st[5], -1)
+            self._count(self.due, due, 1)
+        st[4], st[5] = updated, due
+
+    def _remove(self, key, save_day):
+        st = self.state.get(key)
+        if st is None:
+            return
+        self._move(max(save_day, st[1]), st[0], None)
+        if st[0] == self.flow.done:
+            self._count(self.cycle, self._cycle_days(st), -1)
+        self._count(self.due, st[5], -1)
+        self.state[key] = None
+
+    def save(self):
+        c, name = self.c, self.flow.name
+        c.executemany("DELETE FROM pm_flow_tickets WHERE tbl = ? AND key = ?",
+                      [(name, k) for k, st in self.state.items() if st is None])
+        c.executemany("INSERT OR REPLACE INTO pm_flow_tickets (tbl, key, status, since, started, done, updated, due) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                      [(name, k, *st) for k, st in self.state.items() if st is not None])
+        c.executemany("INSERT INTO pm_flow_daily (tbl, day, status, entered, left) VALUES (?, ?, ?, ?, ?) "
+                      "ON CONFLICT(tbl, day, status) DO UPDATE SET entered = entered + excluded.entered, "
+                      "left = left + excluded.left",
+                      [(name, d, s, e, l) for (d, s), (e, l) in self.daily.items()])
+        c.executemany("INSERT INTO pm_flow_cycle (tbl, days, n) VALUES (?, ?, ?) "
+                      "ON CONFLICT(tbl, days) DO UPDATE SET n = n + excluded.n",
+                      [(name, d, n) for d, n in self.cycle.items() if n])
+        c.executemany("INSERT INTO pm_flow_due (tbl, day, n) VALUES (?, ?, ?) "
+                      "ON CONFLICT(tbl, day) DO UPDATE SET n = n + excluded.n",
+                      [(name, d, n) for d, n in self.due.items() if n])
+        c.execute("DELETE FROM pm_flow_cycle WHERE tbl = ? AND n = 0", (name,))
+        c.execute("DELETE FROM pm_flow_due WHERE tbl = ? AND n = 0", (name,))
@@ -0,0 +1,203 @@
+"""
+Background jobs for long operations started from the PM UI (Excel exports, ...).
+
+Callbacks submit a job and return at once with its id; the app polls
+JobRunner.recent() for a status panel. Jobs that share a coalesce key and are
+still queued collapse into one, and jobs that share a resource (e.g. the
+workbook file) never run at the same time in one process (work that must not
+overlap across processes takes its own file lock, see safe_export_df_to_excel).
+
+A job runs in the worker process that queued it, but its state (status,
+progress message, result) is written to a SQLite table, so the panel and job
+lookups see every worker's jobs whichever worker answers the poll. A job left
+queued or running by a process that is gone reads as failed.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pm_jobs (
+    id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT NOT NULL,
+    coalesced INTEGER NOT NULL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    pid INTEGER NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS pm_jobs_submitted ON pm_jobs (submitted);
+"""
+
+
+def _alive(pid) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:     # exists but is not ours to signal
+        return True
+    return True
+
+
+class Job:
+    def __init__(self, label, fn, coalesce_key=None, resource=None, runner=None):
+        self.id = uuid.uuid4().hex[:8]
+        self.label = label
+        self.fn = fn
+        self.coalesce_key = coalesce_key
+        self.resource = resource
+        self.runner = runner
+        self.status = QUEUED
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.coalesced = 0
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    def progress(self, message):
+        self.message = message
+        if self.runner is not None:
+            self.runner._save(self)
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+
+class JobRunner:
+    def __init__(self, max_workers=2, keep=50, db_path=None):
+        """db_path: the SQLite file shared by the worker processes (in memory, so
+        this process only, if None)."""
+        self.keep = keep
+        self.db_path = str(db_path) if db_path else ":memory:"
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pm-job")
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._jobs = {}         # id -> Job run by this process, in submission order
+        self._queued = {}       # coalesce key -> queued Job
+        self._resources = {}    # resource name -> Lock
+
+    def conn(self):
+        if self._conn is None:
+            c = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.executescript(SCHEMA)
+            self._conn = c
+        return self._conn
+
+    def _save(self, job):
+        with self._db_lock:
+            self.conn().execute(
+                "INSERT OR REPLACE INTO pm_jobs (id, label, status, message, coalesced, submitted, started,"
+                " finished, pid, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.label, job.status, job.error or job.message, job.coalesced, job.submitted,
+                 job.started, job.finished, os.getpid(),
+                 None if job.result is None else json.dumps(job.result, default=str)))
+
+    def submit(self, label, fn, coalesce_key=None, resource=None) -> Job:
+        """Queue fn(job); returns the Job (an already-queued one if coalesced)."""
+        with self._lock:
+            pending = self._queued.get(coalesce_key) if coalesce_key is not None else None
+            if pending is not None:
+                pending.fn = fn
+                pending.coalesced += 1
+                self._save(pending)
+                return pending
+            job = Job(label, fn, coalesce_key, resource, runner=self)
+            self._jobs[job.id] = job
+            if coalesce_key is not None:
+                self._queued[coalesce_key] = job
+            if resource is not None:
+                self._resources.setdefault(resource, threading.Lock())
+            self._save(job)
+            self._trim()
+        self._pool.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        lock = self._resources.get(job.resource)
+        if lock is not None:
+            lock.acquire()
+        try:
+            with self._lock:
+                if self._queued.get(job.coalesce_key) is job:
+                    del self._queued[job.coalesce_key]
+                job.status = RUNNING
+                job.started = time.time()
+            self._save(job)
+            job.result = job.fn(job)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            self._save(job)
+            if lock is not None:
+                lock.release()
+
+    def _trim(self):
+        done = [j for j in self._jobs.values() if not j.active]
+        for j in done[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[j.id]
+        with self._db_lock:
+            self.conn().execute(
+                "DELETE FROM pm_jobs WHERE status NOT IN (?, ?) AND id NOT IN "
+                "(SELECT id FROM pm_jobs ORDER BY submitted DESC LIMIT ?)", (QUEUED, RUNNING, self.keep))
+
+    # ---------- shared state (every worker's jobs) ----------
+    @staticmethod
+    def _as_dict(row):
+        id_, label, status, message, coalesced, submitted, started, finished, pid, result = row
+        if status in (QUEUED, RUNNING) and not _alive(pid):
+            status, message = FAILED, "worker process exited before the job finished"
+            finished = finished or time.time()
+        elapsed = (finished or time.time()) - (started or submitted)
+        return {
+            "id": id_,
+            "label": label,
+            "status": status,
+            "message": message,
+            "coalesced": coalesced,
+            "seconds": round(elapsed, 2),
+            "result": None if result is None else json.loads(result),
+        }
+
+    def _select(self, where="", params=(), limit=None):
+        sql = ("SELECT id, label, status, message, coalesced, submitted, started, finished, pid, result "
+               f"FROM pm_jobs {where} ORDER BY submitted DESC")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._db_lock:
+            return [self._as_dict(r) for r in self.conn().execute(sql, params).fetchall()]
+
+    def get(self, job_id):
+        """The Job if this process runs it, else None (see lookup() for any worker's)."""
+        return self._jobs.get(job_id)
+
+    def lookup(self, job_id):
+        """A job's state as a dict (see recent()) plus its result, whichever worker runs it; None if unknown."""
+        rows = self._select("WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def recent(self, n=8):
+        return self._select(limit=n)
+
+    def any_active(self) -> bool:
+        return any(j["status"] in (QUEUED, RUNNING)
+                   for j in self._select("WHERE status IN (?, ?)", (QUEUED, RUNNING)))
@@ -0,0 +1,333 @@
+"""
+Write-behind edit journal for the PM tables, shared by every worker process.
+
+Every table edit is appended as one small JSON line ({"tbl", "op", "key", "row"})
+as it happens; a flusher thread fsyncs the file in batches. A compactor thread
+periodically folds the edits into the SQLite store (one transaction per table)
+and then swaps in a fresh journal with an atomic rename. On startup the journal
+is replayed onto the rows loaded from the store. Records are whole-row puts and
+deletes, so replaying one that already reached the store is harmless.
+
+Several processes may share one journal. Appends and compactions take an
+exclusive flock on <journal>.lock, and each process tails the file to apply
+the other processes' records in file order. A record is skipped when this
+process wrote the same key later in the file, because the later whole-row
+write wins. When a tail finds the journal was rotated, everything before the
+rotation is already in the store.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single process only
+    fcntl = None
+
+HEADER = "aion-pm-journal"
+
+
+def parse_lines(data: bytes):
+    """([(end offset in data, record)], bytes consumed) for complete lines; a torn
+    last line (a crash mid-write, or an append still in flight) is left unread."""
+    out = []
+    pos = 0
+    while True:
+        nl = data.find(b"\n", pos)
+        if nl < 0:
+            return out, pos
+        try:
+            rec = json.loads(data[pos:nl])
+        except ValueError:
+            rec = None
+        pos = nl + 1
+        if isinstance(rec, dict) and rec.get("journal") != HEADER:
+            out.append((pos, rec))
+
+
+class EditJournal:
+    def __init__(self, path, fsync_interval=0.25, compact_interval=60.0, tail_interval=0.2, changed=None):
+        self.path = str(path)
+        self.fsync_interval = fsync_interval
+        self.compact_interval = compact_interval
+        self.tail_interval = tail_interval
+        self.lock = threading.RLock()
+        self.tables = {}        # name -> RowTable, in lock order
+        self.version = 0        # bumped when another process's edits are applied here (or on announce())
+        self.stats = {
+            "records": 0,           # records in the current journal file seen by this process
+            "replayed": 0,
+            "replay_ms": 0.0,
+            "compactions": 0,
+            "last_compact_rows": 0,
+            "last_compact_ms": 0.0,
+            "last_compact_at": "",
+            "external": 0,          # records applied from other processes
+        }
+        self._fd = None         # append fd (follows the file at path)
+        self._rfd = None        # read fd (the file being tailed; may lag behind a rotation)
+        self._ino = None        # inode of the tailed file
+        self._offset = 0        # bytes of the tailed file applied here
+        self._own = {}          # (tbl, key) -> (inode, end offset) of this process's last write
+        self._unsynced = False
+        self._flock_fd = None
+        self._flock_depth = 0
+        self._changed = changed or threading.Condition()   # may be shared with other notifiers
+        self._wake = threading.Event()
+        self._compact_now = threading.Event()
+        self._threads = []
+        with self.held():
+            if not os.path.exists(self.path):
+                self._write_fresh(self.path)
+            self._open_append()
+            self._open_read()
+            size = os.fstat(self._rfd).st_size
+            if size and os.pread(self._rfd, 1, size - 1) != b"\n":
+                os.write(self._fd, b"\n")  # end a line torn by a crash, so appends stay parseable
+
+    # ---------- file ----------
+    @staticmethod
+    def _write_fresh(path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"journal": HEADER, "created": time.time()}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _open_append(self):
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+
+    def _open_read(self):
+        if self._rfd is not None:
+            os.close(self._rfd)
+        self._rfd = os.open(self.path, os.O_RDONLY)
+        self._ino = os.fstat(self._rfd).st_ino
+        self._offset = 0
+
+    def _read_new(self):
+        size = os.fstat(self._rfd).st_size
+        return os.pread(self._rfd, max(0, size - self._offset), self._offset) if size > self._offset else b""
+
+    def _rotated(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != self._ino
+        except FileNotFoundError:
+            return False
+
+    @contextmanager
+    def held(self, exclusive=True):
+        """Hold the journal against other threads and (via flock) other processes."""
+        with self.lock:
+            if fcntl is not None and self._flock_depth == 0:
+                if self._flock_fd is None:
+                    self._flock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._flock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._flock_depth += 1
+            try:
+                yield
+            finally:
+                self._flock_depth -= 1
+                if fcntl is not None and self._flock_depth == 0:
+                    fcntl.flock(self._flock_fd, fcntl.LOCK_UN)
+
+    def append(self, records):
+        """Append records (dicts); durable after the next batched fsync."""
+        if not records:
+            return
+        data = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records).encode("utf-8")
+        with self.held():
+            ino = os.stat(self.path).st_ino
+            if ino != os.fstat(self._fd).st_ino:
+                self._open_append()     # rotated by another process
+            os.write(self._fd, data)
+            end = os.lseek(self._fd, 0, os.SEEK_CUR)
+            for r in records:
+                self._own[(r.get("tbl"), r.get("key"))] = (ino, end)
+            self._unsynced = True
+            self.stats["records"] += len(records)
+        self._wake.set()
+
+    def sync(self):
+        with self.lock:
+            if self._unsynced:
+                os.fsync(self._fd)
+                self._unsynced = False
+
+    def pending(self) -> bool:
+        """True if the journal may hold records not yet folded into the store."""
+        try:
+            return self.stats["records"] > 0 or self._rotated() or os.path.getsize(self.path) > self._offset
+        except OSError:
+            return False
+
+    # ---------- replay / tail ----------
+    def read_records(self):
+        """Journal records in append order; a torn last line (crash mid-write) is ignored."""
+        try:
+            with open(self.path, "rb") as f:
+                return [rec for _, rec in parse_lines(f.read())[0]]
+        except FileNotFoundError:
+            return []
+
+    def replay(self, tables: dict) -> int:
+        """Apply the journal onto {name: RowTable} (given in lock order) and tail it from here.
+
+        Hold held() around loading the store and this, so no compaction falls in between.
+        """
+        t0 = time.perf_counter()
+        self.tables = dict(tables)
+        n = 0
+        with self.held(exclusive=False):
+            if self._rotated():
+                self._open_read()
+            parsed, used = parse_lines(self._read_new())
+            for _, rec in parsed:
+                table = self.tables.get(rec.get("tbl"))
+                if table is not None:
+                    table.apply_record(rec.get("op"), rec.get("key"), rec.get("row"), rec.get("rev"))
+                    n += 1
+            self._offset += used
+            self.stats["records"] = len(parsed)
+        self.stats["replayed"] = n
+        self.stats["replay_ms"] = (time.perf_counter() - t0) * 1000
+        return n
+
+    @contextmanager
+    def tables_locked(self):
+        locks = [t.lock for t in self.tables.values()]
+        for lk in locks:
+            lk.acquire()
+        try:
+            yield
+        finally:
+            for lk in reversed(locks):
+                lk.release()
+
+    def _catch_up(self) -> int:
+        """Apply what other processes appended since the last look.
+
+        Caller holds tables_locked() and held(); returns records applied.
+        """
+        applied = 0
+        while True:
+            parsed, used = parse_lines(self._read_new())
+            for end, rec in parsed:
+                key = (rec.get("tbl"), rec.get("key"))
+                table = self.tables.get(key[0])
+                if table is None:
+                    continue
+                own = self._own.get(key)
+                if own is not None and (own[0] != self._ino or own[1] >= self._offset + end):
+                    continue    # our own record, or one we overwrote later
+                table.apply_record(rec.get("op"), key[1], rec.get("row"), rec.get("rev"))
+                applied += 1
+            self._offset += used
+            self.stats["records"] += len(parsed)
+            self._own = {k: v for k, v in self._own.items() if v[0] != self._ino or v[1] > self._offset}
+            if not self._rotated():
+                break
+            # Another process folded everything up to the rotation into the store; keys we
+            # have already written into the new file stay dirty.
+            self._open_read()
+            mine = {k for k, (ino, _) in self._own.items() if ino == self._ino}
+            for name, table in self.tables.items():
+                keep = {k for t, k in mine if t == name}
+                table.mark_saved(table.digest.snapshot(table.digest.dirty - keep))
+            self.stats["records"] = 0
+        if applied:
+            self.stats["external"] += applied
+            self.announce()
+        return applied
+
+    def announce(self):
+        """Bump version and wake the waiters, e.g. after a bulk import into the tables here."""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def poll(self) -> int:
+        """Cheap check (one stat); catch up if the file grew or was rotated."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        if st.st_ino == self._ino and st.st_size <= self._offset:
+            return 0
+        with self.tables_locked(), self.held(exclusive=False):
+            return self._catch_up()
+
+    def wait(self, seen_version, timeout=None) -> int:
+        """Block until version != seen_version (or timeout); returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+    # ---------- compaction ----------
+    def compact(self, fold, after=None):
+        """Catch up, run fold() (writes pending rows to the store) and start a fresh journal.
+        after(), if given, runs once the tables and the journal are released again."""
+        t0 = time.perf_counter()
+        with self.tables_locked(), self.held():
+            self._catch_up()
+            if self._unsynced:
+                os.fsync(self._fd)
+                self._unsynced = False
+            rows = fold()
+            self._write_fresh(self.path)
+            self._open_append()
+            self._open_read()
+            self._own.clear()
+            self.stats["records"] = 0
+        self.stats["compactions"] += 1
+        self.stats["last_compact_rows"] = rows
+        self.stats["last_compact_ms"] = (time.perf_counter() - t0) * 1000
+        self.stats["last_compact_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        if after is not None:
+            after()
+        return rows
+
+    def request_compaction(self):
+        self._compact_now.set()
+
+    # ---------- background threads ----------
+    def start(self, fold, needs_compaction=None, after=None):
+        """Start the batched-fsync flusher, the tailer and the periodic compactor (once)."""
+        with self.lock:
+            if self._threads:
+                return
+            self._threads = [None]
+
+        def flusher():
+            while True:
+                self._wake.wait()
+                self._wake.clear()
+                time.sleep(self.fsync_interval)
+                self.sync()
+
+        def tailer():
+            while True:
+                time.sleep(self.tail_interval)
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"[journal] tail failed: {e}")
+
+        def compactor():
+            while True:
+                self._compact_now.wait(self.compact_interval)
+                self._compact_now.clear()
+                if self.pending() or (needs_compaction and needs_compaction()):
+                    try:
+                        self.compact(fold, after)
+                    except Exception as e:
+                        print(f"[journal] compaction failed: {e}")
+
+        self._threads = [threading.Thread(target=fn, name=f"pm-journal-{fn.__name__}", daemon=True)
+                         for fn in (flusher, tailer, compactor)]
+        for t in self._threads:
+            t.start()
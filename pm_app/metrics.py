@@ -0,0 +1,284 @@
+"""
+Prometheus-style metrics for the Dash apps (PM and cockpit).
+
+instrument(app, name) must be called right after the Dash app is created:
+it wraps every callback registered afterwards to count the rows of the
+records lists (DataTable data) it returns, times each Dash request, records
+request and response body sizes per callback, and adds a /metrics endpoint in
+the text exposition format.
+
+A request's timing leaves out waits that are not its own work (the PM data
+warm-up, see untimed()); those are recorded as dash_request_wait_seconds.
+
+All series are plain in-process counters behind one lock (a dict lookup and a
+bisect per observation), cheap enough to leave on. Under gunicorn each worker
+has its own registry; with PM_METRICS_DIR set, every worker writes its
+counters to <dir>/metrics-<pid>.json every few seconds and /metrics sums the
+files of all workers, so a scrape sees the whole server whichever worker
+answers it.
+"""
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+ROWS_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+FLUSH_SECONDS = 5.0
+
+# Dash endpoints timed per route (callbacks are timed per callback instead)
+DASH_ROUTES = ("/", "/_dash-layout", "/_dash-dependencies")
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra="") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.meta = {}      # name -> (type, doc, labelnames, buckets or None)
+        self.series = {}    # name -> {label values tuple: value or [bucket counts, sum, count]}
+        self.gauges = {}    # name -> (doc, labelnames, fn() -> {label values tuple: value})
+        self.version = 0
+        self._flushed = None
+
+    def histogram(self, name, doc, labelnames, buckets):
+        self.meta[name] = ("histogram", doc, tuple(labelnames), tuple(buckets))
+        self.series.setdefault(name, {})
+
+    def counter(self, name, doc, labelnames):
+        self.meta[name] = ("counter", doc, tuple(labelnames), None)
+        self.series.setdefault(name, {})
+
+    def gauge(self, name, doc, labelnames, fn):
+        """A gauge read when scraped; fn returns {label values tuple: value}."""
+        self.gauges[name] = (doc, tuple(labelnames), fn)
+
+    def observe(self, name, value, *labels):
+        buckets = self.meta[name][3]
+        with self.lock:
+            s = self.series[name].get(labels)
+            if s is None:
+                s = self.series[name][labels] = [[0] * (len(buckets) + 1), 0.0, 0]
+            s[0][bisect_left(buckets, value)] += 1
+            s[1] += value
+            s[2] += 1
+            self.version += 1
+
+    def inc(self, name, *labels, amount=1):
+        with self.lock:
+            self.series[name][labels] = self.series[name].get(labels, 0) + amount
+            self.version += 1
+
+    # ---------- multi-process ----------
+    def state(self):
+        with self.lock:
+            return {name: [[list(k), v] for k, v in s.items()] for name, s in self.series.items()}
+
+    def flush(self, directory):
+        if self._flushed == self.version:
+            return
+        self._flushed = self.version
+        path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        tmp = os.path.join(directory, f".metrics-{os.getpid()}.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state(), f)
+        os.replace(tmp, path)
+
+    def merged(self, directory=None):
+        """This process's series plus, with directory, the other workers' last flushes."""
+        out = {name: {tuple(k): v for k, v in s} for name, s in self.state().items()}
+        if not directory:
+            return out
+        own = f"metrics-{os.getpid()}.json"
+        for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+            if os.path.basename(path) == own:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    other = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, entries in other.items():
+                if name not in self.meta:
+                    continue
+                mine = out.setdefault(name, {})
+                for k, v in entries:
+                    k = tuple(k)
+                    cur = mine.get(k)
+                    if cur is None:
+                        mine[k] = v
+                    elif isinstance(v, list):
+                        mine[k] = [[a + b for a, b in zip(cur[0], v[0])], cur[1] + v[1], cur[2] + v[2]]
+                    else:
+                        mine[k] = cur + v
+        return out
+
+    # ---------- exposition ----------
+    def render(self, directory=None) -> str:
+        lines = []
+        series = self.merged(directory)
+        for name, (kind, doc, labelnames, buckets) in self.meta.items():
+            lines += [f"# HELP {name} {doc}", f"# TYPE {name} {kind}"]
+            for labels, v in sorted(series.get(name, {}).items()):
+                if kind == "counter":
+                    lines.append(f"{name}{_labels(labelnames, labels)} {v}")
+                    continue
+                counts, total, n = v
+                acc = 0
+                for le, c in zip(buckets + ("+Inf",), counts):
+                    acc += c
+                    le = 'le="%s"' % le
+                    lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {acc}")
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {total}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {n}")
+        for name, (doc, labelnames, fn) in self.gauges.items():
+            lines += [f"# HELP {name} {doc}", f"# TYPE {name} gauge"]
+            try:
+                values = fn()
+            except Exception:
+                values = {}
+            for labels, v in sorted(values.items()):
+                lines.append(f"{name}{_labels(labelnames, labels)} {v}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+REGISTRY.histogram("dash_callback_duration_seconds", "Dash callback request time, including serialization.",
+                   ("app", "callback"), LATENCY_BUCKETS)
+REGISTRY.histogram("dash_callback_request_bytes", "Dash callback request body size.",
+                   ("app", "callback"), BYTES_BUCKETS)
+REGISTRY.histogram("dash_callback_response_bytes", "Dash callback response body size.",
+                   ("app", "callback"), BYTES_BUCKETS)
+REGISTRY.histogram("dash_callback_rows", "Rows in the records lists (DataTable data) a callback returned.",
+                   ("app", "callback"), ROWS_BUCKETS)
+REGISTRY.counter("dash_callback_errors_total", "Dash callback requests that failed (HTTP status >= 500).",
+                 ("app", "callback"))
+REGISTRY.histogram("dash_http_request_duration_seconds", "Time to serve the Dash page, layout and dependencies.",
+                   ("app", "route"), LATENCY_BUCKETS)
+REGISTRY.histogram("dash_http_response_bytes", "Size of the Dash page, layout and dependencies.",
+                   ("app", "route"), BYTES_BUCKETS)
+REGISTRY.histogram("dash_request_wait_seconds", "Time requests waited on something other than their own work "
+                   "(e.g. the data warm-up), left out of the request timings.", ("app", "reason"), LATENCY_BUCKETS)
+
+
+def count_rows(value) -> int:
+    """Rows in the records lists (lists of dicts) among one callback's outputs."""
+    outputs = value if isinstance(value, (list, tuple)) and not (value and isinstance(value[0], dict)) else [value]
+    n = 0
+    for v in outputs:
+        if isinstance(v, list) and v and isinstance(v[0], dict):
+            n += len(v)
+    return n
+
+
+_FLUSHER = {"started": False}
+
+
+@contextmanager
+def untimed(reason):
+    """Leave the enclosed wait out of the current request's timing (recorded under reason instead)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context() and g.get("metrics_t0") is not None:
+            waited = time.perf_counter() - t0
+            g.metrics_t0 += waited
+            REGISTRY.observe("dash_request_wait_seconds", waited, g.metrics_app, reason)
+
+
+def start_flusher(directory):
+    """Write this worker's series to directory every FLUSH_SECONDS (once per process)."""
+    with REGISTRY.lock:
+        if _FLUSHER["started"]:
+            return
+        _FLUSHER["started"] = True
+    os.makedirs(directory, exist_ok=True)
+
+    def flusher():
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            try:
+                REGISTRY.flush(directory)
+            except OSError as e:
+                print(f"[metrics] flush failed: {e}")
+
+    threading.Thread(target=flusher, name="metrics-flush", daemon=True).start()
+
+
+def instrument(app, name):
+    """Time and size every request to app and serve /metrics (see module docstring)."""
+    directory = os.environ.get("PM_METRICS_DIR")
+    if directory:
+        start_flusher(directory)
+
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorate = register(*args, **kwargs)
+
+        def wrap(func):
+            @functools.wraps(func)
+            def counted(*a, **kw):
+                out = func(*a, **kw)
+                REGISTRY.observe("dash_callback_rows", count_rows(out), name, func.__name__)
+                return out
+            return decorate(counted)
+        return wrap
+
+    app.callback = callback
+    server = app.server
+    names = {}  # callback output id -> function name
+
+    def callback_name(output):
+        cb_name = names.get(output)
+        if cb_name is None:
+            cb = app.callback_map.get(output)
+            cb_name = names[output] = getattr(cb and cb.get("callback"), "__name__", "unknown")
+        return cb_name
+
+    @server.before_request
+    def _metrics_start():
+        g.metrics_t0 = time.perf_counter()
+        g.metrics_app = name
+
+    @server.after_request
+    def _metrics_record(response):
+        t0 = g.pop("metrics_t0", None)
+        if t0 is None or response.direct_passthrough or response.is_streamed:
+            return response
+        elapsed = time.perf_counter() - t0
+        if request.path.endswith("/_dash-update-component"):
+            body = request.get_json(silent=True) or {}
+            cb = callback_name(body.get("output"))
+            REGISTRY.observe("dash_callback_duration_seconds", elapsed, name, cb)
+            REGISTRY.observe("dash_callback_request_bytes", request.content_length or 0, name, cb)
+            REGISTRY.observe("dash_callback_response_bytes", response.content_length or 0, name, cb)
+            if response.status_code >= 500:
+                REGISTRY.inc("dash_callback_errors_total", name, cb)
+        elif request.path in DASH_ROUTES:
+            REGISTRY.observe("dash_http_request_duration_seconds", elapsed, name, request.path)
+            REGISTRY.observe("dash_http_response_bytes", response.content_length or 0, name, request.path)
+        return response
+
+    @server.route("/metrics")
+    def _metrics():
+        return Response(REGISTRY.render(directory), mimetype="text/plain; version=0.0.4")
+
+    return REGISTRY
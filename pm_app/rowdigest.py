@@ -0,0 +1,93 @@
+"""
+Per-row content digests for dirty detection.
+
+Every row hashes to a 64-bit value. The table digest is the sum (mod 2**64) of
+those values mixed with each row's key, so it moves in O(1) when one row changes
+and is the same in every worker holding the same rows (ranks are per process,
+so they are left out of it). Rows whose (rank, hash) differs from what was
+recorded at the last save are the dirty rows. The same sum over the saved entries
+is kept as they are recorded, so the two digests are equal exactly when nothing
+is dirty (the browser compares them, see assets/pm_clientside.js).
+"""
+import hashlib
+
+from pm_app.store import row_payload
+
+MASK = (1 << 64) - 1
+
+
+def _h64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def row_hash(row: dict) -> int:
+    return _h64(row_payload(row))
+
+
+def _mix(key, entry) -> int:
+    return _h64(f"{key}\x1f{entry[1]:016x}")
+
+
+class RowDigest:
+    def __init__(self):
+        self.current = {}   # key -> (rank, hash)
+        self.saved = {}     # key -> (rank, hash) at last save
+        self.dirty = set()
+        self.total = 0
+        self.saved_total = 0
+
+    def reset(self, entries):
+        """entries: iterable of (key, rank, row). Everything starts out saved."""
+        self.current = {k: (rank, row_hash(row)) for k, rank, row in entries}
+        self.saved = dict(self.current)
+        self.dirty = set()
+        total = 0
+        for k, e in self.current.items():
+            total += _mix(k, e)
+        self.total = self.saved_total = total & MASK
+
+    def _recheck(self, key):
+        if self.current.get(key) == self.saved.get(key):
+            self.dirty.discard(key)
+        else:
+            self.dirty.add(key)
+
+    def set(self, key, rank, row: dict):
+        new = (rank, row_hash(row))
+        old = self.current.get(key)
+        if old == new:
+            return
+        if old is not None:
+            self.total = (self.total - _mix(key, old)) & MASK
+        self.current[key] = new
+        self.total = (self.total + _mix(key, new)) & MASK
+        self._recheck(key)
+
+    def remove(self, key):
+        old = self.current.pop(key, None)
+        if old is not None:
+            self.total = (self.total - _mix(key, old)) & MASK
+        self._recheck(key)
+
+    def snapshot(self, keys):
+        """Digest entries for keys, to hand back to mark_saved once they are written."""
+        return {k: self.current.get(k) for k in keys}
+
+    def mark_saved(self, entries=None):
+        """Record entries ({key: (rank, hash) or None}) as saved; default: all dirty rows."""
+        if entries is None:
+            entries = self.snapshot(self.dirty)
+        for k, e in entries.items():
+            old = self.saved.pop(k, None)
+            if old is not None:
+                self.saved_total = (self.saved_total - _mix(k, old)) & MASK
+            if e is not None:
+                self.saved[k] = e
+                self.saved_total = (self.saved_total + _mix(k, e)) & MASK
+            self._recheck(k)
+
+    def hexdigest(self) -> str:
+        return f"{self.total:016x}"
+
+    def saved_hexdigest(self) -> str:
+        return f"{self.saved_total:016x}"
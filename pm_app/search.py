@@ -0,0 +1,251 @@
+"""
+Full-text search index for a RowTable (tickets, decisions).
+
+An inverted index maps each term of the indexed columns to {row key: weight},
+so a query only touches the posting lists of its own terms. Every query term
+must match a row, either exactly, as a prefix of an indexed term (via a sorted
+vocabulary and bisect) or, for longer terms, within one edit (via a map of
+single-character deletions, SymSpell-style). Matches are ranked by match kind,
+column weight and term rarity, ties in table order.
+
+RowTable keeps the index current on every mutation, the same way as its
+BucketIndexes. It is persisted as JSON after the journal is compacted (a copy is
+taken under the table lock, the file is written outside it). Startup loads that
+copy and re-indexes only the rows whose indexed text differs.
+"""
+import json
+import math
+import os
+import re
+import tempfile
+from bisect import bisect_left, insort
+from contextlib import nullcontext
+
+FORMAT = 2
+TOKEN_RE = re.compile(r"[^\W_]+")
+PREFIX_MIN = 2          # shorter query terms only match whole terms
+PREFIX_LIMIT = 500      # vocabulary terms a prefix may expand to
+FUZZY_MIN = 4           # shorter (or non-alphabetic, e.g. ID number) query terms are not fuzzy-matched
+MATCH_WEIGHTS = {"exact": 1.0, "prefix": 0.6, "fuzzy": 0.4}
+CACHE_SIZE = 64
+
+
+def tokenize(text) -> list:
+    return TOKEN_RE.findall(str(text).lower()) if text not in (None, "") else []
+
+
+def _deletes(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class SearchIndex:
+    def __init__(self, cols, weights=None):
+        self.cols = list(cols)
+        self.weights = dict(weights or {})   # column -> weight (default 1.0)
+        self.postings = {}  # term -> {key: weight}
+        self.docs = {}      # key -> indexed cell values
+        self.rank = {}      # key -> table rank, for tie-breaks
+        self.version = 0
+        self.saved_version = None
+        self._vocab = None  # sorted terms, built on the first prefix query
+        self._fuzzy = None  # deletion variant -> {alphabetic terms}, built on the first fuzzy query
+        self._cache = {}
+
+    # ---------- maintenance (called by RowTable under its lock) ----------
+    def _signature(self, row):
+        return tuple(str(row.get(c, "")) for c in self.cols)
+
+    def _terms(self, sig):
+        """{term: weight of the heaviest column it appears in} for one row."""
+        terms = {}
+        for col, text in zip(self.cols, sig):
+            w = self.weights.get(col, 1.0)
+            for t in tokenize(text):
+                if terms.get(t, 0) < w:
+                    terms[t] = w
+        return terms
+
+    def _add_term(self, term, key, w):
+        plist = self.postings.get(term)
+        if plist is None:
+            plist = self.postings[term] = {}
+            if self._vocab is not None:
+                insort(self._vocab, term)
+            if self._fuzzy is not None and term.isalpha():
+                for d in _deletes(term) | {term}:
+                    self._fuzzy.setdefault(d, set()).add(term)
+        plist[key] = w
+
+    def _drop_term(self, term, key):
+        plist = self.postings.get(term)
+        if plist is None:
+            return
+        plist.pop(key, None)
+        if plist:
+            return
+        del self.postings[term]
+        if self._vocab is not None:
+            i = bisect_left(self._vocab, term)
+            if i < len(self._vocab) and self._vocab[i] == term:
+                del self._vocab[i]
+        if self._fuzzy is not None and term.isalpha():
+            for d in _deletes(term) | {term}:
+                terms = self._fuzzy.get(d)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del self._fuzzy[d]
+
+    def _changed(self):
+        self.version += 1
+        self._cache.clear()
+
+    def add(self, key, rank, row):
+        sig = self._signature(row)
+        for t, w in self._terms(sig).items():
+            self._add_term(t, key, w)
+        self.docs[key] = sig
+        self.rank[key] = rank
+        self._changed()
+
+    def remove(self, key):
+        sig = self.docs.pop(key, None)
+        self.rank.pop(key, None)
+        if sig is None:
+            return
+        for t in self._terms(sig):
+            self._drop_term(t, key)
+        self._changed()
+
+    def refresh(self, key, rank, row):
+        """Re-index key if its indexed cells changed (no-op otherwise)."""
+        if self.docs.get(key) == self._signature(row):
+            if self.rank.get(key) != rank:
+                self.rank[key] = rank
+                self._cache.clear()
+            return
+        self.remove(key)
+        self.add(key, rank, row)
+
+    def reset(self, entries):
+        """entries: iterable of (key, rank, row). Only rows whose indexed cells differ
+        from what is indexed are re-indexed; keys not in entries are dropped."""
+        seen = set()
+        for key, rank, row in entries:
+            seen.add(key)
+            self.refresh(key, rank, row)
+        for key in [k for k in self.docs if k not in seen]:
+            self.remove(key)
+
+    # ---------- queries ----------
+    def _prefix_terms(self, q):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        i = bisect_left(self._vocab, q)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(q) and len(out) < PREFIX_LIMIT:
+            if self._vocab[i] != q:
+                out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _fuzzy_terms(self, q):
+        if self._fuzzy is None:
+            self._fuzzy = {}
+            for term in filter(str.isalpha, self.postings):
+                for d in _deletes(term) | {term}:
+                    self._fuzzy.setdefault(d, set()).add(term)
+        out = set()
+        for d in _deletes(q) | {q}:
+            out |= self._fuzzy.get(d, set())
+        out.discard(q)
+        return out
+
+    def _term_scores(self, q):
+        """{key: best score} for one query term over its exact, prefix and fuzzy matches."""
+        n = max(1, len(self.docs))
+        candidates = [(q, "exact")]
+        if len(q) >= PREFIX_MIN:
+            candidates += [(t, "prefix") for t in self._prefix_terms(q)]
+        if len(q) >= FUZZY_MIN and q.isalpha():
+            candidates += [(t, "fuzzy") for t in self._fuzzy_terms(q) if not t.startswith(q)]
+        scores = {}
+        for term, kind in candidates:
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = math.log(1 + n / len(plist))
+            m = MATCH_WEIGHTS[kind] * idf
+            for key, w in plist.items():
+                s = m * w
+                if s > scores.get(key, 0):
+                    scores[key] = s
+        return scores
+
+    def search(self, query, limit=None):
+        """Row keys matching every term of query, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        ranked = self._cache.get(query)
+        if ranked is None:
+            total = None
+            # rarest term first, so the intersection shrinks quickly
+            for scores in sorted((self._term_scores(q) for q in terms), key=len):
+                if total is None:
+                    total = dict(scores)
+                else:
+                    total = {k: s + scores[k] for k, s in total.items() if k in scores}
+                if not total:
+                    break
+            ranked = sorted(total, key=lambda k: (-total[k], self.rank.get(k, 0)))
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[query] = ranked
+        return ranked[:limit] if limit else ranked
+
+    # ---------- persistence ----------
+    def save(self, path, lock=None) -> bool:
+        """Write the index (atomically) if it changed since the last save or load.
+
+        lock: the table lock. It is held only to copy the postings; the JSON is
+        built and written after it is released.
+        """
+        with lock or nullcontext():
+            if self.saved_version == self.version:
+                return False
+            version = self.version
+            postings = {t: dict(p) for t, p in self.postings.items()}
+            docs = dict(self.docs)
+        state = {"format": FORMAT, "cols": self.cols, "weights": self.weights,
+                 "postings": postings, "docs": docs}
+        folder, name = os.path.split(path)
+        fd, tmp = tempfile.mkstemp(dir=folder or ".", prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.saved_version = version
+        return True
+
+    @classmethod
+    def load(cls, path, cols, weights=None):
+        """The persisted index at path, or an empty one if missing, unreadable or built
+        over other columns. Reconcile it with the table via reset()."""
+        idx = cls(cols, weights)
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):   # includes an older pickled copy (not UTF-8 / JSON)
+            return idx
+        if (not isinstance(state, dict) or state.get("format") != FORMAT
+                or state.get("cols") != idx.cols or state.get("weights") != idx.weights):
+            return idx
+        # ranks are filled in by the reset() that reconciles the index with the table
+        idx.postings = state["postings"]
+        idx.docs = {k: tuple(sig) for k, sig in state["docs"].items()}
+        idx.saved_version = idx.version
+        return idx
@@ -0,0 +1,159 @@
+"""
+Columnar snapshot of a PM table (Arrow IPC file), the fast path for bulk reads.
+
+A snapshot holds a table as the SQLite store had it at one store generation
+(see TableStore.generation): the row keys and saved positions, then one column
+per table column. Low-cardinality text columns (status, priority, owner,
+epic, ...) are dictionary-encoded and date columns whose cells are all
+YYYYMMDD or blank are stored as date32, so the file is small and typed. A
+column holding anything but text (e.g. an estimate stored as 6.0 next to blank
+cells) keeps each cell's JSON encoding, so it reads back with the same values
+and types as a row-by-row read of the store. Record batches are zstd-compressed.
+
+Readers memory-map the file and decode only the columns they ask for. The
+store reads a snapshot back as the table at its generation and applies the
+rows written since on top (TableStore.load_df).
+
+pyarrow is optional: without it available() is False, and the store is read
+row by row as before.
+"""
+import json
+import os
+
+import pandas as pd
+
+from pm_app.dates import date_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+except ImportError:  # the store falls back to row-by-row reads
+    pa = None
+
+FORMAT = "aion-pm-snapshot/2"
+KEY_FIELD = "_key"
+POS_FIELD = "_pos"
+BATCH_ROWS = 65536
+DICT_MAX_RATIO = 0.5    # dictionary-encode text columns with at most this share of distinct values
+COMPRESSION = "zstd"
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _text_array(values):
+    arr = pa.array(values, type=pa.string())
+    if len(arr) and pc.count_distinct(arr).as_py() <= max(1, len(arr) * DICT_MAX_RATIO):
+        return arr.dictionary_encode()
+    return arr
+
+
+def _date_array(values):
+    """values as date32 (blank -> null), or None if any cell is not a YYYYMMDD date."""
+    arr = pa.array([v if v != "" else None for v in values], type=pa.string())
+    present = arr.drop_null()
+    if len(present) and not pc.all(pc.match_substring_regex(present, r"^\d{8}$")).as_py():
+        return None
+    try:
+        return pc.strptime(arr, format="%Y%m%d", unit="s").cast(pa.date32())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+
+
+def write_snapshot(path, df: pd.DataFrame, positions, generation, key_col) -> None:
+    """Write df (indexed by row key, cells as the store holds them) atomically to path.
+
+    positions: the saved position of each row, in df order.
+    """
+    df = df.fillna("")
+    columns = [str(c) for c in df.columns]
+    dates = set(date_columns(tuple(columns)))
+    fields, arrays, typed, encoded = [], [], [], []
+    for name, values in [(KEY_FIELD, [str(k) for k in df.index])] + [(c, df[c].tolist()) for c in columns]:
+        arr = None
+        if not all(type(v) is str for v in values):
+            values = [json.dumps(v, ensure_ascii=False, default=str) for v in values]
+            encoded.append(name)
+        elif name in dates:
+            arr = _date_array(values)
+            if arr is not None:
+                typed.append(name)
+        if arr is None:
+            arr = pa.array(values, type=pa.string()) if name == KEY_FIELD else _text_array(values)
+        fields.append(pa.field(name, arr.type))
+        arrays.append(arr)
+    fields.insert(1, pa.field(POS_FIELD, pa.int64()))
+    arrays.insert(1, pa.array(list(positions), type=pa.int64()))
+    meta = {"format": FORMAT, "generation": str(int(generation)), "key_col": str(key_col),
+            "columns": json.dumps(columns), "typed_dates": json.dumps(typed), "json_columns": json.dumps(encoded)}
+    table = pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=meta))
+
+    tmp = os.path.join(os.path.dirname(path) or ".", f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    options = ipc.IpcWriteOptions(compression=COMPRESSION)
+    with pa.OSFile(tmp, "wb") as sink:
+        with ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=BATCH_ROWS)
+    os.replace(tmp, path)
+
+
+def snapshot_info(path):
+    """{"generation", "key_col", "columns", "typed_dates", "rows"} of the snapshot at path, or None."""
+    table = read_table(path, columns=[])
+    if table is None:
+        return None
+    meta = {k.decode(): v.decode() for k, v in table.schema.metadata.items()}
+    return {"generation": int(meta["generation"]), "key_col": meta["key_col"],
+            "columns": json.loads(meta["columns"]), "typed_dates": json.loads(meta["typed_dates"]),
+            "rows": table.num_rows}
+
+
+def read_table(path, columns=None):
+    """The snapshot as an Arrow table (typed), with only KEY/POS and columns decoded.
+
+    Returns None if pyarrow is missing or the file is missing or unreadable.
+    """
+    if pa is None:
+        return None
+    try:
+        with pa.memory_map(path) as src:
+            schema = ipc.open_file(src).schema
+            if (schema.metadata or {}).get(b"format") != FORMAT.encode():
+                return None
+            wanted = None
+            if columns is not None:
+                keep = {KEY_FIELD, POS_FIELD} | set(columns)
+                wanted = [i for i, name in enumerate(schema.names) if name in keep]
+            options = ipc.IpcReadOptions(included_fields=wanted) if wanted is not None else None
+            return ipc.open_file(src, options=options).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def read_snapshot(path, columns=None):
+    """(df, positions, generation) from the snapshot at path, or None (see read_table).
+
+    df is indexed by row key, with object columns holding every cell the way the
+    store returns it: text, dates back as YYYYMMDD, blanks as "", and other
+    values (numbers, ...) with their own types.
+    """
+    table = read_table(path, columns)
+    if table is None:
+        return None
+    meta = json.loads(table.schema.metadata[b"columns"])
+    encoded = set(json.loads(table.schema.metadata[b"json_columns"]))
+    names = [c for c in meta if c in table.column_names]
+    arrays = []
+    for name in names:
+        col = table.column(name)
+        if pa.types.is_date(col.type):
+            col = pc.strftime(col, format="%Y%m%d")
+        elif pa.types.is_dictionary(col.type):
+            col = col.cast(pa.string())
+        arrays.append(col.fill_null(""))
+    df = pa.table(arrays, names=names).to_pandas().astype(object) if names else pd.DataFrame(index=range(table.num_rows))
+    for name in encoded.intersection(names):
+        df[name] = pd.array([json.loads(v) for v in df[name]], dtype=object)
+    df.index = pd.Index(table.column(KEY_FIELD).to_pylist(), dtype=object)
+    return df, table.column(POS_FIELD).to_pylist(), int(table.schema.metadata[b"generation"])
@@ -0,0 +1,51 @@
+"""
+Startup timing for the PM app.
+
+Phases (import, data load steps, layout build) are recorded once, in ms, the
+first time they run; milestones (e.g. the first /_dash-layout served) are
+measured from when the timer was created at the top of pm_app.app.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = {}    # name -> ms, in the order first seen
+        self.marks = {}     # name -> ms since t0
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    def record(self, name, ms):
+        with self._lock:
+            self.phases.setdefault(name, ms)
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t) * 1000)
+
+    def mark(self, name) -> bool:
+        """Record a milestone the first time it is reached; True if this was the first time."""
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = self.elapsed_ms()
+            return True
+
+    def as_dict(self):
+        with self._lock:
+            return {"phases_ms": dict(self.phases), "marks_ms": dict(self.marks)}
+
+    def report(self) -> str:
+        d = self.as_dict()
+        parts = [f"{k} {v:.0f} ms" for k, v in d["phases_ms"].items()]
+        parts += [f"{k} at {v:.0f} ms" for k, v in d["marks_ms"].items()]
+        return " · ".join(parts)
@@ -0,0 +1,530 @@
+"""
+SQLite row store for the PM tables (tickets, decisions).
+
+Rows live in one indexed table keyed by (table name, row key), where the row key
+is the value of the table's id column. Saves upsert only the rows they are given
+(the dirty rows) and delete removed keys, in one transaction.
+
+The same file holds named counters (IdSequence), e.g. the next ticket number,
+so every worker process allocates from one sequence.
+
+Every write bumps the table's generation and stamps the rows it wrote (and the
+keys it deleted) with it. With a snapshot path, load_df reads the columnar
+snapshot (pm_app/snapshot.py) and applies only the rows stamped after it, and
+rewrites the snapshot once that delta has grown.
+
+Writes are also kept as history, so the table can be rebuilt as it stood at
+any earlier time: pm_history is an append-only log of the rows each write
+changed (whole rows, NULL for a delete), pm_history_gens stamps each write
+with its time, and pm_history_snapshots holds a full copy of the table every
+so often (on every replace_df, and once the log has grown by HISTORY_SNAPSHOT_*
+rows since the last copy). rows_at() reads one copy and replays at most that
+many logged rows on top.
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import pandas as pd
+
+from pm_app import snapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pm_tables (
+    name    TEXT PRIMARY KEY,
+    key_col TEXT NOT NULL,
+    columns TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pm_rows (
+    tbl  TEXT NOT NULL,
+    key  TEXT NOT NULL,
+    pos  INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    gen  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tbl, key)
+);
+CREATE INDEX IF NOT EXISTS pm_rows_pos ON pm_rows (tbl, pos);
+CREATE TABLE IF NOT EXISTS pm_sequences (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pm_generations (
+    tbl  TEXT PRIMARY KEY,
+    gen  INTEGER NOT NULL,
+    base INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pm_deleted (
+    tbl TEXT NOT NULL,
+    key TEXT NOT NULL,
+    gen INTEGER NOT NULL,
+    PRIMARY KEY (tbl, key)
+);
+CREATE TABLE IF NOT EXISTS pm_history (
+    tbl  TEXT NOT NULL,
+    gen  INTEGER NOT NULL,
+    key  TEXT NOT NULL,
+    pos  INTEGER,
+    data TEXT,
+    PRIMARY KEY (tbl, gen, key)
+);
+CREATE TABLE IF NOT EXISTS pm_history_gens (
+    tbl  TEXT NOT NULL,
+    gen  INTEGER NOT NULL,
+    ts   REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (tbl, gen)
+);
+CREATE TABLE IF NOT EXISTS pm_history_snapshots (
+    tbl  TEXT NOT NULL,
+    gen  INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (tbl, gen)
+);
+"""
+
+# Rewrite the snapshot on load once this many rows changed since it was written
+SNAPSHOT_MIN_DELTA = 1000
+SNAPSHOT_MAX_DELTA_RATIO = 0.05
+
+# Keep a full history copy once this many rows were logged since the last one
+HISTORY_SNAPSHOT_MIN_ROWS = 1000
+HISTORY_SNAPSHOT_RATIO = 0.1
+HISTORY_SNAPSHOT_BATCH = 2000    # rows spliced per compression step of a full copy
+
+SQL_VARS = 500      # keys bound per "key IN (...)" query (SQLite caps host parameters)
+
+
+def row_keys(values):
+    """Stable row keys from id-column values; blanks and duplicates get positional keys."""
+    keys, seen = [], set()
+    for pos, v in enumerate(values):
+        k = str(v).strip()
+        if not k:
+            k = f"#{pos}"
+        if k in seen:
+            k = f"{k}#{pos}"
+        seen.add(k)
+        keys.append(k)
+    return keys
+
+
+def row_payload(row: dict) -> str:
+    return json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _migrate(c):
+    """Bring a store created before row generations up to date."""
+    if "gen" not in {r[1] for r in c.execute("PRAGMA table_info(pm_rows)")}:
+        c.execute("ALTER TABLE pm_rows ADD COLUMN gen INTEGER NOT NULL DEFAULT 0")
+    c.execute("CREATE INDEX IF NOT EXISTS pm_rows_gen ON pm_rows (tbl, gen)")
+
+
+class TableStore:
+    """One PM table (e.g. "tickets") inside the shared SQLite file."""
+
+    def __init__(self, db_path, name, snapshot_path=None):
+        self.db_path = str(db_path)
+        self.name = name
+        self.snapshot_path = str(snapshot_path) if snapshot_path else None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pos = {}          # key -> position, as of the last load_df (for its snapshot write)
+        self._history = None        # (gen, {key: row}, {key: pos}) last rebuilt by rows_at
+        self._history_base = None   # the same for the full copy it started from
+        self.stats = {"load": "", "delta_rows": 0, "snapshot_writes": 0}
+
+    # ---------- connection ----------
+    def conn(self):
+        if self._conn is None:
+            c = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            c.executescript(SCHEMA)
+            with c:
+                _migrate(c)
+            self._conn = c
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- metadata ----------
+    def exists(self) -> bool:
+        with self._lock:
+            row = self.conn().execute("SELECT 1 FROM pm_tables WHERE name = ?", (self.name,)).fetchone()
+        return row is not None
+
+    def meta(self):
+        """Return (key_col, columns) for the table, or (None, []) if never imported."""
+        with self._lock:
+            row = self.conn().execute(
+                "SELECT key_col, columns FROM pm_tables WHERE name = ?", (self.name,)
+            ).fetchone()
+        if row is None:
+            return None, []
+        return row[0], json.loads(row[1])
+
+    def keys(self) -> set:
+        """The saved row keys."""
+        with self._lock:
+            return {k for (k,) in self.conn().execute("SELECT key FROM pm_rows WHERE tbl = ?", (self.name,))}
+
+    def generation(self):
+        """(generation, base): bumped by every write; base is the generation of the last replace_df."""
+        with self._lock:
+            return self._generation(self.conn())
+
+    def _generation(self, c):
+        row = c.execute("SELECT gen, base FROM pm_generations WHERE tbl = ?", (self.name,)).fetchone()
+        return (row[0], row[1]) if row is not None else (0, 0)
+
+    def _bump(self, c, replace=False) -> int:
+        """Next generation, inside the caller's write transaction."""
+        c.execute("INSERT INTO pm_generations (tbl, gen, base) VALUES (?, 1, 0) "
+                  "ON CONFLICT(tbl) DO UPDATE SET gen = gen + 1", (self.name,))
+        if replace:
+            c.execute("UPDATE pm_generations SET base = gen WHERE tbl = ?", (self.name,))
+        return self._generation(c)[0]
+
+    # ---------- read ----------
+    def load_df(self, columns=None):
+        """Load the table in saved row order, indexed by row key.
+
+        Columns are object columns holding the cells as stored (text, numbers,
+        ...), the same whether they come from the snapshot or row by row.
+        columns: only these columns (all by default). Returns None if the table
+        was never imported.
+        """
+        key_col, all_columns = self.meta()
+        if key_col is None:
+            return None
+        columns = all_columns if columns is None else [c for c in all_columns if c in set(columns)]
+        with self._lock:
+            c = self.conn()
+            gen, base = self._generation(c)
+            df = self._load_from_snapshot(c, columns, gen, base) if self.snapshot_path else None
+            if df is None:
+                cur = c.execute("SELECT key, pos, data FROM pm_rows WHERE tbl = ? ORDER BY pos", (self.name,))
+                pos, keys, records = {}, [], []
+                for key, p, data in cur:
+                    pos[key] = p
+                    keys.append(key)
+                    records.append(json.loads(data))
+                self._pos = pos
+                df = pd.DataFrame(records, columns=columns, index=pd.Index(keys, dtype=object), dtype=object).fillna("")
+                self.stats.update(load="rows", delta_rows=len(df))
+            if self.snapshot_path and snapshot.available() and columns == all_columns and self._snapshot_stale(len(df)):
+                try:
+                    snapshot.write_snapshot(self.snapshot_path, df, [self._pos[k] for k in df.index], gen, key_col)
+                    self.stats["snapshot_writes"] += 1
+                except OSError as e:
+                    print(f"[store] snapshot write failed: {e}")
+        return df
+
+    def _snapshot_stale(self, rows) -> bool:
+        if self.stats["load"] != "snapshot":
+            return True
+        return self.stats["delta_rows"] > max(SNAPSHOT_MIN_DELTA, rows * SNAPSHOT_MAX_DELTA_RATIO)
+
+    def _load_from_snapshot(self, c, columns, gen, base):
+        """The table from its snapshot plus the rows written since, or None if there is
+        no usable snapshot (pyarrow missing, no file, or older than the last replace_df)."""
+        snap = snapshot.read_snapshot(self.snapshot_path, columns)
+        if snap is None or not base <= snap[2] <= gen:
+            return None
+        df, positions, snap_gen = snap
+        pos = pd.Series(positions, index=df.index, dtype="int64")
+        changed = c.execute("SELECT key, pos, data FROM pm_rows WHERE tbl = ? AND gen > ?",
+                            (self.name, snap_gen)).fetchall()
+        deleted = [k for (k,) in c.execute("SELECT key FROM pm_deleted WHERE tbl = ? AND gen > ?",
+                                           (self.name, snap_gen))]
+        if changed or deleted:
+            keep = ~df.index.isin(set(deleted) | {k for k, _, _ in changed})
+            keys = [k for k, _, _ in changed]
+            delta = pd.DataFrame([json.loads(d) for _, _, d in changed], columns=columns,
+                                 index=pd.Index(keys, dtype=object), dtype=object)
+            df = pd.concat([df[keep].reindex(columns=columns), delta])
+            df.index = df.index.astype(object)  # concat infers a string dtype for the keys
+            pos = pd.concat([pos[keep], pd.Series([p for _, p, _ in changed], index=delta.index, dtype="int64")])
+            order = pos.argsort(kind="stable")
+            df, pos = df.iloc[order], pos.iloc[order]
+        df = df.reindex(columns=columns).fillna("")
+        self._pos = dict(zip(df.index, pos.tolist()))
+        self.stats.update(load="snapshot", delta_rows=len(changed) + len(deleted))
+        return df
+
+    # ---------- write ----------
+    def replace_df(self, df: pd.DataFrame, key_col) -> int:
+        """Replace the whole table with df (used by the one-shot importer)."""
+        df = df.fillna("")
+        columns = [str(c) for c in df.columns]
+        records = df.to_dict("records")
+        keys = row_keys(df[key_col].tolist() if key_col in df.columns else [""] * len(df))
+        with self._lock:
+            c = self.conn()
+            with c:
+                gen = self._bump(c, replace=True)
+                c.execute("DELETE FROM pm_rows WHERE tbl = ?", (self.name,))
+                c.execute("DELETE FROM pm_deleted WHERE tbl = ?", (self.name,))
+                c.execute(
+                    "INSERT OR REPLACE INTO pm_tables (name, key_col, columns) VALUES (?, ?, ?)",
+                    (self.name, key_col, json.dumps(columns)),
+                )
+                rows = []
+                for p, (k, r) in enumerate(zip(keys, records)):
+                    rows.append((self.name, k, p, row_payload(r), gen))
+                c.executemany("INSERT INTO pm_rows (tbl, key, pos, data, gen) VALUES (?, ?, ?, ?, ?)", rows)
+                self._log_history(c, gen, [], len(rows), key_col, columns, snapshot_now=True)
+        return len(rows)
+
+    def save_rows(self, upserts: dict, deletes, key_col, columns) -> int:
+        """Upsert {key: row} and delete keys in one transaction.
+
+        Existing keys keep their stored position; new keys are appended after the
+        last stored row. Both are read inside the write transaction, so workers
+        that save in turn never hand out the same position. Returns the number
+        of rows written or deleted.
+        """
+        columns = [str(c) for c in columns]
+        deletes = list(deletes)
+        old_meta = self.meta()
+        if not upserts and not deletes and old_meta == (key_col, columns):
+            return 0
+        with self._lock:
+            c = self.conn()
+            with c:
+                gen = self._bump(c)     # takes the write lock: positions below are current for every worker
+                pos = self._saved_positions(c, list(upserts))
+                next_pos = c.execute("SELECT coalesce(max(pos), -1) + 1 FROM pm_rows WHERE tbl = ?",
+                                     (self.name,)).fetchone()[0]
+                rows = []
+                for k, r in upserts.items():
+                    p = pos.get(k)
+                    if p is None:
+                        p = next_pos
+                        next_pos += 1
+                    rows.append((self.name, k, p, row_payload(r), gen))
+                if old_meta != (key_col, columns):
+                    c.execute(
+                        "INSERT OR REPLACE INTO pm_tables (name, key_col, columns) VALUES (?, ?, ?)",
+                        (self.name, key_col, json.dumps(columns)),
+                    )
+                c.executemany(
+                    "DELETE FROM pm_rows WHERE tbl = ? AND key = ?",
+                    [(self.name, k) for k in deletes],
+                )
+                c.executemany(
+                    "INSERT OR REPLACE INTO pm_deleted (tbl, key, gen) VALUES (?, ?, ?)",
+                    [(self.name, k, gen) for k in deletes],
+                )
+                c.executemany(
+                    "DELETE FROM pm_deleted WHERE tbl = ? AND key = ?",
+                    [(self.name, k) for k in upserts],
+                )
+                c.executemany(
+                    "INSERT OR REPLACE INTO pm_rows (tbl, key, pos, data, gen) VALUES (?, ?, ?, ?, ?)", rows
+                )
+                changes = [(self.name, gen, k, p, d) for _, k, p, d, _ in rows] + \
+                          [(self.name, gen, k, None, None) for k in deletes]
+                self._log_history(c, gen, changes, len(changes), key_col, columns)
+        return len(rows) + len(deletes)
+
+    def _saved_positions(self, c, keys) -> dict:
+        """{key: pos} for those of keys already in the store."""
+        pos = {}
+        for i in range(0, len(keys), SQL_VARS):
+            batch = keys[i:i + SQL_VARS]
+            pos.update(c.execute(f"SELECT key, pos FROM pm_rows WHERE tbl = ? AND key IN ({','.join('?' * len(batch))})",
+                                 (self.name, *batch)))
+        return pos
+
+    # ---------- history ----------
+    def _log_history(self, c, gen, changes, n, key_col, columns, snapshot_now=False):
+        """Log one write's changed rows, inside its transaction, and keep a full copy
+        when due (or when the table has none yet)."""
+        c.execute("INSERT OR REPLACE INTO pm_history_gens (tbl, gen, ts, rows) VALUES (?, ?, ?, ?)",
+                  (self.name, gen, time.time(), n))
+        c.executemany("INSERT OR REPLACE INTO pm_history (tbl, gen, key, pos, data) VALUES (?, ?, ?, ?, ?)", changes)
+        if not snapshot_now:
+            last = c.execute("SELECT gen, rows FROM pm_history_snapshots WHERE tbl = ? ORDER BY gen DESC LIMIT 1",
+                             (self.name,)).fetchone()
+            if last is not None:
+                logged = c.execute("SELECT count(*) FROM pm_history WHERE tbl = ? AND gen > ?",
+                                   (self.name, last[0])).fetchone()[0]
+                snapshot_now = logged >= max(HISTORY_SNAPSHOT_MIN_ROWS, last[1] * HISTORY_SNAPSHOT_RATIO)
+            else:
+                snapshot_now = True
+        if snapshot_now:
+            # [[key, pos, row], ...] spliced from the stored row JSON, without parsing it, and
+            # compressed batch by batch so only the compressed copy is held in memory
+            cur = c.execute("SELECT key, pos, data FROM pm_rows WHERE tbl = ? ORDER BY pos", (self.name,))
+            z = zlib.compressobj(1)
+            parts, sep, n_rows = [z.compress(b"[")], "", 0
+            while True:
+                batch = cur.fetchmany(HISTORY_SNAPSHOT_BATCH)
+                if not batch:
+                    break
+                body = ",".join(f"[{json.dumps(k, ensure_ascii=False)},{p},{d}]" for k, p, d in batch)
+                parts.append(z.compress((sep + body).encode("utf-8")))
+                sep, n_rows = ",", n_rows + len(batch)
+            parts += [z.compress(b"]"), z.flush()]
+            c.execute("INSERT OR REPLACE INTO pm_history_snapshots (tbl, gen, rows, data) VALUES (?, ?, ?, ?)",
+                      (self.name, gen, n_rows, b"".join(parts)))
+
+    def history(self):
+        """[(generation, unix time, rows changed)] of every logged write, oldest first."""
+        with self._lock:
+            return self.conn().execute("SELECT gen, ts, rows FROM pm_history_gens WHERE tbl = ? ORDER BY gen",
+                                       (self.name,)).fetchall()
+
+    def generation_at(self, ts):
+        """The last generation written at or before unix time ts, or None."""
+        with self._lock:
+            row = self.conn().execute("SELECT gen FROM pm_history_gens WHERE tbl = ? AND ts <= ? "
+                                      "ORDER BY gen DESC LIMIT 1", (self.name, ts)).fetchone()
+        return row[0] if row is not None else None
+
+    def changes_at(self, gen):
+        """{key: row, or None if deleted} written by generation gen."""
+        with self._lock:
+            cur = self.conn().execute("SELECT key, data FROM pm_history WHERE tbl = ? AND gen = ?", (self.name, gen))
+            return {k: json.loads(d) if d is not None else None for k, d in cur}
+
+    def changes_since(self, gen):
+        """[(generation, unix time, {key: row, or None if deleted}, full)] for each logged
+        write after gen, oldest first.
+
+        full: the dict holds the whole table as of that write instead of the rows it
+        changed (a replace_df, or the first write history was kept for).
+        """
+        with self._lock:
+            c = self.conn()
+            first = c.execute("SELECT min(gen) FROM pm_history_snapshots WHERE tbl = ?", (self.name,)).fetchone()[0]
+            gens = c.execute("SELECT g.gen, g.ts, s.gen IS NOT NULL FROM pm_history_gens g "
+                             "LEFT JOIN pm_history_snapshots s ON s.tbl = g.tbl AND s.gen = g.gen "
+                             "WHERE g.tbl = ? AND g.gen > ? ORDER BY g.gen", (self.name, gen)).fetchall()
+        out = []
+        for g, ts, copied in gens:
+            if first is None or g < first:
+                continue
+            changes = self.changes_at(g)
+            full = bool(copied) and (not changes or g == first)
+            out.append((g, ts, dict(self.rows_at(g)) if full else changes, full))
+        return out
+
+    def rows_at(self, gen):
+        """{key: row} in saved order as the table stood after generation gen, or None
+        if history does not reach back that far.
+
+        Costs one full copy plus the logged rows after it (or, stepping forward
+        from the last call, only the rows in between); the last full copy read is
+        kept decoded. Treat the rows as read-only.
+        """
+        with self._lock:
+            c = self.conn()
+            snap = c.execute("SELECT gen FROM pm_history_snapshots WHERE tbl = ? AND gen <= ? "
+                             "ORDER BY gen DESC LIMIT 1", (self.name, gen)).fetchone()
+            if snap is None:
+                return None
+            cached = self._history
+            if cached is None or not snap[0] <= cached[0] <= gen:
+                if self._history_base is None or self._history_base[0] != snap[0]:
+                    blob = c.execute("SELECT data FROM pm_history_snapshots WHERE tbl = ? AND gen = ?",
+                                     (self.name, snap[0])).fetchone()[0]
+                    copy = json.loads(zlib.decompress(blob))
+                    self._history_base = (snap[0], {k: r for k, _, r in copy}, {k: p for k, p, _ in copy})
+                cached = self._history_base
+            start, rows, pos = cached[0], dict(cached[1]), dict(cached[2])
+            # rows stay in saved order: a row keeps its position on update and new rows
+            # are appended after the last one, so only an out-of-order append needs a sort
+            last, ordered = max(pos.values(), default=-1), True
+            cur = c.execute("SELECT key, pos, data FROM pm_history WHERE tbl = ? AND gen > ? AND gen <= ? "
+                            "ORDER BY gen", (self.name, start, gen))
+            for k, p, d in cur:
+                if d is None:
+                    rows.pop(k, None)
+                    pos.pop(k, None)
+                    continue
+                if k not in rows:
+                    ordered = ordered and p >= last
+                    last = max(last, p)
+                rows[k] = json.loads(d)
+                pos[k] = p
+            if not ordered:
+                rows = dict(sorted(rows.items(), key=lambda kv: pos[kv[0]]))
+            self._history = (gen, rows, pos)
+        return rows
+
+    def rows_as_of(self, ts):
+        """(generation, {key: row}) as the table stood at unix time ts, or None (see rows_at)."""
+        gen = self.generation_at(ts)
+        rows = self.rows_at(gen) if gen is not None else None
+        return (gen, rows) if rows is not None else None
+
+
+class IdSequence:
+    """A persistent counter in the shared SQLite file; value is the last number handed out.
+
+    reserve() is one short write transaction (BEGIN IMMEDIATE), so allocations are
+    atomic across threads and worker processes.
+    """
+
+    def __init__(self, db_path, name):
+        self.db_path = str(db_path)
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def conn(self):
+        if self._conn is None:
+            c = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.executescript(SCHEMA)
+            self._conn = c
+        return self._conn
+
+    def reserve(self, n=1, seed=None) -> int:
+        """Reserve n consecutive numbers and return the first.
+
+        The first call seeds the counter from seed() (the highest number already
+        in use), or 0. Later calls never look at the data again.
+        """
+        n = max(1, int(n))
+        with self._lock:
+            c = self.conn()
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                row = c.execute("SELECT value FROM pm_sequences WHERE name = ?", (self.name,)).fetchone()
+                last = row[0] if row is not None else int(seed() if seed else 0)
+                c.execute("INSERT OR REPLACE INTO pm_sequences (name, value) VALUES (?, ?)",
+                          (self.name, last + n))
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+        return last + 1
+
+    def advance(self, value) -> None:
+        """Make sure numbers up to value are never handed out (e.g. after an import)."""
+        with self._lock:
+            c = self.conn()
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute("INSERT INTO pm_sequences (name, value) VALUES (?, ?) "
+                          "ON CONFLICT(name) DO UPDATE SET value = max(value, excluded.value)",
+                          (self.name, int(value)))
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+
+    def reset(self) -> None:
+        """Forget the counter; the next reserve() seeds it again."""
+        with self._lock:
+            self.conn().execute("DELETE FROM pm_sequences WHERE name = ?", (self.name,))
@@ -0,0 +1,498 @@
+"""
+Authoritative in-process copy of a PM table, indexed by row key.
+
+The tickets DataTable runs with page/sort/filter_action="custom": the browser
+only ever receives the visible page, which is cut from here. Sorted orders and
+filter results are cached per table version, so paging through an unchanged
+table does not re-sort or re-filter it.
+"""
+import re
+import threading
+import uuid
+
+import pandas as pd
+
+from pm_app.buckets import BucketIndex
+from pm_app.rowdigest import RowDigest
+from pm_app.search import SearchIndex
+from pm_app.store import row_keys
+
+# ---------- DataTable filter_query parsing ----------
+# Parts look like '{Status} scontains Block', '{Priority} = "High"', '{Due} >= 20260101'
+# and are joined with ' && '. 's'/'i' prefixes select case (in)sensitive matching.
+FILTER_PART_RE = re.compile(r"^\{(?P<col>[^}]*)\}\s+(?P<op>[a-z]+|[<>!=]=?)\s*(?P<val>.*)$")
+
+FILTER_OP_ALIASES = {
+    "=": "eq", "eq": "eq",
+    "!=": "ne", "ne": "ne",
+    "<": "lt", "lt": "lt",
+    "<=": "le", "le": "le",
+    ">": "gt", "gt": "gt",
+    ">=": "ge", "ge": "ge",
+    "contains": "contains",
+    "datestartswith": "datestartswith",
+}
+
+
+def parse_filter_query(filter_query):
+    """'{A} contains x && {B} = y' -> [(col, op, value, case_insensitive), ...]"""
+    parts = []
+    for raw in (filter_query or "").split(" && "):
+        m = FILTER_PART_RE.match(raw.strip())
+        if not m:
+            continue
+        op = m.group("op")
+        insensitive = False
+        if op not in FILTER_OP_ALIASES and op[:1] in ("s", "i") and op[1:] in FILTER_OP_ALIASES:
+            insensitive = op[0] == "i"
+            op = op[1:]
+        if op not in FILTER_OP_ALIASES:
+            continue
+        val = m.group("val").strip()
+        if len(val) >= 2 and val[0] == val[-1] and val[0] in ("'", '"', "`"):
+            val = val[1:-1]
+        parts.append((m.group("col"), FILTER_OP_ALIASES[op], val, insensitive))
+    return parts
+
+
+def _as_number(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def cell_matches(cell, op, val, insensitive=False):
+    s = "" if cell is None else str(cell)
+    if insensitive:
+        s, val = s.lower(), val.lower()
+    if op == "contains":
+        return val in s
+    if op == "datestartswith":
+        return s.replace("-", "").startswith(val.replace("-", ""))
+    a, b = _as_number(s), _as_number(val)
+    if a is None or b is None:
+        a, b = s, val
+    if op == "eq":
+        return a == b
+    if op == "ne":
+        return a != b
+    if op == "lt":
+        return a < b
+    if op == "le":
+        return a <= b
+    if op == "gt":
+        return a > b
+    if op == "ge":
+        return a >= b
+    return True
+
+
+def sort_value(v):
+    # Numbers before text, text case-insensitive; blanks sort last.
+    if isinstance(v, bool):
+        v = str(v)
+    if isinstance(v, (int, float)):
+        return (0, v, "")
+    s = "" if v is None else str(v)
+    return (2, 0, "") if s == "" else (1, 0, s.lower())
+
+
+# A column whose distinct values are at most this many (or this share of the rows)
+# is held categorically: every cell refers to one shared string per distinct value.
+CATEGORY_MIN = 256
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _intern(pool, v):
+    # Text only: dict lookup is by ==, and 1 == 1.0 == True would swap types.
+    return pool.setdefault(v, v) if type(v) is str else v
+
+
+class RowTable:
+    """Rows keyed by a stable row key (the id column value at load time).
+
+    A RowDigest follows every mutation, so dirty checks and saves only look at
+    the rows changed since the last mark_saved(). If a journal is attached, each
+    mutation is also appended to it (under the table lock, so journal order is
+    mutation order).
+
+    Every row also carries a revision (count, writer uid) that moves on each
+    write and travels with journal records, so sessions can tell whether a row
+    changed since they read it (see merge_edit).
+
+    Rows are plain dicts of cell values; JSON records are only built per page
+    (see page()). Low-cardinality columns (status, priority, owner, epic,
+    dates, ...) are categorical: their cells are interned through a per-column
+    pool, so 100k rows share a handful of value objects instead of holding
+    100k copies. Only text is interned: a pool keyed on equality would hand
+    back 1.0 for a 1 or True (and those are small objects anyway).
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.journal = None
+        self.lock = threading.RLock()
+        self.uid = uuid.uuid4().hex[:8]
+        self.key_col = None
+        self.columns = []
+        self.rows = {}
+        self.order = {}     # key -> None in table order (a dict, so a delete is O(1))
+        self.rank = {}
+        self.revs = {}      # key -> (write count, uid of the writing instance)
+        self.version = 0
+        self.digest = RowDigest()
+        self.indexes = {}   # column -> BucketIndex; None -> SearchIndex
+        self.pools = {}     # categorical column -> {text: the shared str object}
+        self._next_rank = 0
+        self._sorted = {}
+        self._filtered = {}
+
+    @property
+    def token(self) -> str:
+        """Version token that is unique across instances (and so across worker processes)."""
+        return f"{self.uid}.{self.version}"
+
+    @property
+    def state_token(self) -> str:
+        """token plus the content digest, which the browser's dirty flag compares with
+        saved_token() (assets/pm_clientside.js)."""
+        return f"{self.token}.{self.content_token()}"
+
+    def _changed(self):
+        self.version += 1
+        self._sorted.clear()
+        self._filtered.clear()
+
+    def add_index(self, col, normalize=None) -> BucketIndex:
+        """Keep a BucketIndex on col (bucketed by normalize(cell), if given) up to date from now on."""
+        with self.lock:
+            idx = self.indexes.get(col)
+            if idx is None:
+                idx = self.indexes[col] = BucketIndex(col, normalize)
+                idx.reset((k, self.rank[k], self.rows[k]) for k in self.order)
+            return idx
+
+    def add_search(self, cols, weights=None, path=None) -> SearchIndex:
+        """Keep a full-text SearchIndex over cols up to date from now on, starting from
+        the copy persisted at path if there is one."""
+        with self.lock:
+            idx = self.indexes.get(None)
+            if idx is None:
+                idx = SearchIndex.load(path, cols, weights) if path else SearchIndex(cols, weights)
+                idx.reset((k, self.rank[k], self.rows[k]) for k in self.order)
+                self.indexes[None] = idx
+            return idx
+
+    def _touched(self, key, rev=None):
+        self.revs[key] = tuple(rev) if rev else (self.revs.get(key, (0, ""))[0] + 1, self.uid)
+        self.digest.set(key, self.rank[key], self.rows[key])
+        for idx in self.indexes.values():
+            idx.refresh(key, self.rank[key], self.rows[key])
+
+    def _dropped(self, key):
+        del self.rows[key]
+        del self.order[key]
+        del self.rank[key]
+        self.revs.pop(key, None)
+        self.digest.remove(key)
+        for idx in self.indexes.values():
+            idx.remove(key)
+
+    def _log(self, puts=(), deletes=()):
+        if self.journal is None:
+            return
+        records = [{"tbl": self.name, "op": "put", "key": k, "row": self.rows[k], "rev": self.revs[k]} for k in puts]
+        records += [{"tbl": self.name, "op": "del", "key": k} for k in deletes]
+        self.journal.append(records)
+
+    def _cell(self, col, v):
+        pool = self.pools.get(col)
+        return _intern(pool, v) if pool is not None else v
+
+    def _new_row(self, row: dict, base=None) -> dict:
+        """A row over self.columns from row (missing cells from base, else ""), interned."""
+        base = base or {}
+        return {c: self._cell(c, row.get(c, base.get(c, ""))) for c in self.columns}
+
+    def _insert(self, key, row: dict, rev=None):
+        for c in row:
+            if c not in self.columns:
+                self.columns.append(c)
+        self.rows[key] = self._new_row(row)
+        self.order[key] = None
+        self.rank[key] = self._next_rank
+        self._next_rank += 1
+        self._touched(key, rev)
+
+    def apply_record(self, op, key, row=None, rev=None):
+        """Apply one journal record without journaling it again."""
+        with self.lock:
+            if op == "del":
+                if key not in self.rows:
+                    return
+                self._dropped(key)
+            elif op == "put" and row is not None:
+                if key in self.rows:
+                    new = self._new_row(row)
+                    if new == self.rows[key]:
+                        if rev:
+                            self.revs[key] = tuple(rev)
+                        return
+                    self.rows[key] = new
+                    self._touched(key, rev)
+                else:
+                    self._insert(key, row, rev)
+            else:
+                return
+            self._changed()
+
+    # ---------- load / export ----------
+    def load_df(self, df: pd.DataFrame, key_col):
+        """Replace the contents; a string index (as from TableStore.load_df) gives the row keys."""
+        df = df.fillna("")
+        if isinstance(df.index, pd.RangeIndex):
+            keys = row_keys(df[key_col].tolist() if key_col in df.columns else [""] * len(df))
+        else:
+            keys = [str(k) for k in df.index]
+        with self.lock:
+            self.key_col = key_col
+            self.columns = [str(c) for c in df.columns]
+            values = [df.iloc[:, i].tolist() for i in range(len(self.columns))]
+            self.pools = {}
+            for i, c in enumerate(self.columns):
+                if len(set(values[i])) <= max(CATEGORY_MIN, len(keys) * CATEGORY_MAX_RATIO):
+                    pool = self.pools[c] = {}
+                    values[i] = [_intern(pool, v) for v in values[i]]
+            self.rows = {k: dict(zip(self.columns, cells)) for k, cells in zip(keys, zip(*values))}
+            self.order = dict.fromkeys(keys)
+            self.rank = {k: i for i, k in enumerate(keys)}
+            self.revs = {k: (0, "") for k in keys}
+            self._next_rank = len(keys)
+            self.digest.reset((k, self.rank[k], self.rows[k]) for k in keys)
+            for idx in self.indexes.values():
+                idx.reset((k, self.rank[k], self.rows[k]) for k in keys)
+            self._changed()
+
+    def to_df(self) -> pd.DataFrame:
+        with self.lock:
+            return pd.DataFrame([self.rows[k] for k in self.order], columns=self.columns).fillna("")
+
+    def __len__(self):
+        return len(self.order)
+
+    def get(self, key):
+        with self.lock:
+            row = self.rows.get(key)
+            return dict(row) if row is not None else None
+
+    def rev(self, key) -> str:
+        """Row revision as sent to the browser ('' for an unknown key)."""
+        rev = self.revs.get(key)
+        return f"{rev[0]}.{rev[1]}" if rev else ""
+
+    # ---------- optimistic concurrency ----------
+    def merge_edit(self, key, base: dict, mine: dict, base_rev=None):
+        """Three-way merge of one session's edit of a row.
+
+        base is the row as the session last saw it, mine as the session wants it.
+        Only columns the session changed are written. A column someone else also
+        changed to a different value since base is a conflict and keeps their value.
+        Returns (row to write, or None if nothing to write; [conflicting columns]).
+        """
+        with self.lock:
+            cur = self.rows.get(key)
+            if cur is None:
+                return None, ["row deleted"]
+            changed = [c for c in self.columns if mine.get(c, "") != base.get(c, "")]
+            if not changed:
+                return None, []
+            out = dict(cur)
+            if base_rev is not None and base_rev == self.rev(key):
+                # nobody wrote the row since the session read it
+                out.update({c: mine.get(c, "") for c in changed})
+                return out, []
+            conflicts = []
+            for c in changed:
+                theirs = cur.get(c, "")
+                if theirs == base.get(c, "") or theirs == mine.get(c, ""):
+                    out[c] = mine.get(c, "")
+                else:
+                    conflicts.append(c)
+            return (out if out != cur else None), conflicts
+
+    # ---------- dirty tracking ----------
+    def dirty_keys(self):
+        with self.lock:
+            return set(self.digest.dirty)
+
+    def is_dirty(self) -> bool:
+        return bool(self.digest.dirty)
+
+    def content_token(self) -> str:
+        return self.digest.hexdigest()
+
+    def saved_token(self) -> str:
+        """The digest of the rows as last saved; equals content_token() when nothing is dirty."""
+        return self.digest.saved_hexdigest()
+
+    def take_dirty(self):
+        """Return (upserts {key: row}, deletes [key], snapshot) for the dirty rows.
+
+        Pass snapshot to mark_saved() after writing, so edits made meanwhile stay dirty.
+        """
+        with self.lock:
+            # in table order, so rows new to the store are appended in the order they were added
+            keys = sorted(self.digest.dirty, key=lambda k: self.rank.get(k, self._next_rank))
+            upserts = {k: dict(self.rows[k]) for k in keys if k in self.rows}
+            deletes = [k for k in keys if k not in self.rows]
+            return upserts, deletes, self.digest.snapshot(keys)
+
+    def mark_saved(self, snapshot=None):
+        with self.lock:
+            self.digest.mark_saved(snapshot)
+
+    # ---------- mutations ----------
+    def update(self, key, row: dict) -> bool:
+        """Overwrite the known columns of one row; returns True if anything changed."""
+        with self.lock:
+            cur = self.rows.get(key)
+            if cur is None:
+                return False
+            new = self._new_row(row, base=cur)
+            if new == cur:
+                return False
+            self.rows[key] = new
+            self._touched(key)
+            self._changed()
+            self._log(puts=[key])
+            return True
+
+    def set_values(self, keys, values: dict) -> int:
+        """Set the same column values on several rows; returns rows touched."""
+        touched = []
+        with self.lock:
+            for k in keys:
+                cur = self.rows.get(k)
+                if cur is None:
+                    continue
+                cur.update({c: self._cell(c, v) for c, v in values.items() if c in self.columns})
+                self._touched(k)
+                touched.append(k)
+            if touched:
+                self._changed()
+                self._log(puts=touched)
+        return len(touched)
+
+    def append(self, row: dict):
+        with self.lock:
+            key = str(row.get(self.key_col, "")).strip() or f"#{len(self.order)}"
+            base, i = key, 1
+            while key in self.rows:
+                key = f"{base}#{i}"
+                i += 1
+            self._insert(key, row)
+            self._changed()
+            self._log(puts=[key])
+            return key
+
+    def extend(self, rows) -> list:
+        """Append rows under one lock hold and one journal write (e.g. a bulk import chunk).
+
+        Each row must carry its key in the key column; rows with a blank or taken
+        key are skipped. Returns the keys added.
+        """
+        with self.lock:
+            added = []
+            for row in rows:
+                key = str(row.get(self.key_col, "")).strip()
+                if not key or key in self.rows:
+                    continue
+                self._insert(key, row)
+                added.append(key)
+            if added:
+                self._changed()
+                self._log(puts=added)
+            return added
+
+    def delete(self, keys) -> int:
+        with self.lock:
+            drop = {k for k in keys if k in self.rows}
+            if not drop:
+                return 0
+            for k in drop:
+                self._dropped(k)
+            self._changed()
+            self._log(deletes=sorted(drop))
+            return len(drop)
+
+    # ---------- server-side paging ----------
+    def _sorted_keys(self, col, direction):
+        cache_key = (col, direction)
+        keys = self._sorted.get(cache_key)
+        if keys is None:
+            keys = sorted(self.order, key=lambda k: sort_value(self.rows[k].get(col, "")),
+                          reverse=(direction == "desc"))
+            self._sorted[cache_key] = keys
+        return keys
+
+    def _filtered_keys(self, filter_query):
+        keys = self._filtered.get(filter_query)
+        if keys is None:
+            parts = [p for p in parse_filter_query(filter_query) if p[0] in self.columns]
+            keys = [k for k in self.order
+                    if all(cell_matches(self.rows[k].get(c, ""), op, v, ci) for c, op, v, ci in parts)]
+            self._filtered[filter_query] = keys
+        return keys
+
+    def query(self, filter_query="", sort_by=None, search=""):
+        """Row keys matching filter_query, in sort_by order (DataTable formats).
+
+        With search (and a search index), only rows matching it, best match first
+        unless sort_by is given.
+        """
+        with self.lock:
+            keys = self._filtered_keys(filter_query or "")
+            idx = self.indexes.get(None)
+            if search and idx is not None:
+                ranked = idx.search(search)
+                if len(keys) != len(self.order):
+                    wanted = set(keys)
+                    ranked = [k for k in ranked if k in wanted]
+                keys = ranked
+            sort_by = [s for s in (sort_by or []) if s.get("column_id") in self.columns]
+            if sort_by:
+                # Python's sort is stable, so apply the sort keys from last to first;
+                # the innermost one comes from the per-column cache.
+                ordered = self.order
+                for i, s in enumerate(reversed(sort_by)):
+                    col, direction = s["column_id"], s.get("direction", "asc")
+                    if i == 0:
+                        ordered = self._sorted_keys(col, direction)
+                    else:
+                        ordered = sorted(ordered, key=lambda k: sort_value(self.rows[k].get(col, "")),
+                                         reverse=(direction == "desc"))
+                if len(keys) != len(self.order):
+                    wanted = set(keys)
+                    ordered = [k for k in ordered if k in wanted]
+                keys = ordered
+            return keys
+
+    def page(self, page_current=0, page_size=18, sort_by=None, filter_query="", search=""):
+        """Return (records, page_count) for one page; records carry their row key as 'id'
+        and their revision as '_rev'."""
+        page_current = page_current or 0
+        page_size = max(1, page_size or 18)
+        with self.lock:
+            keys = self.query(filter_query, sort_by, search)
+            page_count = max(1, -(-len(keys) // page_size))
+            start = min(page_current, page_count - 1) * page_size
+            out = []
+            for k in keys[start:start + page_size]:
+                r = dict(self.rows[k])
+                if "id" not in self.columns:
+                    r["id"] = k
+                if "_rev" not in self.columns:
+                    r["_rev"] = self.rev(k)
+                out.append(r)
+            return out, page_count
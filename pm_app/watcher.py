@@ -0,0 +1,193 @@
+"""
+Project index (docs/*.md, data/*.json|csv|xlsx) kept current by a file watcher.
+
+The index only lists paths, so only directories need watching: a directory's
+mtime changes when entries are added, removed or renamed in it. On a change
+just the affected directories are re-listed, and data/project_index.json is
+rewritten (and the version bumped) only if the file lists actually differ.
+
+With watchdog (in requirements.txt), refreshes are driven by filesystem
+events. Without it, a background thread stats the known directories (not the
+files) every few seconds.
+"""
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional
+    FileSystemEventHandler = object
+    Observer = None
+
+INDEX_SECTIONS = {
+    "docs": {".md"},
+    "data": {".json", ".csv", ".xlsx"},
+}
+
+
+def indexed_file(name: str, exts) -> bool:
+    # Dotfiles and Office lock files are temporaries (e.g. atomic-write scratch copies)
+    if name.startswith((".", "~$")):
+        return False
+    return not exts or os.path.splitext(name)[1].lower() in exts
+
+
+def list_files(root: Path, base: Path, exts=None):
+    out = []
+    if not base.exists():
+        return out
+    for p in base.rglob("*"):
+        if p.is_dir() or not indexed_file(p.name, exts):
+            continue
+        out.append(p.relative_to(root).as_posix())
+    return sorted(out)
+
+
+def build_index(root: Path, sections=INDEX_SECTIONS) -> dict:
+    index = {"generated_utc": datetime.utcnow().isoformat(timespec="seconds") + "Z"}
+    for name, exts in sections.items():
+        index[name] = list_files(root, root / name, exts)
+    return index
+
+
+def write_index(index: dict, out_path: Path):
+    # Every worker process runs a watcher, so each writes through its own scratch file
+    # (a dotfile, so it never shows up in the index itself)
+    fd, tmp = tempfile.mkstemp(dir=out_path.parent, prefix="." + out_path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(index, indent=2))
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class _Events(FileSystemEventHandler):
+    def __init__(self, kick):
+        self.kick = kick
+
+    def on_any_event(self, event):
+        self.kick.set()
+
+
+class ProjectIndexWatcher:
+    def __init__(self, root, out_path, sections=INDEX_SECTIONS, poll_interval=2.0, changed=None):
+        self.root = Path(root)
+        self.out_path = Path(out_path)
+        self.sections = sections
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.index = {}
+        self._dirs = {}      # dir path -> (mtime_ns, [indexed file names], [subdir names])
+        self._lock = threading.Lock()
+        self._changed = changed or threading.Condition()   # may be shared with other notifiers
+        self._kick = threading.Event()
+        self._started = False
+        self._relisted = False
+        try:
+            self.index = json.loads(self.out_path.read_text(encoding="utf-8")) or {}
+        except (OSError, ValueError):
+            self.index = {}
+
+    # ---------- scanning ----------
+    def _scan_dir(self, path: str, exts):
+        """Re-list path if its mtime moved; recurse into new subdirectories."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._forget(path)
+            return
+        cached = self._dirs.get(path)
+        if cached is None or cached[0] != mtime:
+            files, subdirs = [], []
+            with os.scandir(path) as it:
+                for e in it:
+                    if e.is_dir():
+                        subdirs.append(e.name)
+                    elif indexed_file(e.name, exts):
+                        files.append(e.name)
+            if cached is not None:
+                for gone in set(cached[2]) - set(subdirs):
+                    self._forget(os.path.join(path, gone))
+            cached = self._dirs[path] = (mtime, files, subdirs)
+            self._relisted = True
+        for sub in cached[2]:
+            self._scan_dir(os.path.join(path, sub), exts)
+
+    def _forget(self, path):
+        for d in [d for d in self._dirs if d == path or d.startswith(path + os.sep)]:
+            del self._dirs[d]
+            self._relisted = True
+
+    def _section_files(self, base: str):
+        out = []
+        for d, (_, files, _) in self._dirs.items():
+            if d == base or d.startswith(base + os.sep):
+                out += [Path(d, f).relative_to(self.root).as_posix() for f in files]
+        return sorted(out)
+
+    def refresh(self) -> bool:
+        """Re-list changed directories; write the index and bump version if it differs."""
+        with self._lock:
+            self._relisted = False
+            for name, exts in self.sections.items():
+                base = str(self.root / name)
+                if os.path.isdir(base):
+                    self._scan_dir(base, exts)
+                else:
+                    self._forget(base)
+            if not self._relisted:
+                return False
+            lists = {name: self._section_files(str(self.root / name)) for name in self.sections}
+            if all(self.index.get(name) == files for name, files in lists.items()):
+                return False
+            self.index = dict(lists, generated_utc=datetime.utcnow().isoformat(timespec="seconds") + "Z")
+            write_index(self.index, self.out_path)
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+        return True
+
+    # ---------- subscribers ----------
+    def wait(self, seen_version, timeout=None) -> int:
+        """Block until version != seen_version (or timeout); returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+    def rows(self):
+        return [{"Section": name, "Path": p} for name in self.sections for p in (self.index.get(name) or [])]
+
+    # ---------- background ----------
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        if Observer is not None:
+            observer = Observer()
+            handler = _Events(self._kick)
+            for name in self.sections:
+                base = self.root / name
+                if base.is_dir():
+                    observer.schedule(handler, str(base), recursive=True)
+            observer.daemon = True
+            observer.start()
+
+        def loop():
+            while True:
+                self._kick.clear()
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[project-index] refresh failed: {e}")
+                # with watchdog this sleeps until an event; otherwise it stats directories
+                self._kick.wait(None if Observer is not None else self.poll_interval)
+
+        threading.Thread(target=loop, name="pm-project-index", daemon=True).start()
@@ -0,0 +1,94 @@
+"""
+Parsed-sheet cache for the PM workbook (data/Project_Aion_PM_System.xlsx).
+
+The file is read into memory once per (mtime, size) and opened as one
+pd.ExcelFile. Sheets are parsed lazily and kept in a bounded LRU. When the file
+changes, a sheet is re-parsed only if its own XML part (or the shared strings /
+styles it depends on) changed, and its version is bumped only if the parsed
+content actually differs.
+"""
+import io
+import os
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import OrderedDict
+
+import pandas as pd
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_SHARED_PARTS = ("xl/sharedStrings.xml", "xl/styles.xml")
+
+
+def sheet_fingerprints(data: bytes) -> dict:
+    """{sheet name: (crc of sheet part, crc of shared strings/styles)} from the xlsx zip directory."""
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        crcs = {i.filename: i.CRC for i in z.infolist()}
+        wb = ET.fromstring(z.read("xl/workbook.xml"))
+        rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for r in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        t = r.get("Target", "")
+        t = t.lstrip("/") if t.startswith("/") else "xl/" + t
+        targets[r.get("Id")] = t
+    shared = tuple(crcs.get(p) for p in _SHARED_PARTS)
+    out = {}
+    for s in wb.iter(f"{_NS_MAIN}sheet"):
+        part = targets.get(s.get(f"{_NS_REL}id"))
+        out[s.get("name")] = (crcs.get(part), shared)
+    return out
+
+
+class WorkbookCache:
+    def __init__(self, path, max_sheets=16):
+        self.path = path
+        self.max_sheets = max_sheets
+        self._lock = threading.Lock()
+        self._stat = None
+        self._xls = None
+        self._fingerprints = {}
+        self._sheets = OrderedDict()    # (name, header) -> (fingerprint, df, version)
+        self.parses = 0
+
+    def _refresh(self):
+        st = os.stat(self.path)
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat:
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self._fingerprints = sheet_fingerprints(data)
+        self._xls = pd.ExcelFile(io.BytesIO(data))
+        self._stat = stat
+
+    def _get(self, name, header):
+        self._refresh()
+        key = (name, header)
+        fp = self._fingerprints.get(name)
+        cached = self._sheets.get(key)
+        if cached is not None and cached[0] == fp:
+            self._sheets.move_to_end(key)
+            return cached
+        df = pd.read_excel(self._xls, name, header=header)
+        self.parses += 1
+        version = 1
+        if cached is not None:
+            version = cached[2] if cached[1].equals(df) else cached[2] + 1
+        entry = (fp, df, version)
+        self._sheets[key] = entry
+        self._sheets.move_to_end(key)
+        while len(self._sheets) > self.max_sheets:
+            self._sheets.popitem(last=False)
+        return entry
+
+    def sheet(self, name, header=0) -> pd.DataFrame:
+        """Parsed sheet (a copy; callers may modify it)."""
+        with self._lock:
+            return self._get(name, header)[1].copy()
+
+    def version(self, name, header=0) -> int:
+        """Bumped whenever the parsed content of the sheet changes on disk."""
+        with self._lock:
+            return self._get(name, header)[2]
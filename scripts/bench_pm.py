@@ -0,0 +1,348 @@
+"""
+Benchmark suite for the PM app's data paths and callbacks.
+
+Generates synthetic ticket and decision tables (realistic IDs, statuses,
+priorities, owners, epics and mixed-format Start/Due/Created/Updated dates),
+seeds a throwaway PM store with them and times, in isolation, the store
+load/save paths, date normalization, row digests, the table callbacks
+(paging, sort, filter, search, edits, adds, kanban moves) and journal
+compaction. Each size runs in its own process in a temp directory, so peak
+memory (tracemalloc, per case) and max RSS (per size) are not shared.
+
+Results go to a JSON file tagged with the commit, so two runs can be compared.
+Max RSS is about 2.3 GB at 100k rows, so 1M rows needs a machine with ~25 GB;
+a size whose process dies is reported as failed and the others still run.
+
+Usage:
+    python scripts/bench_pm.py                          # 1k, 10k, 100k, 1M rows
+    python scripts/bench_pm.py --sizes 1000,10000 --out before.json
+    python scripts/bench_pm.py --sizes 1000,10000 --out after.json --compare before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUT = "bench_pm.json"
+SEED = 20240601
+
+STATUSES = (["To Do", "In Progress", "Blocked", "Done"], [0.35, 0.25, 0.05, 0.35])
+PRIORITIES = (["High", "Medium", "Low"], [0.2, 0.5, 0.3])
+OWNERS = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+          "Devon", "Harper", "Rowan", "Skyler", "Emerson", "Reese", "Parker", "Hayden", "Sage", "Blake", ""]
+VERBS = ["Add", "Fix", "Refactor", "Document", "Migrate", "Review", "Design", "Test", "Remove", "Update",
+         "Investigate", "Automate", "Deploy", "Benchmark", "Validate"]
+NOUNS = ["roadmap export", "kanban board", "charter sheet", "ticket import", "decision log", "index watcher",
+         "framework spec", "milestone report", "journal compaction", "search index", "owner dropdown",
+         "epic rollup", "date parser", "workbook cache", "status KPIs", "realm mapping", "drift check",
+         "daily sync", "master tree", "overview tab"]
+QUALIFIERS = ["", "", "for Q3", "in cockpit", "on startup", "for large projects", "(follow-up)", "v2",
+              "edge cases", "after review"]
+
+
+# ---------- Synthetic data ----------
+def _dates(rng, n, start, spread_days, fmt, blank=0.1):
+    days = rng.integers(0, spread_days, n)
+    values = (pd.Timestamp(start) + pd.to_timedelta(days, unit="D")).strftime(fmt).to_numpy(dtype=object)
+    values[rng.random(n) < blank] = ""
+    return values
+
+
+def synthetic_tickets(n, seed=SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    titles = (pd.Series(rng.choice(VERBS, n)) + " " + pd.Series(rng.choice(NOUNS, n)) + " "
+              + pd.Series(rng.choice(QUALIFIERS, n))).str.strip()
+    return pd.DataFrame({
+        "Ticket ID": [f"T-{i:04d}" for i in range(1, n + 1)],
+        "Title": titles,
+        "Status": rng.choice(STATUSES[0], n, p=STATUSES[1]),
+        "Priority": rng.choice(PRIORITIES[0], n, p=PRIORITIES[1]),
+        "Owner": rng.choice(OWNERS, n),
+        "Epic": [f"E-{e:02d}" for e in rng.integers(1, max(2, min(60, n // 50)), n)],
+        # mixed formats, as typed into the workbook and the table
+        "Start": _dates(rng, n, "2025-01-01", 540, "%Y-%m-%d"),
+        "Due": _dates(rng, n, "2025-03-01", 540, "%Y-%m-%d 00:00:00"),
+        "Created": _dates(rng, n, "2024-10-01", 400, "%Y%m%d", blank=0.0),
+        "Updated": _dates(rng, n, "2025-01-01", 400, "%m/%d/%Y", blank=0.3),
+        "Notes": rng.choice(["", "", "", "Waiting on charter sign-off", "See decision log",
+                             "Blocked by import", "Needs owner"], n),
+    })
+
+
+def synthetic_decisions(n, seed=SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed + 1)
+    return pd.DataFrame({
+        "Decision_ID": [f"D-{i:04d}" for i in range(1, n + 1)],
+        "Date": _dates(rng, n, "2024-10-01", 600, "%Y%m%d", blank=0.0),
+        "Decision": pd.Series(rng.choice(VERBS, n)) + " the " + pd.Series(rng.choice(NOUNS, n)),
+        "Rationale": rng.choice(["Cheaper to maintain", "Unblocks the roadmap", "Requested at review",
+                                 "Reduces manual sync", "Keeps one source of truth", ""], n),
+        "Owner": rng.choice(OWNERS, n),
+        "Status": rng.choice(["Proposed", "Accepted", "Superseded"], n, p=[0.2, 0.7, 0.1]),
+        "Link": "",
+    })
+
+
+# ---------- Measurement ----------
+def measure(fn, setup=None, repeats=5, budget=2.0):
+    """Time fn(*setup()) up to repeats times (stopping once budget seconds are spent),
+    then once more under tracemalloc for the peak memory it allocates."""
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeats and (not times or time.perf_counter() - started < budget):
+        args = setup() if setup else ()
+        t = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t)
+    args = setup() if setup else ()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "runs": len(times),
+            "peak_bytes": max(0, peak)}
+
+
+def max_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+# ---------- One size (runs in a child process) ----------
+def run_size(n, repeats, budget):
+    """Benchmark every case at n rows; must run in an empty working directory."""
+    os.symlink(ROOT / "data", "data")     # the charter sheet load_data reads
+    with contextlib.redirect_stdout(io.StringIO()):
+        from pm_app import app as a
+        from pm_app.dates import DateNormalizer
+        from pm_app.rowdigest import RowDigest
+        from pm_app.store import TableStore
+    results = []
+
+    def case(name, fn, setup=None, heavy=False):
+        print(f"  {n:>9,} {name}", file=sys.stderr, flush=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            r = measure(fn, setup, 1 if heavy and n >= 100_000 else repeats, budget)
+        results.append(dict(size=n, case=name, **r))
+
+    tickets, decisions = synthetic_tickets(n), synthetic_decisions(n)
+
+    # save / load paths
+    case("store.replace_df", lambda: a.TICKETS_DB.replace_df(tickets, "Ticket ID"), heavy=True)
+    a.DECISIONS_DB.replace_df(decisions, "Decision_ID")
+    a.TICKET_IDS.reset()
+    case("store.load_df.rows", TableStore(a.PM_DB_FILE, "tickets").load_df, heavy=True)
+    raw = a.TICKETS_DB.load_df()     # writes the columnar snapshot
+    case("store.load_df.snapshot", a.TICKETS_DB.load_df, heavy=True)
+
+    def cold_start():
+        for name in ("tickets", "decisions"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(a.PM_SEARCH_FILE.format(name))
+        return ()
+    case("load_data", a.load_data, cold_start, heavy=True)
+
+    # dates and digests
+    case("normalize_dates.cold", lambda: DateNormalizer().normalize_df(raw), heavy=True)
+    a.DATES.normalize_df(raw)
+    case("normalize_dates.memoized", lambda: a.DATES.normalize_df(raw))
+    T = a.TICKETS
+    case("row_digest.reset", lambda: RowDigest().reset((k, T.rank[k], r) for k, r in T.rows.items()), heavy=True)
+    case("content_token", T.content_token)
+
+    # read callbacks
+    def cold_caches():
+        T._sorted.clear()
+        T._filtered.clear()
+        T.indexes[None]._cache.clear()
+        return ()
+    case("kpi_cards", lambda: a.kpi_cards(T))
+    case("render_tickets_page", lambda: a.render_tickets_page(0, 18, [], "", "", None), cold_caches)
+    case("render_tickets_page.sort", lambda: a.render_tickets_page(
+        3, 18, [{"column_id": "Due", "direction": "desc"}], "", "", None), cold_caches)
+    case("render_tickets_page.filter", lambda: a.render_tickets_page(
+        0, 18, [], "{Status} = Blocked && {Owner} contains a", "", None), cold_caches)
+    case("render_tickets_page.search", lambda: a.render_tickets_page(
+        0, 18, [], "", "journal compaction", None), cold_caches)
+    case("render_tickets_page.search_fuzzy", lambda: a.render_tickets_page(
+        0, 18, [], "", "kanbn", None), cold_caches)
+    case("render_kanban", lambda: a.render_kanban(None), heavy=True)
+    case("render_decisions.search", lambda: a.render_decisions(
+        0, 12, [], "", "roadmap", None), lambda: a.DECISIONS.indexes[None]._cache.clear() or ())
+    case("ticket_dropdowns", a.ticket_dropdowns, heavy=True)
+
+    # write callbacks
+    edits = iter(range(10 ** 9))
+
+    def page_edit():
+        rows, _ = T.page(0, 18)
+        prev = [dict(r) for r in rows]
+        rows[0]["Title"] = f"Edited title {next(edits)}"
+        rows[1]["Due"] = f"2026-0{1 + next(edits) % 9}-15"
+        return None, rows, prev, T.token
+    case("tickets_edited", a.tickets_edited, page_edit)
+    case("add_ticket", lambda: a.add_ticket(1, "Benchmark ticket", "To Do", "Low", "Alex", "E-01", T.token))
+
+    def selection():
+        i = next(edits)
+        todo = [k for k, _ in zip(a.STATUS_INDEX.keys("To Do"), range(10))]
+        target = "In Progress" if i % 2 == 0 else "To Do"
+        if i % 2:
+            return None, target, [], [k for k, _ in zip(a.STATUS_INDEX.keys("In Progress"), range(10))], [], [], T.token
+        return None, target, todo, [], [], [], T.token
+    case("move_selected", a.move_selected, selection)
+
+    # journal and save paths
+    def dirty_rows(k=100):
+        def setup():
+            keys = [key for key, _ in zip(T.order, range(k))]
+            T.set_values(keys, {"Notes": f"bench {next(edits)}"})
+            return ()
+        return setup
+    case("save_table.100_dirty", lambda: a.save_table(T, a.TICKETS_DB), dirty_rows())
+    case("compact_journal.100_dirty", a.compact_journal, dirty_rows())
+    case("reload_tickets.100_journaled", lambda: a.reload_tickets(None), dirty_rows(), heavy=True)
+    a.compact_journal()
+
+    # history: rebuild from the last full copy, and one save forward from the previous rebuild
+    gens = [g for g, _, _ in a.TICKETS_DB.history()]
+
+    def cold_history():
+        a.TICKETS_DB._history = a.TICKETS_DB._history_base = None
+        return ()
+    case("history.rows_at.full_copy", lambda: a.TICKETS_DB.rows_at(gens[-1]), cold_history, heavy=True)
+
+    def one_save_back():
+        a.TICKETS_DB.rows_at(gens[-2])
+        return ()
+    case("history.rows_at.step", lambda: a.TICKETS_DB.rows_at(gens[-1]), one_save_back)
+
+    # flow rollups: catching up on one 100-row save, and the charts from the rollup tables
+    a.FLOW.update()
+
+    def saved_rows():
+        dirty_rows()()
+        a.save_table(T, a.TICKETS_DB)
+        return ()
+    case("flow.update.100_saved", a.FLOW.update, saved_rows)
+    case("flow_figures", lambda: a.flow_figures(90))
+    case("load_data.persisted_search", a.load_data, heavy=True)
+    case("to_df", a.TICKETS.to_df, heavy=True)
+
+    return {"size": n, "max_rss_bytes": max_rss_bytes(), "results": results}
+
+
+# ---------- Driver ----------
+def git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_child(n, repeats, budget):
+    with tempfile.TemporaryDirectory(prefix="pm_bench_") as tmp:
+        out = os.path.join(tmp, "result.json")
+        proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--child", str(n),
+                               "--repeats", str(repeats), "--budget", str(budget), "--out", out], cwd=tmp)
+        if proc.returncode != 0:
+            # e.g. killed for memory at 1M rows; keep the sizes that did run
+            return {"size": n, "error": f"exit code {proc.returncode}", "max_rss_bytes": 0, "results": []}
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def compare(new, old):
+    before = {(r["size"], r["case"]): r for r in old["results"]}
+    print(f"\nvs {old['meta']['commit']} ({old['meta']['timestamp']}): median time ratio, peak memory ratio")
+    for r in new["results"]:
+        o = before.get((r["size"], r["case"]))
+        if o is None:
+            continue
+        t = r["median_s"] / o["median_s"] if o["median_s"] else float("nan")
+        m = r["peak_bytes"] / o["peak_bytes"] if o["peak_bytes"] else float("nan")
+        flag = "  slower" if t > 1.1 else "  faster" if t < 0.9 else ""
+        print(f"{r['size']:>9,}  {r['case']:<34} {t:6.2f}x  {m:6.2f}x{flag}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated row counts")
+    ap.add_argument("--repeats", type=int, default=5, help="timed runs per case (at most)")
+    ap.add_argument("--budget", type=float, default=2.0, help="seconds per case before repeats stop")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="JSON results file")
+    ap.add_argument("--compare", help="earlier results file to compare against")
+    ap.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(run_size(args.child, args.repeats, args.budget), f)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = {
+        "meta": {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "python": platform.python_version(), "pandas": pd.__version__,
+                 "platform": platform.platform(), "sizes": sizes, "repeats": args.repeats},
+        "max_rss_bytes": {},
+        "errors": {},
+        "results": [],
+    }
+    for n in sizes:
+        print(f"[bench] {n:,} rows", file=sys.stderr, flush=True)
+        child = run_child(n, args.repeats, args.budget)
+        if "error" in child:
+            print(f"[bench] {n:,} rows failed: {child['error']}", file=sys.stderr)
+            report["errors"][str(n)] = child["error"]
+            continue
+        report["max_rss_bytes"][str(n)] = child["max_rss_bytes"]
+        report["results"] += child["results"]
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    print(f"{'rows':>9}  {'case':<34} {'median ms':>10} {'min ms':>10} {'peak MB':>9}")
+    for r in report["results"]:
+        print(f"{r['size']:>9,}  {r['case']:<34} {r['median_s'] * 1000:10.2f} {r['min_s'] * 1000:10.2f} "
+              f"{r['peak_bytes'] / 2 ** 20:9.1f}")
+    for n, rss in report["max_rss_bytes"].items():
+        print(f"max RSS at {int(n):,} rows: {rss / 2 ** 20:.0f} MB")
+    for n, err in report["errors"].items():
+        print(f"{int(n):,} rows failed: {err}")
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
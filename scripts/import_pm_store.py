@@ -0,0 +1,30 @@
+"""
+One-shot import of tickets_live.csv / decisions_live.csv (or the 04_Tickets seed)
+into the PM SQLite store, then writes the columnar snapshots the app starts
+from. Re-running replaces what is in the store and drops edits still pending
+in the journal.
+
+Usage: python scripts/import_pm_store.py
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pm_app.app import (
+    DECISIONS_DB,
+    JOURNAL,
+    PM_DB_FILE,
+    TICKETS_DB,
+    import_decisions_from_sources,
+    import_tickets_from_sources,
+)
+
+n_t = import_tickets_from_sources(force=True)
+n_d = import_decisions_from_sources(force=True)
+JOURNAL.compact(lambda: 0)
+# a load after the import finds no current snapshot and writes one
+TICKETS_DB.load_df()
+DECISIONS_DB.load_df()
+print(f"Imported {n_t} tickets and {n_d} decisions into {PM_DB_FILE}")
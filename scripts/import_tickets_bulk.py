@@ -0,0 +1,104 @@
+"""
+Bulk import of tickets from a CSV or XLSX file into the PM SQLite store,
+streamed CHUNK_ROWS rows at a time (pm_app/bulk_import.py): columns are
+mapped like the app maps 04_Tickets, dates normalized, IDs allocated from
+the shared ticket sequence, and each chunk is saved as one transaction.
+Rows that fail validation go to a CSV report next to the file (<file>.rejected.csv).
+
+Rows are added to what is in the store (nothing is replaced). Each chunk is
+saved under the app's journal lock and also appended to the journal as row
+puts, so a running app's workers tail the new rows in as they would another
+worker's edits (the Bulk Import box on the Tickets tab does the same from
+inside the app).
+
+Usage:
+    python scripts/import_tickets_bulk.py tickets.csv
+    python scripts/import_tickets_bulk.py tickets.xlsx --sheet 04_Tickets --chunk-rows 2000
+"""
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from pm_app.app import (
+    JOURNAL,
+    PM_DB_FILE,
+    TICKET_COLUMN_CANDIDATES,
+    TICKET_IDS,
+    TICKETS_DB,
+    first_existing_column,
+    format_ticket_id,
+    import_tickets_from_sources,
+    max_ticket_number,
+    ticket_importer,
+)
+from pm_app.bulk_import import CHUNK_ROWS
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("file", help="a .csv or .xlsx file of tickets, one header row")
+    ap.add_argument("--sheet", help="worksheet to read (default: the first)")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    ap.add_argument("--report", help="rejected-rows CSV (default: <file>.rejected.csv)")
+    args = ap.parse_args()
+
+    import_tickets_from_sources()   # seed the store first if it is empty
+    key_col, columns = TICKETS_DB.meta()
+    header = pd.DataFrame(columns=columns)
+    roles = {role: first_existing_column(header, names) or names[0]
+             for role, names in TICKET_COLUMN_CANDIDATES.items()}
+    roles["id"] = key_col
+    for col in roles.values():
+        if col not in columns:
+            columns.append(col)
+
+    # IDs already taken: keys and ID cells (a typed ID can differ from its key) of the
+    # saved rows and of the edits still pending in the journal
+    seen = TICKETS_DB.load_df(columns=[key_col, roles["status"], roles["priority"]])
+    known = set(seen.index) | ({str(v).strip() for v in seen[key_col]} if key_col in seen else set())
+    for rec in JOURNAL.read_records():
+        if rec.get("tbl") == "tickets":
+            known.add(rec.get("key"))
+            known.add(str((rec.get("row") or {}).get(key_col, "")).strip())
+    statuses = set(seen[roles["status"]]) if roles["status"] in seen else ()
+    priorities = set(seen[roles["priority"]]) if roles["priority"] in seen else ()
+    del seen
+    TICKET_IDS.advance(max_ticket_number(known))   # never hand out an ID typed past the sequence
+
+    def reserve_ids(n):
+        first = TICKET_IDS.reserve(n, seed=lambda: max_ticket_number(known))
+        return [format_ticket_id(i) for i in range(first, first + n)]
+
+    rev = [1, "import-" + uuid.uuid4().hex[:8]]
+
+    def commit(rows):
+        upserts = {r[key_col]: r for r in rows}
+        with JOURNAL.held():    # no worker compacts or tails in between the store and the journal
+            TICKETS_DB.save_rows(upserts, [], key_col, columns)
+            JOURNAL.append([{"tbl": "tickets", "op": "put", "key": k, "row": r, "rev": rev}
+                            for k, r in upserts.items()])
+            JOURNAL.sync()
+        return []
+
+    report = args.report or args.file + ".rejected.csv"
+    imp = ticket_importer(columns, roles, statuses, priorities, known_ids=known, reserve_ids=reserve_ids,
+                          commit=commit, report_path=report, chunk_rows=args.chunk_rows)
+    stats = imp.run(args.file, sheet=args.sheet, progress=lambda msg: print(f"  {msg}"))
+    TICKET_IDS.advance(max_ticket_number(known))
+
+    print(f"Imported {stats['imported']} of {stats['rows']} rows into {PM_DB_FILE} "
+          f"in {stats['chunks']} chunks ({stats['seconds']}s)")
+    if stats["ignored_columns"]:
+        print(f"Ignored columns: {', '.join(stats['ignored_columns'])}")
+    if stats["rejected"]:
+        print(f"Rejected {stats['rejected']} rows, see {stats['report']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+Load generator for the PM app (8050) and the cockpit (8051).
+
+Simulates N concurrent browser sessions, each on its own keep-alive connection,
+replaying the /_dash-update-component traffic the pages send: a page load
+(shell, layout, dependencies, first table and kanban render), then a think-time
+loop of ticket page views (paging, sort, filter, search), table edits, kanban
+moves, decisions page views and autosave ticks. Edits and moves are followed by
+the re-renders the browser chains onto them. Cockpit sessions reload the page
+(shell, layout, dependencies), as a viewer refreshing it does.
+
+Payloads are built from the server's /_dash-dependencies, so they follow the
+callback signatures in pm_app/app.py. Reports requests/s and p50/p95/p99
+latency and error rate per action and overall; --out writes them as JSON.
+
+--start launches the servers itself from a temp directory (a fresh PM store
+imported from the workbook, or --rows synthetic tickets) and stops them at the
+end. Without --start, edits and moves land in the running server's store;
+use --read-only there.
+
+Usage:
+    python scripts/load_pm.py --start pm --sessions 20 --duration 30
+    python scripts/load_pm.py --start both --gunicorn --rows 10000 --sessions 50 --out load.json
+    python scripts/load_pm.py --pm-url http://127.0.0.1:8050 --read-only --sessions 10
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+PM_URL = "http://127.0.0.1:8050"
+COCKPIT_URL = "http://127.0.0.1:8051"
+# Relative weights of what a PM session does between think times
+PM_MIX = {"tickets_page": 35, "tickets_search": 10, "ticket_edit": 20, "kanban_move": 10,
+          "decisions_page": 10, "autosave": 15}
+READ_ONLY_ACTIONS = {"tickets_page", "tickets_search", "decisions_page"}
+SORT_COLS = ["Due", "Priority", "Owner", "Status", "Title"]
+FILTERS = ["", "", "{Status} = Blocked", "{Priority} = High", "{Owner} contains a"]
+SEARCHES = ["kanban", "journal", "roadmap export", "charter", "T-1", "fix", "migrate"]
+STATUSES = ["To Do", "In Progress", "Blocked", "Done"]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[i]
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}   # action -> [seconds]
+        self.errors = {}    # action -> count
+        self.samples = []   # first few error messages
+
+    def record(self, action, seconds, error=None):
+        with self.lock:
+            self.latency.setdefault(action, []).append(seconds)
+            if error:
+                self.errors[action] = self.errors.get(action, 0) + 1
+                if len(self.samples) < 10:
+                    self.samples.append(f"{action}: {error}")
+
+    def summary(self, wall):
+        def row(lat, errs):
+            lat = sorted(lat)
+            n = len(lat)
+            return {"requests": n, "errors": errs, "error_rate": errs / n if n else 0.0,
+                    "throughput_rps": n / wall if wall else 0.0,
+                    "p50_ms": percentile(lat, 50) * 1000, "p95_ms": percentile(lat, 95) * 1000,
+                    "p99_ms": percentile(lat, 99) * 1000, "max_ms": (lat[-1] if lat else 0.0) * 1000}
+        with self.lock:
+            actions = {a: row(v, self.errors.get(a, 0)) for a, v in sorted(self.latency.items())}
+            every = [s for v in self.latency.values() for s in v]
+            overall = row(every, sum(self.errors.values()))
+            return {"wall_s": wall, "overall": overall, "actions": actions, "error_samples": list(self.samples)}
+
+
+# ---------- HTTP session ----------
+class Client:
+    """One keep-alive connection, as one browser tab."""
+
+    def __init__(self, base_url, stats, timeout=60):
+        u = urlsplit(base_url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.stats = stats
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, action, method, path, body=None):
+        """Timed request; returns the parsed JSON body (or raw bytes), None on error."""
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        t = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.conn.request(method, path, body=data, headers=headers)
+            resp = self.conn.getresponse()
+            payload = resp.read()
+            if resp.getheader("Connection", "").lower() == "close":
+                self.close()
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            self.stats.record(action, time.perf_counter() - t, error=repr(e))
+            return None
+        elapsed = time.perf_counter() - t
+        if resp.status >= 400:
+            self.stats.record(action, elapsed, error=f"HTTP {resp.status} {path}")
+            return None
+        self.stats.record(action, elapsed)
+        # 204: the callback had nothing to update (PreventUpdate)
+        if resp.status == 204 or not payload:
+            return {}
+        if "json" in (resp.getheader("Content-Type") or ""):
+            return json.loads(payload)
+        return payload
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def page_load(self, action="page_load"):
+        self.request(action, "GET", "/")
+        self.request(action, "GET", "/_dash-layout")
+        return self.request(action, "GET", "/_dash-dependencies")
+
+
+# ---------- Dash callbacks ----------
+def split_outputs(output):
+    """'..a.data...b.children..' -> [{'id': 'a', 'property': 'data'}, ...] (single output: one dict)."""
+    if output.startswith(".."):
+        parts = output[2:-2].split("...")
+        return [dict(zip(("id", "property"), p.rsplit(".", 1))) for p in parts]
+    return dict(zip(("id", "property"), output.rsplit(".", 1)))
+
+
+class Callbacks:
+    """The server's callbacks, looked up by the input that triggers them."""
+
+    def __init__(self, dependencies):
+        self.deps = [d for d in dependencies if not d.get("clientside_function")]
+
+    def find(self, trigger, output_part=""):
+        for d in self.deps:
+            if output_part not in d["output"]:
+                continue
+            if any(f"{i['id']}.{i['property']}" == trigger for i in d["inputs"]):
+                return d
+        raise LookupError(f"no server callback triggered by {trigger} (outputs {output_part!r})")
+
+    @staticmethod
+    def payload(dep, values, trigger):
+        """Request body for dep, with component props from values ('id.prop' -> value)."""
+        def props(items):
+            return [{"id": i["id"], "property": i["property"], "value": values.get(f"{i['id']}.{i['property']}")}
+                    for i in items]
+        return {"output": dep["output"], "outputs": split_outputs(dep["output"]),
+                "inputs": props(dep["inputs"]), "state": props(dep.get("state", [])),
+                "changedPropIds": [trigger]}
+
+
+def response_value(resp, comp, prop):
+    return ((resp or {}).get("response") or {}).get(comp, {}).get(prop)
+
+
+class PMSession:
+    def __init__(self, client, rng):
+        self.c = client
+        self.rng = rng
+        self.cb = None
+        self.values = {"tickets_tbl.page_current": 0, "tickets_tbl.page_size": 18, "tickets_tbl.sort_by": [],
+                       "tickets_tbl.filter_query": "", "tickets_search.value": "",
+                       "decisions_tbl.page_current": 0, "decisions_tbl.page_size": 12,
+                       "decisions_tbl.sort_by": [], "decisions_tbl.filter_query": "", "decisions_search.value": "",
+                       "autosave.n_intervals": 0, "btn_move_selected.n_clicks": 0}
+        self.kanban = {}    # kanban table id -> [row ids]
+
+    def call(self, action, trigger, output_part=""):
+        dep = self.cb.find(trigger, output_part)
+        resp = self.c.request(action, "POST", "/_dash-update-component", Callbacks.payload(dep, self.values, trigger))
+        for key in ("kanban_version.data", "tickets_store.data", "tickets_saved_hash.data",
+                    "decisions_saved_hash.data"):
+            v = response_value(resp, *key.split("."))
+            if v is not None:
+                self.values[key] = v
+        for tid in ("kanban_todo", "kanban_ip", "kanban_blk", "kanban_done"):
+            rows = response_value(resp, tid, "data")
+            if isinstance(rows, list):  # a full list; Patches only shift rows we may still pick
+                self.kanban[tid] = [r.get("id") for r in rows]
+        return resp
+
+    def render_tickets(self, action):
+        resp = self.call(action, "tickets_tbl.page_current", "tickets_tbl.data")
+        rows = response_value(resp, "tickets_tbl", "data")
+        if rows is not None:
+            self.values["tickets_tbl.data"] = rows
+        return rows
+
+    def open(self):
+        deps = self.c.page_load()
+        if not isinstance(deps, list):
+            return False
+        self.cb = Callbacks(deps)
+        self.values["tickets_loaded.data"] = None
+        self.call("page_load", "tickets_loaded.data", "kanban_todo.data")
+        self.render_tickets("page_load")
+        self.call("page_load", "tickets_store.data", "tickets_kpis.children")
+        self.call("page_load", "decisions_tbl.page_current", "decisions_tbl.data")
+        return True
+
+    def step(self, action):
+        r, v = self.rng, self.values
+        if action == "tickets_page":
+            v["tickets_tbl.page_current"] = r.randrange(0, 20)
+            v["tickets_tbl.sort_by"] = ([{"column_id": r.choice(SORT_COLS), "direction": r.choice(["asc", "desc"])}]
+                                        if r.random() < 0.5 else [])
+            v["tickets_tbl.filter_query"] = r.choice(FILTERS)
+            v["tickets_search.value"] = ""
+            self.render_tickets(action)
+        elif action == "tickets_search":
+            v["tickets_tbl.page_current"] = 0
+            v["tickets_search.value"] = r.choice(SEARCHES)
+            self.render_tickets(action)
+        elif action == "decisions_page":
+            v["decisions_tbl.page_current"] = r.randrange(0, 5)
+            v["decisions_search.value"] = r.choice(["", "", "roadmap"])
+            self.call(action, "decisions_tbl.page_current", "decisions_tbl.data")
+        elif action == "autosave":
+            v["autosave.n_intervals"] += 1
+            self.call(action, "autosave.n_intervals")
+        elif action == "ticket_edit":
+            rows = v.get("tickets_tbl.data") or self.render_tickets(action) or []
+            if not rows:
+                return
+            prev = [dict(x) for x in rows]
+            edited = [dict(x) for x in rows]
+            row = r.choice(edited)
+            row["Title"] = f"{str(row.get('Title', '')).split(' [load ', 1)[0]} [load {r.randrange(10 ** 6)}]"
+            v["tickets_tbl.data"], v["tickets_tbl.data_previous"] = edited, prev
+            v["tickets_tbl.data_timestamp"] = int(time.time() * 1000)
+            self.call(action, "tickets_tbl.data_timestamp", "tickets_store.data")
+            self.after_write(action)
+        elif action == "kanban_move":
+            src = r.choice(["kanban_todo", "kanban_ip"])
+            ids = self.kanban.get(src) or []
+            picked = r.sample(ids, min(len(ids), r.randint(1, 3)))
+            for tid in ("kanban_todo", "kanban_ip", "kanban_blk", "kanban_done"):
+                v[f"{tid}.selected_row_ids"] = picked if tid == src else []
+            v["move_target_status.value"] = r.choice(STATUSES)
+            v["btn_move_selected.n_clicks"] += 1
+            self.call(action, "btn_move_selected.n_clicks")
+            self.after_write(action)
+
+    def after_write(self, action):
+        # the new tickets_store token re-renders the page and the KPI cards in the browser
+        self.render_tickets(action + ".rerender")
+        self.call(action + ".rerender", "tickets_store.data", "tickets_kpis.children")
+
+
+def run_pm_session(url, stats, stop, think, seed, read_only):
+    rng = random.Random(seed)
+    s = PMSession(Client(url, stats), rng)
+    mix = {a: w for a, w in PM_MIX.items() if not read_only or a in READ_ONLY_ACTIONS}
+    actions, weights = list(mix), list(mix.values())
+    try:
+        if not s.open():
+            return
+        while not stop.is_set():
+            stop.wait(rng.expovariate(1 / think) if think > 0 else 0)
+            if stop.is_set():
+                break
+            s.step(rng.choices(actions, weights)[0])
+    except Exception as e:  # a malformed response must not silently end the session
+        stats.record("session", 0.0, error=repr(e))
+    finally:
+        s.c.close()
+
+
+def run_cockpit_session(url, stats, stop, think, seed):
+    rng = random.Random(seed)
+    c = Client(url, stats)
+    try:
+        while not stop.is_set():
+            c.page_load("cockpit_refresh")
+            stop.wait(rng.expovariate(1 / think) if think > 0 else 0)
+    finally:
+        c.close()
+
+
+# ---------- Local servers ----------
+def wait_http(url, path, timeout=120):
+    u = urlsplit(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(u.hostname, u.port or 80, timeout=timeout)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    return False
+
+
+def seed_store(workdir, rows):
+    """Write rows synthetic tickets and decisions into workdir's PM store (see bench_pm.py)."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from bench_pm import synthetic_decisions, synthetic_tickets
+    from pm_app.store import TableStore
+    db = os.path.join(workdir, "pm_live.sqlite")
+    TableStore(db, "tickets").replace_df(synthetic_tickets(rows), "Ticket ID")
+    TableStore(db, "decisions").replace_df(synthetic_decisions(max(1, rows // 10)), "Decision_ID")
+
+
+def start_servers(which, workdir, pm_url, cockpit_url, gunicorn, workers, rows):
+    os.symlink(ROOT / "data", os.path.join(workdir, "data"))
+    if rows:
+        seed_store(workdir, rows)
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    procs = []
+    log = open(os.path.join(workdir, "server.log"), "w")
+    if which in ("pm", "both"):
+        bind = urlsplit(pm_url).netloc
+        if gunicorn:
+            env.update(PM_BIND=bind, PM_WORKERS=str(workers),
+                       PM_METRICS_DIR=os.path.join(workdir, "metrics"))
+            cmd = [sys.executable, "-m", "gunicorn", "-c", str(ROOT / "gunicorn.conf.py"),
+                   "--access-logfile", "/dev/null", "wsgi:server"]
+        else:
+            host, port = bind.split(":")
+            cmd = [sys.executable, "-c", "from pm_app.app import create_app; "
+                   f"create_app().run(host={host!r}, port={int(port)}, debug=False, threaded=True)"]
+        procs.append(subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT))
+    if which in ("cockpit", "both"):
+        procs.append(subprocess.Popen([sys.executable, "-m", "pm_app.cockpit"], cwd=workdir, env=env,
+                                      stdout=log, stderr=subprocess.STDOUT))
+    for url in ([pm_url] if which in ("pm", "both") else []) + ([cockpit_url] if which in ("cockpit", "both") else []):
+        if not wait_http(url, "/_dash-layout"):
+            stop_servers(procs)
+            raise SystemExit(f"server at {url} did not come up; see {log.name}")
+    return procs
+
+
+def stop_servers(procs):
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            p.wait(timeout=10)
+        if p.poll() is None:
+            p.kill()
+
+
+# ---------- Driver ----------
+def print_report(report):
+    print(f"{'action':<26} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for app_name, summary in report["apps"].items():
+        print(f"[{app_name}] {summary['wall_s']:.1f} s")
+        rows = list(summary["actions"].items()) + [("overall", summary["overall"])]
+        for action, s in rows:
+            print(f"  {action:<24} {s['requests']:>7} {s['throughput_rps']:>8.1f} {s['p50_ms']:>8.1f} "
+                  f"{s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['error_rate']:>6.1%}")
+        for msg in summary["error_samples"]:
+            print(f"  ! {msg}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pm-url", default=PM_URL)
+    ap.add_argument("--cockpit-url", default=COCKPIT_URL)
+    ap.add_argument("--target", choices=["pm", "cockpit", "both"], default=None,
+                    help="apps to load (default: what --start starts, else pm)")
+    ap.add_argument("--sessions", type=int, default=10, help="concurrent PM sessions")
+    ap.add_argument("--cockpit-sessions", type=int, default=None, help="concurrent cockpit viewers (default --sessions)")
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds of load after the sessions opened")
+    ap.add_argument("--think", type=float, default=1.0, help="mean think time between actions, seconds (0: none)")
+    ap.add_argument("--read-only", action="store_true", help="only page views and searches, no writes")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--start", choices=["pm", "cockpit", "both"], help="start local servers in a temp directory")
+    ap.add_argument("--gunicorn", action="store_true", help="with --start: serve the PM app with gunicorn")
+    ap.add_argument("--workers", type=int, default=2, help="with --gunicorn: worker processes")
+    ap.add_argument("--rows", type=int, default=0, help="with --start: seed this many synthetic tickets")
+    ap.add_argument("--out", help="write the report as JSON")
+    args = ap.parse_args()
+
+    target = args.target or args.start or "pm"
+    cockpit_sessions = args.sessions if args.cockpit_sessions is None else args.cockpit_sessions
+    with contextlib.ExitStack() as stack:
+        if args.start:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="pm_load_"))
+            procs = start_servers(args.start, workdir, args.pm_url, args.cockpit_url, args.gunicorn,
+                                  args.workers, args.rows)
+            stack.callback(stop_servers, procs)
+
+        stop = threading.Event()
+        stats = {"pm": Stats(), "cockpit": Stats()}
+        threads = []
+        if target in ("pm", "both"):
+            threads += [threading.Thread(target=run_pm_session, daemon=True,
+                                         args=(args.pm_url, stats["pm"], stop, args.think, args.seed + i, args.read_only))
+                        for i in range(args.sessions)]
+        if target in ("cockpit", "both"):
+            threads += [threading.Thread(target=run_cockpit_session, daemon=True,
+                                         args=(args.cockpit_url, stats["cockpit"], stop, args.think, args.seed + 10_000 + i))
+                        for i in range(cockpit_sessions)]
+        print(f"[load] {len(threads)} sessions for {args.duration:.0f} s against {target}", file=sys.stderr)
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        stop.wait(args.duration)
+        stop.set()
+        for t in threads:
+            t.join(timeout=60)
+        wall = time.perf_counter() - t0
+
+    apps = ["pm", "cockpit"] if target == "both" else [target]
+    report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "target": target,
+                       "sessions": args.sessions, "cockpit_sessions": cockpit_sessions,
+                       "duration_s": args.duration, "think_s": args.think, "read_only": args.read_only,
+                       "started": args.start, "gunicorn": args.gunicorn, "workers": args.workers, "rows": args.rows},
+              "apps": {a: stats[a].summary(wall) for a in apps}}
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Memory report for the in-memory PM ticket table, old layout vs current.
+
+Builds synthetic tickets (see bench_pm.py, dates normalized as the app does)
+and measures with tracemalloc:
+- the all-object DataFrame the load path used to keep around;
+- the table rows as per-cell copies (the old RowTable.load_df, rows from
+  DataFrame.to_dict("records")) vs categorical rows (RowTable.load_df now,
+  low-cardinality cells interned per column);
+- the status/priority buckets and the search index built on top;
+- what each browser session holds: the full table as JSON records (the old
+  dcc.Store copy) vs a state token plus one page of records.
+
+Usage:
+    python scripts/pm_memory.py                 # 100k tickets
+    python scripts/pm_memory.py --rows 10000 --out memory.json
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_pm import synthetic_tickets
+from pm_app.dates import DateNormalizer
+from pm_app.table import RowTable
+
+KEY_COL = "Ticket ID"
+PAGE_SIZE = 18
+
+
+def traced(fn):
+    """(result, bytes still allocated by fn once it returned)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        out = fn()
+        gc.collect()
+        return out, tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+
+
+def report(n):
+    df = DateNormalizer().normalize_df(synthetic_tickets(n)).fillna("")
+    sizes = {}
+
+    obj_df, sizes["object DataFrame (old load path)"] = traced(lambda: df.astype(object))
+    del obj_df
+
+    def old_rows():
+        return dict(zip(df[KEY_COL].tolist(), df.to_dict("records")))
+    rows, sizes["rows: per-cell copies (old)"] = traced(old_rows)
+    old_session = len(json.dumps(list(rows.values()), ensure_ascii=False))
+    del rows
+
+    def new_rows():
+        t = RowTable("tickets")
+        t.load_df(df, KEY_COL)
+        return t
+    table, sizes["rows: categorical (current)"] = traced(new_rows)
+    _, sizes["status + priority buckets"] = traced(lambda: (table.add_index("Status"), table.add_index("Priority")))
+    _, sizes["search index"] = traced(lambda: table.add_search(
+        [KEY_COL, "Title", "Owner", "Epic"], weights={KEY_COL: 3.0, "Title": 2.0}))
+
+    page, _ = table.page(0, PAGE_SIZE)
+    new_session = len(json.dumps(page, ensure_ascii=False)) + len(json.dumps(table.state_token))
+    categorical = {c: len(p) for c, p in table.pools.items()}
+    return {
+        "rows": n,
+        "bytes": sizes,
+        "session_bytes": {"full table in dcc.Store (old)": old_session,
+                          "state token + one page (current)": new_session},
+        "categorical_columns": categorical,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--out", help="also write the report as JSON")
+    args = ap.parse_args()
+
+    r = report(args.rows)
+    mb = lambda b: f"{b / 2 ** 20:8.1f} MB"
+    print(f"In-memory footprint at {r['rows']:,} tickets")
+    for name, b in r["bytes"].items():
+        print(f"  {name:<36} {mb(b)}")
+    old, new = r["bytes"]["rows: per-cell copies (old)"], r["bytes"]["rows: categorical (current)"]
+    print(f"  rows: current / old                  {new / old:8.2f}x")
+    print("Per browser session")
+    for name, b in r["session_bytes"].items():
+        print(f"  {name:<36} {b / 1024:8.1f} KB")
+    print("Categorical columns (distinct values): "
+          + ", ".join(f"{c} ({k})" for c, k in r["categorical_columns"].items()))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=1)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
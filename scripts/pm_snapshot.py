@@ -0,0 +1,91 @@
+"""
+Inspect the PM tables' columnar snapshots and export the tables as CSV.
+
+The store (pm_live.sqlite) is the source of truth; pm_live.<table>.arrow is a
+columnar copy at one store generation that reads (the app's startup and
+reloads, and this script) load instead of parsing every row, applying only
+the rows saved since. CSV stays the interchange format: `export` writes
+tickets_live.csv / decisions_live.csv, which the importer reads back.
+
+Usage:
+    python scripts/pm_snapshot.py info
+    python scripts/pm_snapshot.py export [--table tickets] [--columns "Ticket ID,Status,Due"] [--out file.csv]
+    python scripts/pm_snapshot.py refresh       # rewrite the snapshots from the store
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pm_app import snapshot
+from pm_app.app import DECISIONS_CSV, DECISIONS_DB, PM_DB_FILE, TICKETS_CSV, TICKETS_DB
+
+TABLES = {"tickets": (TICKETS_DB, TICKETS_CSV), "decisions": (DECISIONS_DB, DECISIONS_CSV)}
+
+
+def info(tables):
+    for name in tables:
+        store = TABLES[name][0]
+        gen, base = store.generation()
+        path = store.snapshot_path
+        snap = snapshot.snapshot_info(path)
+        print(f"{name}: store generation {gen} (last import at {base})")
+        if snap is None:
+            print(f"  no usable snapshot at {path}" + ("" if snapshot.available() else " (pyarrow not installed)"))
+            continue
+        state = "current" if snap["generation"] == gen else \
+            "behind, rows saved since are applied on load" if base <= snap["generation"] < gen else "stale, ignored"
+        print(f"  {path}: {snap['rows']} rows at generation {snap['generation']} ({state}), "
+              f"{os.path.getsize(path) / 1024:.0f} KB")
+        print(f"  typed date columns: {', '.join(snap['typed_dates']) or '-'}")
+
+
+def export(tables, columns, out):
+    for name in tables:
+        store = TABLES[name][0]
+        t0 = time.perf_counter()
+        df = store.load_df(columns)
+        if df is None:
+            print(f"{name}: not in {PM_DB_FILE}")
+            continue
+        path = out or TABLES[name][1]
+        df.to_csv(path, index=False)
+        print(f"{name}: {len(df)} rows x {len(df.columns)} columns -> {path} "
+              f"(read via {store.stats['load']}, {(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+
+def refresh(tables):
+    for name in tables:
+        store = TABLES[name][0]
+        if os.path.exists(store.snapshot_path):
+            os.remove(store.snapshot_path)
+        df = store.load_df()
+        print(f"{name}: " + (f"wrote {store.snapshot_path} ({len(df)} rows)" if df is not None and
+                             store.stats["snapshot_writes"] else "nothing written"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=["info", "export", "refresh"])
+    ap.add_argument("--table", choices=list(TABLES), help="one table (default: both)")
+    ap.add_argument("--columns", help="export: comma-separated columns (default: all)")
+    ap.add_argument("--out", help="export: output CSV (with --table)")
+    args = ap.parse_args()
+    tables = [args.table] if args.table else list(TABLES)
+    if args.out and len(tables) > 1:
+        ap.error("--out needs --table")
+    if args.command == "info":
+        info(tables)
+    elif args.command == "export":
+        columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+        export(tables, columns, args.out)
+    else:
+        refresh(tables)
+
+
+if __name__ == "__main__":
+    main()
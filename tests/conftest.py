@@ -0,0 +1,53 @@
+"""Shared fixtures: a "worker" is what one app process holds (its RowTable, TableStore and
+EditJournal) over the SQLite file and journal every worker shares."""
+import pandas as pd
+import pytest
+
+from pm_app.journal import EditJournal
+from pm_app.store import TableStore
+from pm_app.table import RowTable
+
+KEY_COL = "Ticket ID"
+COLUMNS = [KEY_COL, "Title", "Status", "Owner"]
+
+
+def ticket(key, title="", status="To Do", owner=""):
+    return {KEY_COL: key, "Title": title, "Status": status, "Owner": owner}
+
+
+class Worker:
+    def __init__(self, tmp_path):
+        self.store = TableStore(tmp_path / "pm.sqlite", "tickets")
+        self.journal = EditJournal(tmp_path / "pm.journal")
+        self.table = RowTable("tickets")
+        with self.journal.held(exclusive=False):   # as in the app: no compaction between the two reads
+            self.table.load_df(self.store.load_df(), KEY_COL)
+            self.journal.replay({"tickets": self.table})
+        self.table.journal = self.journal
+
+    def fold(self) -> int:
+        """The app's fold_journal for one table: write the dirty rows, then mark them saved."""
+        upserts, deletes, snapshot = self.table.take_dirty()
+        n = self.store.save_rows(upserts, deletes, KEY_COL, self.table.columns)
+        self.table.mark_saved(snapshot)
+        return n
+
+    def compact(self) -> int:
+        return self.journal.compact(self.fold)
+
+    def saved(self):
+        return TableStore(self.store.db_path, "tickets").load_df()
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    """tmp_path with a tickets table of T-0001..T-0003 in the store."""
+    TableStore(tmp_path / "pm.sqlite", "tickets").replace_df(
+        pd.DataFrame([ticket(f"T-000{i}", f"ticket {i}") for i in (1, 2, 3)], columns=COLUMNS), KEY_COL)
+    return tmp_path
+
+
+@pytest.fixture
+def worker(seeded):
+    """Start a worker on the seeded files; call it again for another worker (or a restart)."""
+    return lambda: Worker(seeded)
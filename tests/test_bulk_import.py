@@ -0,0 +1,113 @@
+"""Streaming bulk import: chunked reading with source line numbers, and per-row validation."""
+import csv
+
+import pytest
+
+from pm_app.bulk_import import BulkImport, read_chunks
+from pm_app.dates import DateNormalizer
+
+COLUMNS = ["Ticket ID", "Title", "Status", "Priority", "Due"]
+ROLES = {"id": "Ticket ID", "title": "Title", "status": "Status", "priority": "Priority"}
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def chunks(path, **kw):
+    return [(lines, df.values.tolist()) for lines, df in read_chunks(path, **kw)]
+
+
+def test_csv_rows_are_numbered_by_the_line_they_start_on(tmp_path):
+    path = write(tmp_path / "t.csv",
+                 "Title,Status\n"
+                 "\n"
+                 "first,To Do\n"
+                 '"two\nlines",To Do\n'
+                 "\n"
+                 "after,Done\n")
+    assert chunks(path, chunk_rows=2) == [([3, 4], [["first", "To Do"], ["two\nlines", "To Do"]]),
+                                          ([7], [["after", "Done"]])]
+
+
+def test_csv_header_may_follow_blank_lines_and_rows_are_padded(tmp_path):
+    path = write(tmp_path / "t.csv", "\n\nTitle,Title,\nonly a title\n")
+    assert [list(df.columns) for _, df in read_chunks(path)] == [["Title", "Title.1", "Column 3"]]
+    assert chunks(path) == [([4], [["only a title", "", ""]])]
+
+
+def test_csv_byte_order_mark_is_not_part_of_the_header(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_bytes("Title\nx\n".encode("utf-8-sig"))
+    assert [list(df.columns) for _, df in read_chunks(path)] == [["Title"]]
+
+
+def test_xlsx_rows_are_numbered_by_sheet_row(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    for row in [[None, None], ["Title", "Points"], ["a", 3], [None, None], ["b", 2.0]]:
+        wb.active.append(row)
+    wb.save(tmp_path / "t.xlsx")
+    assert chunks(tmp_path / "t.xlsx") == [([3, 5], [["a", "3"], ["b", "2"]])]
+
+
+class Sink:
+    """Stands in for the app: the IDs it hands out and the rows committed."""
+
+    def __init__(self, taken=()):
+        self.next, self.taken, self.rows, self.reserves = 100, set(taken), [], []
+
+    def reserve(self, n):
+        self.reserves.append(n)
+        ids = [f"T-{i:04d}" for i in range(self.next, self.next + n)]
+        self.next += n
+        return ids
+
+    def commit(self, rows):
+        self.rows += [r for r in rows if r["Ticket ID"] not in self.taken]
+        return [r["Ticket ID"] for r in rows if r["Ticket ID"] in self.taken]
+
+
+def run(tmp_path, text, sink, known=(), **kw):
+    imp = BulkImport(COLUMNS, lambda header: {h: h for h in header if h in COLUMNS}, ROLES,
+                     ["To Do", "Done"], ["Low", "Medium"], known_ids=set(known), reserve_ids=sink.reserve,
+                     commit=sink.commit, dates=DateNormalizer(), report_path=tmp_path / "rejected.csv",
+                     defaults={"Status": "To Do", "Priority": "Medium"}, **kw)
+    return imp, imp.run(write(tmp_path / "in.csv", text))
+
+
+def report(tmp_path):
+    with open(tmp_path / "rejected.csv", newline="", encoding="utf-8") as f:
+        return [(int(r["Row"]), r["Reason"]) for r in csv.DictReader(f)]
+
+
+def test_rows_are_validated_and_rejects_reported_by_source_line(tmp_path):
+    sink = Sink()
+    imp, stats = run(tmp_path,
+                     "Ticket ID,Title,Status,Priority,Due,Color\n"
+                     ",fine,,,2025-03-15,red\n"          # 2: defaults, a reserved ID
+                     "\n"
+                     ",,Done,Low,,\n"                    # 4: missing title
+                     'T-0001,"known\nID",,,,\n'          # 5-6: duplicate of a known ID
+                     "T-0200,ok,Nope,,,\n"               # 7: unknown status
+                     "T-0201,ok,Done,Low,someday,\n"     # 8: bad date
+                     "T-0202,ok,Done,Low,2025-03-16,\n"  # 9
+                     "T-0202,again,,,,\n",               # 10: duplicate within the file
+                     sink, known={"T-0001"})
+    assert stats["rows"] == 7 and stats["imported"] == 2 and stats["rejected"] == 5
+    assert stats["ignored_columns"] == ["Color"]
+    assert [(r["Ticket ID"], r["Status"], r["Priority"], r["Due"]) for r in sink.rows] == [
+        ("T-0100", "To Do", "Medium", "20250315"), ("T-0202", "Done", "Low", "20250316")]
+    assert report(tmp_path) == [(4, "missing title"), (5, "duplicate ID T-0001"), (7, "unknown status 'Nope'"),
+                                (8, "bad date in Due: 'someday'"), (10, "duplicate ID T-0202")]
+    assert {"T-0100", "T-0202"} <= imp.known_ids
+
+
+def test_ids_are_reserved_once_per_chunk_and_taken_ids_rejected(tmp_path):
+    sink = Sink(taken={"T-0101"})                       # added by someone else meanwhile
+    rows = "".join(f",row {i},,,,\n" for i in range(5))
+    _, stats = run(tmp_path, "Ticket ID,Title,Status,Priority,Due\n" + rows, sink, chunk_rows=3)
+    assert sink.reserves == [3, 2]
+    assert stats["chunks"] == 2 and stats["imported"] == 4
+    assert report(tmp_path) == [(3, "duplicate ID T-0101 (added meanwhile)")]
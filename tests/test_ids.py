@@ -0,0 +1,84 @@
+"""The shared ticket ID sequence (IdSequence) and the ID-cell index next_ticket_id checks."""
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from conftest import COLUMNS, KEY_COL, ticket
+
+from pm_app.store import IdSequence
+from pm_app.table import RowTable
+
+ROOT = Path(__file__).resolve().parents[1]
+RESERVE = """
+import sys
+from pm_app.store import IdSequence
+seq = IdSequence(sys.argv[1], "tickets")
+print(" ".join(str(seq.reserve(int(sys.argv[2]))) for _ in range(int(sys.argv[3]))))
+"""
+
+
+def test_seeded_once_then_counts_on(tmp_path):
+    seq = IdSequence(tmp_path / "pm.sqlite", "tickets")
+    assert seq.reserve(seed=lambda: 41) == 42
+    assert seq.reserve(3, seed=lambda: 1000) == 43      # the seed is only read the first time
+    assert seq.reserve() == 46
+
+
+def test_advance_never_moves_back(tmp_path):
+    seq = IdSequence(tmp_path / "pm.sqlite", "tickets")
+    seq.advance(10)
+    seq.advance(5)
+    assert seq.reserve() == 11
+    seq.advance(20)
+    assert seq.reserve(2) == 21 and seq.reserve() == 23
+
+
+def test_threads_and_instances_never_get_the_same_number(tmp_path):
+    db = tmp_path / "pm.sqlite"
+    sequences = [IdSequence(db, "tickets") for _ in range(3)]   # one per "worker", each with its own connection
+    got, lock = [], threading.Lock()
+
+    def allocate(seq, n):
+        for _ in range(50):
+            first = seq.reserve(n)
+            with lock:
+                got.extend(range(first, first + n))
+
+    threads = [threading.Thread(target=allocate, args=(seq, n)) for seq in sequences for n in (1, 4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(got) == list(range(1, len(got) + 1))
+
+
+def test_processes_share_the_sequence(tmp_path):
+    db = str(tmp_path / "pm.sqlite")
+    IdSequence(db, "tickets").advance(0)                      # create the schema before the race
+    procs = [subprocess.Popen([sys.executable, "-c", RESERVE, db, "2", "40"], cwd=ROOT, stdout=subprocess.PIPE,
+                              text=True) for _ in range(3)]
+    firsts = [int(v) for p in procs for v in p.communicate()[0].split()]
+    numbers = sorted(n for first in firsts for n in (first, first + 1))
+    assert numbers == list(range(1, 241))
+
+
+def test_id_index_finds_typed_ids(worker):
+    one, two = worker(), worker()
+    index = two.table.add_index(KEY_COL, normalize=lambda v: str(v).strip())
+    assert index.count("T-0002") == 1
+
+    one.table.update("T-0001", {KEY_COL: " T-0050 "})          # typed over the key, on another worker
+    two.journal.poll()
+    assert index.count("T-0050") == 1 and index.count("T-0001") == 0
+    two.table.delete(["T-0001"])
+    assert index.count("T-0050") == 0
+
+
+def test_id_index_is_rebuilt_on_reload():
+    t = RowTable("tickets")
+    index = t.add_index(KEY_COL, normalize=lambda v: str(v).strip())
+    t.load_df(pd.DataFrame([ticket("T-0001"), ticket("T-0007 ")], columns=COLUMNS), KEY_COL)
+    assert set(index.buckets) == {"T-0001", "T-0007"}
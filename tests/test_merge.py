@@ -0,0 +1,80 @@
+"""Optimistic concurrency: RowTable.merge_edit merges a session's edit against the row as
+it is now, cell by cell, using the row as the session read it (base) and its revision."""
+import pandas as pd
+import pytest
+
+from conftest import COLUMNS, KEY_COL, ticket
+
+from pm_app.table import RowTable
+
+
+@pytest.fixture
+def table():
+    t = RowTable("tickets")
+    t.load_df(pd.DataFrame([ticket("T-0001", "login page", owner="ann")], columns=COLUMNS), KEY_COL)
+    return t
+
+
+def read(table, key="T-0001"):
+    """What a session holds: the row and its revision."""
+    return table.get(key), table.rev(key)
+
+
+def test_unchanged_row_takes_the_edit(table):
+    base, rev = read(table)
+    row, conflicts = table.merge_edit("T-0001", base, dict(base, Status="Done"), rev)
+    assert conflicts == []
+    assert row == dict(base, Status="Done")
+
+
+def test_edits_to_different_columns_merge(table):
+    base, rev = read(table)
+    table.update("T-0001", {"Owner": "bob"})             # someone else, meanwhile
+    row, conflicts = table.merge_edit("T-0001", base, dict(base, Status="Done"), rev)
+    assert conflicts == []
+    assert row["Status"] == "Done" and row["Owner"] == "bob"
+
+
+def test_the_same_column_changed_differently_is_a_conflict(table):
+    base, rev = read(table)
+    table.update("T-0001", {"Owner": "bob"})
+    mine = dict(base, Owner="cy", Title="login page v2")
+    row, conflicts = table.merge_edit("T-0001", base, mine, rev)
+    assert conflicts == ["Owner"]
+    assert row["Owner"] == "bob"                           # theirs is kept
+    assert row["Title"] == "login page v2"                 # the rest of mine still goes in
+
+
+def test_the_same_change_twice_is_not_a_conflict(table):
+    base, rev = read(table)
+    table.update("T-0001", {"Status": "Done"})
+    row, conflicts = table.merge_edit("T-0001", base, dict(base, Status="Done"), rev)
+    assert (row, conflicts) == (None, [])                  # nothing left to write
+
+
+def test_no_change_and_deleted_rows(table):
+    base, rev = read(table)
+    assert table.merge_edit("T-0001", base, dict(base), rev) == (None, [])
+    table.delete(["T-0001"])
+    assert table.merge_edit("T-0001", base, dict(base, Status="Done"), rev) == (None, ["row deleted"])
+
+
+def test_revision_moves_on_every_write(table):
+    _, rev = read(table)
+    table.update("T-0001", {"Owner": "bob"})
+    moved = table.rev("T-0001")
+    assert moved != rev
+    table.update("T-0001", {"Owner": "bob"})               # no change, no new revision
+    assert table.rev("T-0001") == moved
+
+
+def test_revisions_travel_with_journal_records(worker):
+    one, two = worker(), worker()
+    base, rev = one.table.get("T-0002"), one.table.rev("T-0002")
+    two.table.update("T-0002", {"Title": "renamed in two"})
+    one.journal.poll()
+    assert one.table.rev("T-0002") == two.table.rev("T-0002") != rev
+
+    # a session on worker one that read the row before two's write: a three-way merge
+    row, conflicts = one.table.merge_edit("T-0002", base, dict(base, Title="renamed in one"), rev)
+    assert conflicts == ["Title"] and row is None
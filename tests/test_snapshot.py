@@ -0,0 +1,66 @@
+"""The columnar snapshot must read back exactly what a row-by-row read of the store gives."""
+import pandas as pd
+import pytest
+
+from pm_app import snapshot
+from pm_app.store import TableStore
+
+pytestmark = pytest.mark.skipif(not snapshot.available(), reason="pyarrow not installed")
+
+KEY_COL = "Ticket ID"
+
+
+def seed_df():
+    # as read from 04_Tickets: a float estimate next to blanks, an int column, text and dates
+    return pd.DataFrame({
+        KEY_COL: ["T-0001", "T-0002", "T-0003", "T-0004"],
+        "Title": ["Login page", "Fix build", "Docs", "6.0"],
+        "Status": ["To Do", "Done", "To Do", "Blocked"],
+        "Estimate (hrs)": [6.0, 10.0, "", 2.5],
+        "Points": [1, 3, 5, 8],
+        "Due": ["20250315", "", "20250401", "20250402"],
+        "Created": ["03/15/2025", "2025-03-16", "", "20250317"],
+    })
+
+
+def row_read(db_path):
+    return TableStore(db_path, "tickets").load_df()
+
+
+def restart(db_path, snap_path):
+    return TableStore(db_path, "tickets", snapshot_path=snap_path)
+
+
+def assert_same(snapshot_read, rows):
+    pd.testing.assert_frame_equal(snapshot_read, rows)
+    assert snapshot_read.equals(rows)
+    assert list(snapshot_read.dtypes) == list(rows.dtypes)
+
+
+def test_snapshot_read_equals_row_read_after_save_and_restart(tmp_path):
+    db, snap = tmp_path / "pm.sqlite", str(tmp_path / "pm.tickets.arrow")
+    store = restart(db, snap)
+    store.replace_df(seed_df(), KEY_COL)
+    first = store.load_df()             # first start: a row read, which writes the snapshot
+    assert store.stats["load"] == "rows"
+    assert_same(first, row_read(db))
+    assert first.loc["T-0001", "Estimate (hrs)"] == 6.0
+    assert isinstance(first.loc["T-0001", "Estimate (hrs)"], float)
+
+    store = restart(db, snap)
+    again = store.load_df()             # every later start reads the snapshot
+    assert store.stats["load"] == "snapshot"
+    assert_same(again, row_read(db))
+    assert isinstance(again.loc["T-0004", "Title"], str)
+    assert isinstance(again.loc["T-0002", "Points"], int)
+
+    # rows saved after the snapshot are applied on top of it, with their own types
+    cols = list(seed_df().columns)
+    store.save_rows({"T-0002": dict(zip(cols, ["T-0002", "Fix build", "Done", 12.0, 3, "", ""])),
+                     "T-0005": dict(zip(cols, ["T-0005", "New", "To Do", 1.5, 2, "20250501", ""]))},
+                    ["T-0003"], KEY_COL, cols)
+    store = restart(db, snap)
+    after = store.load_df()
+    assert store.stats["load"] == "snapshot"
+    assert_same(after, row_read(db))
+    assert after.loc["T-0002", "Estimate (hrs)"] == 12.0
@@ -0,0 +1,43 @@
+"""TableStore writes from several workers (one TableStore each) on one SQLite file."""
+import pandas as pd
+
+from pm_app.store import TableStore
+
+KEY_COL = "Ticket ID"
+COLUMNS = [KEY_COL, "Title"]
+
+
+def row(key, title):
+    return {KEY_COL: key, "Title": title}
+
+
+def seeded(db_path):
+    store = TableStore(db_path, "tickets")
+    store.replace_df(pd.DataFrame([row("A", "a"), row("B", "b")]), KEY_COL)
+    return store
+
+
+def test_positions_come_from_the_store_not_the_worker(tmp_path):
+    db = tmp_path / "pm.sqlite"
+    one = seeded(db)
+    two = TableStore(db, "tickets")
+    one.load_df()
+    two.load_df()                   # both workers start from A, B
+
+    one.save_rows({"C": row("C", "c")}, [], KEY_COL, COLUMNS)
+    two.save_rows({"D": row("D", "d")}, [], KEY_COL, COLUMNS)
+    two.save_rows({"C": row("C", "c edited")}, [], KEY_COL, COLUMNS)   # tailed in from worker one
+
+    df = TableStore(db, "tickets").load_df()
+    assert list(df.index) == ["A", "B", "C", "D"]
+    assert df.loc["C", "Title"] == "c edited"
+
+
+def test_deleted_then_new_rows_go_after_the_last_row(tmp_path):
+    db = tmp_path / "pm.sqlite"
+    one = seeded(db)
+    two = TableStore(db, "tickets")
+    one.save_rows({}, ["B"], KEY_COL, COLUMNS)
+    two.save_rows({"E": row("E", "e")}, [], KEY_COL, COLUMNS)
+    one.save_rows({"B": row("B", "b again")}, [], KEY_COL, COLUMNS)
+    assert list(TableStore(db, "tickets").load_df().index) == ["A", "E", "B"]
@@ -0,0 +1,75 @@
+"""Several worker processes on one store and journal: each tails the others' edits, a
+compaction in one is seen as saved in the others, and job state is shared."""
+import subprocess
+import sys
+import time
+
+from conftest import ticket
+
+from pm_app.jobs import FAILED, JobRunner
+
+
+def test_a_worker_tails_the_other_workers_edits(worker):
+    one, two = worker(), worker()
+    one.table.update("T-0001", {"Title": "from one"})
+    one.table.append(ticket("T-0004", "added by one"))
+    version = two.journal.version
+
+    assert two.journal.poll() == 2
+    assert two.journal.version != version
+    assert two.table.get("T-0001")["Title"] == "from one"
+    assert list(two.table.order)[-1] == "T-0004"
+    assert two.journal.poll() == 0                  # nothing new: one stat
+
+
+def test_the_later_write_wins_in_every_worker(worker):
+    one, two = worker(), worker()
+    one.table.update("T-0002", {"Owner": "ann"})
+    two.table.update("T-0002", {"Owner": "bob"})    # later in the journal
+    one.journal.poll()
+    two.journal.poll()
+    assert one.table.get("T-0002")["Owner"] == two.table.get("T-0002")["Owner"] == "bob"
+
+
+def test_another_workers_compaction_marks_the_folded_rows_saved(worker):
+    one, two = worker(), worker()
+    one.table.update("T-0001", {"Status": "Done"})
+    assert one.table.is_dirty()
+    two.compact()                                   # catches up on one's edit and folds it
+    assert two.saved().loc["T-0001", "Status"] == "Done"
+
+    one.table.update("T-0003", {"Status": "Blocked"})   # written into the new journal
+    one.journal.poll()
+    assert one.table.dirty_keys() == {"T-0003"}
+    two.journal.poll()
+    assert one.table.content_token() == two.table.content_token()    # same rows, same digest
+    assert worker().table.get("T-0003")["Status"] == "Blocked"
+
+
+def test_job_state_is_visible_to_every_worker(tmp_path):
+    db = tmp_path / "pm.sqlite"
+    one, two = JobRunner(db_path=db), JobRunner(db_path=db)
+    job = one.submit("Export tickets", lambda job: job.progress("halfway") or {"rows": 3})
+    for _ in range(100):
+        seen = two.lookup(job.id)
+        if seen["status"] == "done":
+            break
+        time.sleep(0.02)
+    assert seen["result"] == {"rows": 3}
+    assert seen["message"] == "halfway"
+    assert two.get(job.id) is None                  # the Job object stays in the worker running it
+    assert [j["id"] for j in two.recent()] == [job.id]
+    assert not two.any_active()
+
+
+def test_a_job_left_running_by_a_dead_worker_reads_as_failed(tmp_path):
+    db = tmp_path / "pm.sqlite"
+    gone = subprocess.Popen([sys.executable, "-c", "pass"])
+    gone.wait()
+    runner = JobRunner(db_path=db)
+    runner.conn().execute(
+        "INSERT INTO pm_jobs (id, label, status, message, coalesced, submitted, started, pid)"
+        " VALUES ('j1', 'Import', 'running', '', 0, ?, ?, ?)", (time.time(), time.time(), gone.pid))
+    seen = JobRunner(db_path=db).lookup("j1")
+    assert seen["status"] == FAILED
+    assert "exited" in seen["message"]
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production serving of the PM app.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Every worker process imports pm_app.app on its own and works on the shared
+SQLite store + edit journal (see pm_app/journal.py), so workers stay in step.
+Importing does no data work; create_app() starts loading it in the background.
+"""
+from pm_app.app import create_app
+
+app = create_app()
+server = app.server